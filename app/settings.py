@@ -100,6 +100,25 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Shared across processes (Redis) when REDIS_URL is set; per-process otherwise.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -138,7 +157,7 @@ STATIC_URL = 'static/'
 
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": (
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
+        "dashboard.renderers.FastCamelCaseJSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ),
     "DEFAULT_PARSER_CLASSES": (
@@ -152,4 +171,42 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Opt-in: only paginates when the request sends ?cursor= or ?page_size=
+    "DEFAULT_PAGINATION_CLASS": "dashboard.pagination.OptionalCursorPagination",
+}
+
+# Dashboard
+
+# Apps whose models sections can list through /seccion_menu/{id}/registros/
+DASHBOARD_LIST_APPS = ("dashboard", "nomina")
+
+# Payroll (nomina app)
+
+# Employees read and Recibo rows written per chunk when generating a payroll
+NOMINA_CHUNK_SIZE = int(os.getenv("NOMINA_CHUNK_SIZE", "2000"))
+
+# Max computed (sd, periodicidad_pago) receipt results kept in the per-process LRU cache
+NOMINA_CACHE_RESULTADOS = int(os.getenv("NOMINA_CACHE_RESULTADOS", "10000"))
+
+# Dump a cProfile .prof file for every payroll run (normally enabled per run instead)
+NOMINA_PERFILAR = os.getenv("NOMINA_PERFILAR", "0") == "1"
+
+# Directory for cProfile dumps; defaults to the system temp dir
+NOMINA_PERFIL_DIR = os.getenv("NOMINA_PERFIL_DIR") or None
+
+# Structured per-run payroll metrics are logged by "nomina.instrumentacion"
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "nomina": {
+            "handlers": ["console"],
+            "level": os.getenv("NOMINA_LOG_LEVEL", "INFO"),
+        },
+    },
 }
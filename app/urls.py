@@ -8,6 +8,7 @@ from rest_framework_simplejwt.views import (
 )
 
 from dashboard import views
+from nomina import views as nomina_views
 
 router = routers.DefaultRouter()
 router.register(r'accion_basica', views.AccionBasicaViewSet)
@@ -15,10 +16,12 @@ router.register(r"accion_grupo", views.AccionGrupoViewSet, basename="accion_grup
 router.register(r"menu", views.MenuViewSet)
 router.register(r"seccion_menu", views.SeccionMenuViewSet)
 router.register(r"users", views.UserViewSet)
+router.register(r"recibo", nomina_views.ReciboViewSet)
 
 urlpatterns = [
     path("api/", include(router.urls)),
     path("api/login/", views.LoginView.as_view(), name="login"),
+    path("api/empleado/importar/", nomina_views.EmpleadoImportacionView.as_view(), name="empleado_importar"),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
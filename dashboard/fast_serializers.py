@@ -0,0 +1,285 @@
+from itertools import islice
+
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camel_to_underscore, camelize
+
+from .renderers import CamelizedList, FastCamelCaseJSONRenderer
+
+# Fields whose to_representation returns the database value unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    PrimaryKeyRelatedField,
+)
+
+FIELD = 0
+NESTED = 1
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def camelize_key(key):
+    return next(iter(camelize({key: None}, **api_settings.JSON_UNDERSCOREIZE)))
+
+def parse_fields(value):
+    """
+    Parses a sparse fieldset such as "id,navbarLabel,menu.label" into a
+    selection tree {"id": None, "navbar_label": None, "menu": {"label": None}},
+    where None selects the whole field. Names may be camelCase or snake_case.
+
+    Returns None (every field) for an empty value.
+    """
+    if not value:
+        return None
+
+    tree = {}
+
+    for path in value.split(","):
+        names = [
+            camel_to_underscore(name.strip(), **api_settings.JSON_UNDERSCOREIZE)
+            for name in path.split(".")
+        ]
+
+        if not all(names):
+            continue
+
+        node = tree
+
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                break
+
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+
+    return tree or None
+
+def select_fields(serializer, selection):
+    """
+    Returns (name, field, child_selection) for the readable fields of the
+    serializer picked by a parse_fields selection tree
+    """
+    fields = [
+        (name, field) for name, field in serializer.fields.items()
+        if not field.write_only
+    ]
+
+    if selection is None:
+        return [(name, field, None) for name, field in fields]
+
+    fields = dict(fields)
+
+    unknown = [
+        name for name, child in selection.items()
+        if name not in fields or (
+            child is not None
+            and not isinstance(fields[name], serializers.BaseSerializer)
+        )
+    ]
+
+    if unknown:
+        raise serializers.ValidationError({
+            "fields": [f"Unknown field: {camelize_key(name)}" for name in unknown]
+        })
+
+    return [
+        (name, field, selection[name])
+        for name, field in fields.items()
+        if name in selection
+    ]
+
+def get_child_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+
+    return field
+
+def prune_serializer(serializer, selection):
+    """
+    Drops the fields not picked by the selection tree from a serializer
+    instance (and its nested serializers)
+    """
+    if selection is None:
+        return serializer
+
+    serializer = get_child_serializer(serializer)
+    selected = {name: child for name, _, child in select_fields(serializer, selection)}
+
+    for name in list(serializer.fields):
+        if name not in selected:
+            serializer.fields.pop(name)
+        elif selected[name] is not None:
+            prune_serializer(serializer.fields[name], selected[name])
+
+    return serializer
+
+def plan_queryset(queryset, serializer, selection=None):
+    """
+    Adds the select_related / prefetch_related that serializing the
+    selected fields needs: nested serializers and relations are joined,
+    to-many relations are prefetched
+    """
+    select = []
+    prefetch = []
+
+    def plan(serializer, selection, prefix):
+        for _, field, child in select_fields(get_child_serializer(serializer), selection):
+            if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+                continue
+
+            path = prefix + field.source.replace(".", "__")
+
+            if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+                prefetch.append(path)
+            elif isinstance(field, serializers.BaseSerializer):
+                select.append(path)
+                plan(field, child, path + "__")
+            elif isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField):
+                select.append(path)
+
+    plan(serializer, selection, "")
+
+    if select:
+        queryset = queryset.select_related(*select)
+
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    return queryset
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path for a ModelSerializer.
+
+    Compiles the serializer's field tree once into a list of .values()
+    columns and camelCase output keys, then builds each row as a plain dict
+    without instantiating serializers. The output equals
+    camelize(serializer_class(queryset, many=True).data).
+
+    selection is an optional parse_fields tree (sparse fieldset).
+
+    Only plain model fields, single primary key relations and nested
+    (non-many) serializers are supported; anything else raises TypeError
+    when compiling.
+    """
+
+    def __init__(self, serializer_class, selection=None):
+        self.serializer_class = serializer_class
+        self.columns = []
+        self.plan = self.compile(serializer_class(), "", selection)
+
+    def compile(self, serializer, prefix, selection):
+        plan = []
+
+        for name, field, child in select_fields(serializer, selection):
+            if field.source == "*" or isinstance(
+                field,
+                (serializers.ListSerializer, ManyRelatedField, serializers.SerializerMethodField)
+            ) or (
+                isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField)
+            ):
+                raise TypeError(
+                    f"{type(serializer).__name__}.{name} is not supported by ValuesSerializer"
+                )
+
+            column = prefix + field.source.replace(".", "__")
+
+            self.columns.append(column)
+
+            if isinstance(field, serializers.BaseSerializer):
+                plan.append((NESTED, camelize_key(name), column, self.compile(field, column + "__", child)))
+            else:
+                converter = None if type(field) in PASSTHROUGH_FIELDS else field.to_representation
+                plan.append((FIELD, camelize_key(name), column, converter))
+
+        return plan
+
+    def build(self, plan, row):
+        data = {}
+
+        for kind, key, column, item in plan:
+            value = row[column]
+
+            if value is None:
+                data[key] = None
+            elif kind == NESTED:
+                data[key] = self.build(item, row)
+            else:
+                data[key] = value if item is None else item(value)
+
+        return data
+
+    def rows(self, queryset, *extra):
+        """
+        Yields (row, data) pairs; row is the .values() dict including the
+        extra columns
+        """
+        for row in self.values(queryset, *extra):
+            yield row, self.build(self.plan, row)
+
+    def values(self, queryset, *extra):
+        return queryset.values(
+            *self.columns,
+            *(column for column in extra if column not in self.columns)
+        )
+
+    def build_rows(self, rows):
+        return CamelizedList(self.build(self.plan, row) for row in rows)
+
+    def serialize(self, queryset):
+        return self.build_rows(self.values(queryset))
+
+    def stream(self, rows, batch_size=2000):
+        """
+        Yields the rows as chunks of one JSON array, encoding batch_size rows
+        at a time, for a StreamingHttpResponse
+        """
+        renderer = FastCamelCaseJSONRenderer()
+        separator = b"["
+
+        for batch in batched(rows.iterator(chunk_size=batch_size), batch_size):
+            yield separator + renderer.render(self.build_rows(batch))[1:-1]
+            separator = b","
+
+        yield b"[]" if separator == b"[" else b"]"
+
+
+# (serializer_class, selection) -> ValuesSerializer; cleared when full since
+# selections come from the client
+_compiled = {}
+_COMPILED_MAXSIZE = 256
+
+
+def freeze_selection(selection):
+    if selection is None:
+        return None
+
+    return tuple(sorted(
+        (name, freeze_selection(child)) for name, child in selection.items()
+    ))
+
+def get_values_serializer(serializer_class, selection=None):
+    key = (serializer_class, freeze_selection(selection))
+
+    values_serializer = _compiled.get(key)
+
+    if values_serializer is None:
+        values_serializer = ValuesSerializer(serializer_class, selection)
+
+        if len(_compiled) >= _COMPILED_MAXSIZE:
+            _compiled.clear()
+
+        _compiled[key] = values_serializer
+
+    return values_serializer
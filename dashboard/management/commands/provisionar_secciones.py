@@ -0,0 +1,84 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from dashboard.models import SeccionMenu
+from dashboard.services.provisioning_service import provision_all, provision_secciones
+
+class Command(BaseCommand):
+    help = (
+        "Creates the default acciones (from the active AccionBasica rows) of "
+        "sections in bulk and grants them to the administrador group. With a "
+        "JSON file, first creates its sections: a list of objects with "
+        "descripcion, navbar_label, icon, visible_app, status and menu (Menu "
+        "descripcion or id); sections that already exist are skipped and "
+        "listed. Otherwise provisions the existing sections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "archivo",
+            nargs="?",
+            help="JSON file with the sections to create."
+        )
+        parser.add_argument(
+            "--seccion",
+            type=int,
+            action="append",
+            help="Only provision this existing section (can be repeated)."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Sections inserted and provisioned per batch."
+        )
+
+    def handle(self, *args, **options):
+        if options["archivo"] and options["seccion"]:
+            raise CommandError("Use either a JSON file or --seccion, not both")
+
+        with transaction.atomic():
+            if options["archivo"]:
+                try:
+                    resultado = provision_secciones(
+                        self._read(options["archivo"]),
+                        batch_size=options["batch_size"]
+                    )
+                except ValueError as e:
+                    raise CommandError(str(e))
+
+                secciones = len(resultado["secciones"])
+                acciones = resultado["acciones"]
+
+                if resultado["omitidas"]:
+                    self.stdout.write(
+                        f"{len(resultado['omitidas'])} existing sections skipped: "
+                        + ", ".join(resultado["omitidas"])
+                    )
+            else:
+                seccion_menu_ids = SeccionMenu.objects.order_by("id").values_list("id", flat=True)
+
+                if options["seccion"]:
+                    seccion_menu_ids = seccion_menu_ids.filter(id__in=options["seccion"])
+
+                seccion_menu_ids = list(seccion_menu_ids)
+                secciones = len(seccion_menu_ids)
+                acciones = provision_all(seccion_menu_ids, batch_size=options["batch_size"])
+
+        self.stdout.write(f"{secciones} sections provisioned, {acciones} acciones created")
+
+    def _read(self, path):
+        try:
+            with open(path, encoding="utf-8-sig") as archivo:
+                secciones = json.load(archivo)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Invalid file {path}: {e}")
+
+        if not isinstance(secciones, list) or not all(
+            isinstance(seccion, dict) and seccion.get("descripcion") for seccion in secciones
+        ):
+            raise CommandError("The file must be a list of objects with a descripcion")
+
+        return secciones
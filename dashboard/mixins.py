@@ -0,0 +1,146 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from rest_framework.response import Response
+
+from .fast_serializers import (
+    get_values_serializer,
+    parse_fields,
+    plan_queryset,
+    prune_serializer,
+)
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for ModelViewSet list/retrieve.
+
+    Computes a cheap version token for the queryset before serializing
+    anything and answers If-None-Match with 304.
+
+    The token is max(version_field) + count of the filtered queryset and of
+    every model in version_dependencies (e.g. models rendered by nested
+    serializers). Models without a modification timestamp can instead set
+    version_cache to a VersionedCache whose counter is bumped by signals.
+
+    No Last-Modified is sent: max(version_field) alone misses deletions and
+    writes within the same second, so only the ETag is validated.
+    """
+
+    version_field = "updated_at"
+    version_dependencies = []
+    version_cache = None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_version(self):
+        """
+        Returns the version token for the current request
+        """
+        if self.version_cache is not None:
+            return str(self.version_cache.version())
+
+        querysets = [self.filter_queryset(self.get_queryset())]
+        querysets += [model._default_manager.all() for model in self.version_dependencies]
+
+        parts = []
+
+        for queryset in querysets:
+            version = queryset.order_by().aggregate(
+                last=Max(self.version_field),
+                count=Count("pk")
+            )
+
+            parts.append(f"{version['last']}|{version['count']}")
+
+        return ";".join(parts)
+
+    def conditional_response(self, view, request, *args, **kwargs):
+        token = self.get_version()
+
+        etag = quote_etag(
+            hashlib.sha1(
+                f"{request.get_full_path()}|{request.accepted_media_type}|{token}".encode()
+            ).hexdigest()
+        )
+
+        response = get_conditional_response(request._request, etag=etag)
+
+        if response is None:
+            response = view(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+
+        return response
+
+
+class FastListMixin:
+    """
+    list() with sparse fieldsets, opt-in pagination and query planning.
+
+    ?fields=id,label,menu.descripcion limits the output to those fields
+    (names may be camelCase). The response is built through the .values()
+    fast path (ValuesSerializer) of the view's serializer class, already
+    camelCase, so FastCamelCaseJSONRenderer skips camelize(). Serializers
+    the fast path does not support fall back to the DRF serializer, pruned
+    to the requested fields, over a queryset with the select_related /
+    prefetch_related those fields need.
+
+    Pagination applies when the view's paginator returns a page (see
+    OptionalCursorPagination).
+    """
+
+    fields_query_param = "fields"
+
+    def get_field_selection(self):
+        return parse_fields(self.request.query_params.get(self.fields_query_param))
+
+    def list(self, request, *args, **kwargs):
+        selection = self.get_field_selection()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        try:
+            values_serializer = get_values_serializer(self.get_serializer_class(), selection)
+        except TypeError:
+            return self.serializer_list(queryset, selection)
+
+        ordering = getattr(self.paginator, "ordering", None) or ()
+
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        rows = values_serializer.values(
+            queryset,
+            *(field.lstrip("-") for field in ordering)
+        )
+
+        page = self.paginate_queryset(rows)
+
+        if page is not None:
+            return self.get_paginated_response(values_serializer.build_rows(page))
+
+        return Response(values_serializer.build_rows(rows))
+
+    def serializer_list(self, queryset, selection):
+        queryset = plan_queryset(queryset, self.get_serializer(), selection)
+
+        page = self.paginate_queryset(queryset)
+
+        serializer = self.get_serializer(
+            page if page is not None else queryset,
+            many=True
+        )
+        prune_serializer(serializer, selection)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+
+        return Response(serializer.data)
@@ -410,6 +410,12 @@ class SeccionMenuInput(models.Model):
 
     def __str__(self):
         return self.input_label or self.input_name or f"Input {self.id}"
+
+    def clean(self):
+        # Imported here: the service imports this module
+        from dashboard.services.model_list_service import validate_input
+
+        validate_input(self)
     
 class StyledColumn(models.Model):
     seccion_menu = models.ForeignKey(
@@ -0,0 +1,43 @@
+from rest_framework.pagination import CursorPagination
+
+from .renderers import CamelizedDict, CamelizedList
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination on id, only applied when the request sends
+    ?cursor= or ?page_size=; otherwise list endpoints keep returning the
+    full, unwrapped list.
+    """
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+
+        if isinstance(data, CamelizedList):
+            response.data = CamelizedDict(response.data)
+
+        return response
+
+
+class KeysetPagination(OptionalCursorPagination):
+    """
+    Always-on keyset (cursor) pagination, for tables too large to be
+    listed whole; set ordering to the model's pk.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return CursorPagination.paginate_queryset(self, queryset, request, view)
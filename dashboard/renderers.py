@@ -0,0 +1,39 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+
+class CamelizedList(list):
+    """
+    List whose keys are already camelCase (see dashboard.fast_serializers)
+    """
+
+
+class CamelizedDict(dict):
+    """
+    Dict whose keys are already camelCase (see dashboard.fast_serializers)
+    """
+
+
+class FastCamelCaseJSONRenderer(CamelCaseJSONRenderer):
+    """
+    CamelCaseJSONRenderer that skips camelize() for CamelizedList /
+    CamelizedDict payloads and encodes them with orjson when available.
+
+    Payloads must hold JSON-native values only (as produced by serializer
+    to_representation).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, (CamelizedList, CamelizedDict)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if orjson is not None and not self.get_indent(accepted_media_type, renderer_context or {}):
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+        return JSONRenderer.render(self, data, accepted_media_type, renderer_context)
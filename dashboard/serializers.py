@@ -6,6 +6,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import Accion, AccionBasica, AccionGrupo, Menu, SeccionMenu
+from .services.permission_bits_service import PERMISSION_CLAIM, get_permission_digest
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -21,6 +22,7 @@ class LoginSerializer(serializers.Serializer):
             raise serializers.ValidationError("Invalid credentials")
 
         refresh = RefreshToken.for_user(user)
+        refresh[PERMISSION_CLAIM] = get_permission_digest(user)
 
         return {
             "access": str(refresh.access_token),
@@ -1,4 +1,18 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from dashboard.fast_serializers import get_values_serializer
 from dashboard.models import AccionGrupo
+from dashboard.renderers import CamelizedDict, CamelizedList
+from dashboard.serializers import AccionGrupoActionsSerializer
+
+from .versioned_cache import VersionedCache
+
+# Compiled permission matrices and user -> groups lookups; invalidated by
+# the signals in dashboard/signals.py
+permission_cache = VersionedCache("dashboard:permissions", timeout=60 * 60 * 24)
 
 def get_allowed_breadcrumbs_for_group(user, seccion_menu_id):
     """
@@ -85,4 +99,201 @@ def get_allowed_table_actions_for_group(user, seccion_menu_id):
         .select_related(
             "accion",
         )
-    )
\ No newline at end of file
+    )
+
+def get_user_group_ids(user):
+    """
+    Returns the sorted ids of the user's groups
+    """
+    return permission_cache.get(
+        f"user:{user.pk}",
+        lambda: sorted(user.groups.values_list("id", flat=True))
+    )
+
+def iter_allowed_acciones_grupo(group_ids):
+    """
+    Yields (row, data) for the active AccionGrupo of a set of groups, where
+    data is the camelCase AccionGrupoActionsSerializer output (built with
+    the .values() fast path) and row holds the flags needed to classify it
+    """
+    acciones_grupo = (
+        AccionGrupo.objects
+        .filter(
+            grupo_id__in=group_ids,
+            status=True,
+            accion__status=True,
+            accion__seccion_menu__isnull=False,
+        )
+        .order_by(
+            "accion__seccion_menu__menu__descripcion",
+            "accion__seccion_menu__navbar_label",
+            "id",
+        )
+    )
+
+    return get_values_serializer(AccionGrupoActionsSerializer).rows(
+        acciones_grupo,
+        "accion__seccion_menu__status",
+        "accion__seccion_menu__menu__status",
+    )
+
+def is_menu_entry(row):
+    return bool(
+        row["accion__on_breadcrumb"]
+        and row["accion__seccion_menu__status"]
+        and row["accion__seccion_menu__menu__status"]
+    )
+
+def compile_permission_matrix(group_ids):
+    """
+    Compiles the actions allowed to a set of groups:
+
+        {
+            "sections": {seccion_menu_id: {"breadcrumb": [...], "navbar": [...], "table": [...]}},
+            "menus": [...],
+        }
+
+    Entries are the camelCase output of AccionGrupoActionsSerializer /
+    AccionGrupoSeccionMenuSerializer, in the same order as the
+    get_allowed_*_for_group querysets.
+    """
+    sections = {}
+    menus = []
+
+    for row, data in iter_allowed_acciones_grupo(group_ids):
+        section = sections.setdefault(
+            row["accion__seccion_menu"],
+            {"breadcrumb": [], "navbar": [], "table": []}
+        )
+
+        if row["accion__on_breadcrumb"]:
+            section["breadcrumb"].append(data)
+
+        if row["accion__on_navbar"]:
+            section["navbar"].append(data)
+
+        if row["accion__on_table"]:
+            section["table"].append(data)
+
+        if is_menu_entry(row):
+            menus.append({"seccionMenu": data["accion"]["seccionMenu"]})
+
+    return {
+        "sections": sections,
+        "menus": menus,
+    }
+
+def get_permission_matrix(user):
+    """
+    Returns the compiled permission matrix of the user's groups
+    """
+    group_ids = get_user_group_ids(user)
+
+    return permission_cache.get(
+        "groups:" + ",".join(map(str, group_ids)),
+        lambda: compile_permission_matrix(group_ids)
+    )
+
+def get_allowed_actions(user, seccion_menu_id, kind):
+    """
+    Returns the serialized breadcrumb, navbar or table actions allowed to
+    the user in a seccion_menu
+    """
+    section = get_permission_matrix(user)["sections"].get(int(seccion_menu_id))
+
+    if not section:
+        return CamelizedList()
+
+    return CamelizedList(section[kind])
+
+def get_allowed_menus(user):
+    """
+    Returns the serialized seccion_menus allowed to the user
+    """
+    return CamelizedList(get_permission_matrix(user)["menus"])
+
+def compile_bootstrap(group_ids):
+    """
+    Compiles the normalized UI permission payload of a set of groups.
+
+    Menus, sections and actions are listed once by id and referenced by id
+    everywhere else:
+
+        {
+            "menus": {menu_id: {...}},
+            "seccionesMenu": {seccion_menu_id: {..., "menu": menu_id}},
+            "acciones": {accion_id: {..., "seccionMenu": seccion_menu_id}},
+            "allowedMenus": [seccion_menu_id, ...],
+            "allowedActions": {seccion_menu_id: {"breadcrumb": [accion_id, ...], "navbar": [...], "table": [...]}},
+        }
+
+    Returns {"etag": ..., "payload": ...}; the etag is a hash of the payload.
+    """
+    menus = {}
+    secciones_menu = {}
+    acciones = {}
+    allowed_menus = []
+    allowed_actions = {}
+
+    for row, data in iter_allowed_acciones_grupo(group_ids):
+        accion = dict(data["accion"])
+        seccion_menu = dict(accion["seccionMenu"])
+        menu = seccion_menu["menu"]
+
+        if menu and menu["id"] not in menus:
+            menus[menu["id"]] = menu
+
+        if seccion_menu["id"] not in secciones_menu:
+            seccion_menu["menu"] = menu["id"] if menu else None
+            secciones_menu[seccion_menu["id"]] = seccion_menu
+
+        if is_menu_entry(row) and seccion_menu["id"] not in allowed_menus:
+            allowed_menus.append(seccion_menu["id"])
+
+        # An action granted to several of the groups is listed once
+        if accion["id"] in acciones:
+            continue
+
+        accion["seccionMenu"] = seccion_menu["id"]
+        acciones[accion["id"]] = accion
+
+        section = allowed_actions.setdefault(
+            seccion_menu["id"],
+            {"breadcrumb": [], "navbar": [], "table": []}
+        )
+
+        for kind, column in (
+            ("breadcrumb", "accion__on_breadcrumb"),
+            ("navbar", "accion__on_navbar"),
+            ("table", "accion__on_table"),
+        ):
+            if row[column]:
+                section[kind].append(accion["id"])
+
+    payload = CamelizedDict(
+        menus=menus,
+        seccionesMenu=secciones_menu,
+        acciones=acciones,
+        allowedMenus=allowed_menus,
+        allowedActions=allowed_actions,
+    )
+
+    etag = hashlib.sha1(
+        json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode()
+    ).hexdigest()
+
+    return {
+        "etag": etag,
+        "payload": payload,
+    }
+
+def get_bootstrap(user):
+    """
+    Returns the compiled bootstrap payload (and its etag) of the user's groups
+    """
+    group_ids = get_user_group_ids(user)
+
+    return permission_cache.get(
+        "bootstrap:" + ",".join(map(str, group_ids)),
+        lambda: compile_bootstrap(group_ids)
+    )
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import re
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camelize
+
+from dashboard.models import SeccionMenu, SeccionMenuInput
+from dashboard.renderers import CamelizedDict
+
+from .versioned_cache import VersionedCache
+
+# Compiled form schemas per seccion_menu, scoped by its id; invalidated by
+# the signals in dashboard/signals.py
+form_schema_cache = VersionedCache("dashboard:form_schemas", timeout=60 * 60 * 24)
+
+FORM_MODES = ("alta", "modifica", "lista", "filtro")
+
+INPUT_FIELDS = (
+    "id",
+    "input_type",
+    "input_label",
+    "input_id",
+    "input_name",
+    "input_cols",
+    "input_required",
+    "input_accepts",
+    "keyboard_type",
+    "encabezado",
+    "new_line",
+    "currency_format",
+    "number_format",
+    "multiple",
+    "orden",
+    "url_get",
+    "modelo",
+)
+
+COLUMN_SEPARATORS = re.compile(r"[,;|\s]+")
+ITEM_SEPARATORS = re.compile(r"[\n;,]")
+PAIR_SEPARATORS = re.compile(r"[:=]")
+FILTER_SEPARATORS = re.compile(r"[\n;,&]")
+
+def _parse_json(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+def _parse_scalar(text):
+    """
+    "1" -> 1, "true" -> True, "null" -> None; anything else stays a string
+    """
+    parsed = _parse_json(text)
+
+    if text == "null" or isinstance(parsed, (bool, int, float, str)):
+        return parsed
+
+    return text
+
+def parse_select_columnas(text):
+    """
+    Column list of a select: a JSON list or names separated by commas,
+    semicolons, pipes or whitespace
+    """
+    if not text or not text.strip():
+        return []
+
+    parsed = _parse_json(text)
+
+    if isinstance(parsed, list):
+        return [str(column).strip() for column in parsed if str(column).strip()]
+
+    return [column for column in COLUMN_SEPARATORS.split(text.strip()) if column]
+
+def _option(item, columnas):
+    if isinstance(item, dict):
+        if "value" in item and "label" in item:
+            return item
+
+        value_column = columnas[0] if columnas else "id"
+        label_columns = columnas[1:] or columnas[:1]
+
+        option = {
+            "value": item.get(value_column, item.get("value")),
+            "label": " ".join(
+                str(item[column]) for column in label_columns if item.get(column) is not None
+            ) or item.get("label"),
+        }
+
+        return {**item, **option}
+
+    if isinstance(item, (list, tuple)) and len(item) == 2:
+        return {"value": item[0], "label": item[1]}
+
+    return {"value": item, "label": item}
+
+def parse_select_values(text, columnas=()):
+    """
+    Static options of a select as [{"value": ..., "label": ...}].
+
+    Accepts JSON (a list of objects, [value, label] pairs or scalars, or an
+    object {value: label}) or text items separated by newlines, semicolons
+    or commas, each "value:label", "value=label" or a bare value. Objects
+    without value/label keys take them from the select columns (the first
+    is the value, the rest form the label).
+    """
+    if not text or not text.strip():
+        return []
+
+    parsed = _parse_json(text)
+
+    if isinstance(parsed, list):
+        return [_option(item, columnas) for item in parsed]
+
+    if isinstance(parsed, dict):
+        return [{"value": value, "label": label} for value, label in parsed.items()]
+
+    options = []
+
+    for item in ITEM_SEPARATORS.split(text):
+        item = item.strip()
+
+        if not item:
+            continue
+
+        pair = PAIR_SEPARATORS.split(item, 1)
+
+        if len(pair) == 2:
+            options.append({"value": _parse_scalar(pair[0].strip()), "label": pair[1].strip()})
+        else:
+            options.append({"value": _parse_scalar(item), "label": item})
+
+    return options
+
+def parse_select_filters(text):
+    """
+    Filters of a select as {column: value}: a JSON object or "column=value"
+    items separated by newlines, semicolons, commas or ampersands
+    """
+    if not text or not text.strip():
+        return {}
+
+    parsed = _parse_json(text)
+
+    if isinstance(parsed, dict):
+        return parsed
+
+    filters = {}
+
+    for item in FILTER_SEPARATORS.split(text):
+        column, separator, value = item.partition("=")
+
+        if separator and column.strip():
+            filters[column.strip()] = _parse_scalar(value.strip())
+
+    return filters
+
+def compile_form_schema(seccion_menu_id):
+    """
+    Compiles the form schema of a section from its active SeccionMenuInput
+    rows, ordered by orden (inputs without orden go last):
+
+        {
+            "seccionMenu": seccion_menu_id,
+            "inputs": {input_id: {..., "selectColumnas": [...], "selectValues": [...], "selectFilters": {...}}},
+            "orden": [input_id, ...],
+            "modos": {"alta": [input_id, ...], "modifica": [...], "lista": [...], "filtro": [...]},
+        }
+
+    Returns {"etag": ..., "payload": ...}, or None if the section does not
+    exist; the etag is a hash of the payload.
+    """
+    if not SeccionMenu.objects.filter(id=seccion_menu_id).exists():
+        return None
+
+    rows = SeccionMenuInput.objects.filter(
+        seccion_menu_id=seccion_menu_id,
+        status=True
+    ).values(
+        *INPUT_FIELDS,
+        *FORM_MODES,
+        "select_columnas",
+        "select_values",
+        "select_filters"
+    )
+
+    rows = sorted(rows, key=lambda row: (row["orden"] is None, row["orden"] or 0, row["id"]))
+
+    inputs = {}
+    modes = {mode: [] for mode in FORM_MODES}
+
+    for row in rows:
+        columnas = parse_select_columnas(row["select_columnas"])
+
+        data = camelize(
+            {field: row[field] for field in INPUT_FIELDS},
+            **api_settings.JSON_UNDERSCOREIZE
+        )
+        data["selectColumnas"] = columnas
+        data["selectValues"] = parse_select_values(row["select_values"], columnas)
+        data["selectFilters"] = parse_select_filters(row["select_filters"])
+
+        inputs[row["id"]] = data
+
+        for mode in FORM_MODES:
+            if row[mode]:
+                modes[mode].append(row["id"])
+
+    payload = CamelizedDict(
+        seccionMenu=seccion_menu_id,
+        inputs=inputs,
+        orden=[row["id"] for row in rows],
+        modos=modes,
+    )
+
+    etag = hashlib.sha1(
+        json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode()
+    ).hexdigest()
+
+    return {
+        "etag": etag,
+        "payload": payload,
+    }
+
+def get_form_schema(seccion_menu_id):
+    """
+    Returns the compiled form schema (and its etag) of a section, or None
+    if the section does not exist
+    """
+    return form_schema_cache.get(
+        str(seccion_menu_id),
+        lambda: compile_form_schema(seccion_menu_id),
+        scope=seccion_menu_id
+    )
@@ -0,0 +1,340 @@
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import models
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from dashboard.fast_serializers import PASSTHROUGH_FIELDS
+from dashboard.models import SeccionMenu, SeccionMenuInput
+
+from .form_schema_service import form_schema_cache, parse_select_columnas
+
+# Query params handled by the view / paginator, never taken as filters
+RESERVED_PARAMS = ("cursor", "page_size", "format")
+
+# Text columns filter by prefix (LIKE 'x%'), which the varchar_pattern_ops
+# index Django adds to indexed CharFields on PostgreSQL can serve
+TEXT_FIELDS = (models.CharField, models.TextField)
+
+RANGE_LOOKUPS = ("gte", "lte")
+
+# Apps whose models a section may list (DASHBOARD_LIST_APPS overrides it)
+LIST_APPS = ("dashboard", "nomina")
+
+# Columns whose name contains any of these are never listed or filtered
+SENSITIVE_FIELDS = ("password", "secret", "token")
+
+def get_list_apps():
+    return getattr(settings, "DASHBOARD_LIST_APPS", LIST_APPS)
+
+def resolve_model(modelo):
+    """
+    Resolves a SeccionMenuInput.modelo ("app_label.Model", model name or
+    db_table) to a model class of one of the list apps
+    """
+    modelo = (modelo or "").strip()
+    list_apps = get_list_apps()
+
+    if "." in modelo:
+        try:
+            model = apps.get_model(*modelo.split(".", 1))
+        except (LookupError, ValueError):
+            raise ValidationError(f"Unknown model: {modelo}")
+
+        if model._meta.app_label not in list_apps:
+            raise ValidationError(f"Unknown model: {modelo}")
+
+        return model
+
+    matches = [
+        model for model in apps.get_models()
+        if model._meta.app_label in list_apps
+        and modelo.lower() in (model._meta.model_name, model._meta.db_table.lower())
+    ]
+
+    if len(matches) != 1:
+        raise ValidationError(f"Unknown model: {modelo}")
+
+    return matches[0]
+
+def get_column_field(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        field = None
+
+    if (
+        field is None
+        or not field.concrete
+        or field.many_to_many
+        or model._meta.app_label not in get_list_apps()
+        or any(sensitive in field.name.lower() for sensitive in SENSITIVE_FIELDS)
+    ):
+        raise ValidationError(f"Unknown column: {model._meta.label}.{name}")
+
+    return field
+
+def _compile_column(model, row):
+    name = row["input_name"]
+    field = get_column_field(model, name)
+
+    if not field.is_relation:
+        return [name, name, None]
+
+    # select_columnas names the related columns shown for a foreign key;
+    # their lookups join the related table in the same query
+    related = field.related_model
+    related_pk = related._meta.pk.name
+    related_columns = [[related_pk, field.attname]]
+
+    for column in parse_select_columnas(row["select_columnas"]):
+        if column == related_pk:
+            continue
+
+        if get_column_field(related, column).is_relation:
+            raise ValidationError(f"Unknown column: {related._meta.label}.{column}")
+
+        related_columns.append([column, f"{name}__{column}"])
+
+    return [name, field.attname, related_columns]
+
+def _compile_filters(model, row):
+    name = row["input_name"]
+    field = get_column_field(model, name)
+
+    if field.is_relation:
+        return {name: [field.attname, "in"]}
+
+    if isinstance(field, TEXT_FIELDS) and not field.choices:
+        return {name: [name, "startswith"]}
+
+    if isinstance(field, models.BooleanField):
+        return {name: [name, "exact"]}
+
+    filters = {name: [name, "in"]}
+
+    for lookup in RANGE_LOOKUPS:
+        filters[f"{name}__{lookup}"] = [name, lookup]
+
+    return filters
+
+def compile_list_plan(seccion_menu_id):
+    """
+    Compiles the list/filter plan of a section from its active inputs:
+
+        {
+            "model": "app_label.model_name",
+            "pk": pk name,
+            "columns": [[input_name, path, related columns or None], ...],
+            "values": [path, ...],
+            "filters": {query param: [path, lookup]},
+        }
+
+    Columns are the inputs flagged lista (in orden order), filters the ones
+    flagged filtro; input_name must be a concrete field of the section's
+    model, which is the single modelo named by those inputs. Returns None
+    if the section does not exist.
+    """
+    if not SeccionMenu.objects.filter(id=seccion_menu_id).exists():
+        return None
+
+    rows = sorted(
+        SeccionMenuInput.objects.filter(
+            seccion_menu_id=seccion_menu_id,
+            status=True
+        ).filter(
+            models.Q(lista=True) | models.Q(filtro=True)
+        ).values(
+            "id", "input_name", "orden", "lista", "filtro", "select_columnas", "modelo"
+        ),
+        key=lambda row: (row["orden"] is None, row["orden"] or 0, row["id"])
+    )
+
+    modelos = {
+        resolve_model(modelo)
+        for modelo in {row["modelo"] for row in rows if (row["modelo"] or "").strip()}
+    }
+
+    if len(modelos) != 1:
+        raise ValidationError(
+            "Section inputs must name exactly one modelo"
+            + (f" (found: {', '.join(sorted(m._meta.label for m in modelos))})" if modelos else "")
+        )
+
+    model = modelos.pop()
+    pk = model._meta.pk.name
+
+    columns = []
+    filters = {}
+
+    for row in rows:
+        if not row["input_name"]:
+            raise ValidationError(f"Input {row['id']} has no input_name")
+
+        if row["lista"]:
+            columns.append(_compile_column(model, row))
+
+        if row["filtro"]:
+            filters.update(_compile_filters(model, row))
+
+    values = [pk]
+
+    for _, path, related_columns in columns:
+        for _, related_path in related_columns or [[None, path]]:
+            if related_path not in values:
+                values.append(related_path)
+
+    return {
+        "model": model._meta.label_lower,
+        "pk": pk,
+        "columns": columns,
+        "values": values,
+        "filters": filters,
+    }
+
+def validate_input(seccion_menu_input):
+    """
+    Checks that a SeccionMenuInput flagged lista or filtro names a model of
+    the list apps and a column that can be listed; raises django's
+    ValidationError otherwise
+    """
+    if not (seccion_menu_input.lista or seccion_menu_input.filtro):
+        return
+
+    if not (seccion_menu_input.modelo or "").strip():
+        return
+
+    row = {
+        "input_name": seccion_menu_input.input_name,
+        "select_columnas": seccion_menu_input.select_columnas,
+    }
+
+    try:
+        model = resolve_model(seccion_menu_input.modelo)
+
+        if seccion_menu_input.lista:
+            _compile_column(model, row)
+
+        if seccion_menu_input.filtro:
+            _compile_filters(model, row)
+    except ValidationError as error:
+        raise DjangoValidationError([str(detail) for detail in error.detail])
+
+def get_list_plan(seccion_menu_id):
+    """
+    Returns the compiled list plan of a section (cached with the form
+    schemas), or None if the section does not exist
+    """
+    return form_schema_cache.get(
+        f"list:{seccion_menu_id}",
+        lambda: compile_list_plan(seccion_menu_id),
+        scope=seccion_menu_id
+    )
+
+def _to_python(field, value):
+    if isinstance(field, models.BooleanField) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+
+    try:
+        return field.to_python(value)
+    except DjangoValidationError:
+        raise ValidationError(f"Invalid value for {field.name}: {value}")
+
+def filter_rows(plan, params):
+    """
+    Returns the .values() queryset of the plan's model with the query
+    params applied; params that are not filtro columns are rejected
+    """
+    model = apps.get_model(plan["model"])
+    queryset = model._default_manager.all()
+
+    conditions = {}
+
+    for param, value in params.items():
+        if param in RESERVED_PARAMS:
+            continue
+
+        if param not in plan["filters"]:
+            raise ValidationError(f"Unknown filter: {param}")
+
+        path, lookup = plan["filters"][param]
+        field = model._meta.get_field(path)
+
+        if lookup == "in":
+            values = [_to_python(field, item) for item in value.split(",") if item != ""]
+
+            if not values:
+                continue
+
+            if len(values) == 1:
+                conditions[path] = values[0]
+            else:
+                conditions[f"{path}__in"] = values
+        else:
+            conditions[f"{path}__{lookup}"] = _to_python(field, value)
+
+    return queryset.filter(**conditions).values(*plan["values"])
+
+def _path_field(model, path):
+    *relations, name = path.split("__")
+
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+
+    for field in model._meta.concrete_fields:
+        if name in (field.name, field.attname):
+            return field.target_field if field.is_relation else field
+
+    raise ValidationError(f"Unknown column: {model._meta.label}.{name}")
+
+@lru_cache(maxsize=None)
+def get_converter(model_label, path):
+    """
+    to_representation of the DRF field a ModelSerializer would build for
+    the column (Decimal -> str, datetime -> ISO 8601 with Z, ...), or None
+    when the database value is already JSON-native
+    """
+    field = _path_field(apps.get_model(model_label), path)
+    field_class, kwargs = serializers.ModelSerializer().build_standard_field(field.name, field)
+    drf_field = field_class(**kwargs)
+
+    return None if type(drf_field) in PASSTHROUGH_FIELDS else drf_field.to_representation
+
+def build_rows(plan, rows):
+    """
+    Shapes .values() rows into {pk, input_name: value}; foreign keys with
+    select_columnas become {related pk, column: value, ...} objects. Values
+    go through the DRF field representation, as in ValuesSerializer.
+    """
+    pk = plan["pk"]
+    columns = plan["columns"]
+
+    converters = [
+        (path, converter)
+        for path in plan["values"]
+        for converter in [get_converter(plan["model"], path)]
+        if converter is not None
+    ]
+
+    built = []
+
+    for row in rows:
+        for path, converter in converters:
+            if row[path] is not None:
+                row[path] = converter(row[path])
+
+        data = {pk: row[pk]}
+
+        for name, path, related_columns in columns:
+            if related_columns is None or row[path] is None:
+                data[name] = row[path]
+            else:
+                data[name] = {key: row[related_path] for key, related_path in related_columns}
+
+        built.append(data)
+
+    return built
@@ -0,0 +1,179 @@
+import base64
+import zlib
+
+from dashboard.models import Accion, AccionGrupo
+
+from .versioned_cache import VersionedCache
+
+# Bit index, group and user permission bitsets; invalidated by the signals
+# in dashboard/signals.py together with permission_cache
+permission_bits_cache = VersionedCache("dashboard:permission_bits", timeout=60 * 60 * 24)
+
+# "any" holds every granted action; "menu" the breadcrumb actions of active
+# sections in active menus (the entries of get_allowed_menus)
+PERMISSION_KINDS = ("any", "breadcrumb", "navbar", "table", "menu")
+
+# JWT claim holding the permission digest
+PERMISSION_CLAIM = "perms"
+
+def compile_bit_index():
+    """
+    Compiles the dense bit index of the acciones that belong to a section:
+
+        {
+            "bits": {accion_id: bit},
+            "kinds": {kind: bitset of the acciones of that kind},
+            "sections": {seccion_menu_id: bitset of its acciones},
+        }
+
+    Bits follow the Accion id order, so new acciones take the next bits and
+    the positions only shift when an accion is deleted (which bumps the
+    cache version). The kind masks turn a set of granted acciones into the
+    breadcrumb/navbar/table/menu sets with a single AND.
+    """
+    bits = {}
+    kinds = dict.fromkeys(PERMISSION_KINDS, 0)
+    sections = {}
+
+    rows = Accion.objects.filter(
+        seccion_menu__isnull=False
+    ).order_by("id").values_list(
+        "id",
+        "seccion_menu_id",
+        "on_breadcrumb",
+        "on_navbar",
+        "on_table",
+        "seccion_menu__status",
+        "seccion_menu__menu__status",
+    )
+
+    for position, row in enumerate(rows):
+        accion_id, seccion_menu_id, on_breadcrumb, on_navbar, on_table, seccion_status, menu_status = row
+        bit = 1 << position
+
+        bits[accion_id] = position
+        sections[seccion_menu_id] = sections.get(seccion_menu_id, 0) | bit
+
+        kinds["any"] |= bit
+
+        if on_breadcrumb:
+            kinds["breadcrumb"] |= bit
+
+            if seccion_status and menu_status:
+                kinds["menu"] |= bit
+
+        if on_navbar:
+            kinds["navbar"] |= bit
+
+        if on_table:
+            kinds["table"] |= bit
+
+    return {
+        "bits": bits,
+        "kinds": kinds,
+        "sections": sections,
+    }
+
+def get_bit_index():
+    return permission_bits_cache.get("index", compile_bit_index)
+
+def compile_group_bits(group_id):
+    """
+    Bitset of the active acciones granted to a group
+    """
+    bits = get_bit_index()["bits"]
+    granted = 0
+
+    for accion_id in AccionGrupo.objects.filter(
+        grupo_id=group_id,
+        status=True,
+        accion__status=True,
+        accion__seccion_menu__isnull=False,
+    ).values_list("accion_id", flat=True):
+        granted |= 1 << bits[accion_id]
+
+    return granted
+
+def get_group_bits(group_id):
+    return permission_bits_cache.get(
+        f"group:{group_id}",
+        lambda: compile_group_bits(group_id)
+    )
+
+def expand_bits(granted):
+    """
+    {kind: bitset} of a set of granted acciones
+    """
+    kinds = get_bit_index()["kinds"]
+
+    return {kind: granted & kinds[kind] for kind in PERMISSION_KINDS}
+
+def compile_user_bits(user):
+    """
+    A user's effective permissions: the OR of their groups' bitsets, split
+    by kind
+    """
+    granted = 0
+
+    for group_id in user.groups.values_list("id", flat=True):
+        granted |= get_group_bits(group_id)
+
+    return expand_bits(granted)
+
+def get_user_bits(user):
+    return permission_bits_cache.get(
+        f"user:{user.pk}",
+        lambda: compile_user_bits(user)
+    )
+
+def has_accion(user, accion_id, kind="any"):
+    bit = get_bit_index()["bits"].get(accion_id)
+
+    return bit is not None and bool(get_user_bits(user)[kind] >> bit & 1)
+
+def can_access_section(user, seccion_menu_id, kind="any"):
+    """
+    True if the user is granted any action of the section
+    """
+    return bool(get_user_bits(user)[kind] & get_bit_index()["sections"].get(seccion_menu_id, 0))
+
+def get_allowed_seccion_menu_ids(user, kind="menu"):
+    """
+    Ids of the sections where the user is granted an action of the kind
+    """
+    bits = get_user_bits(user)[kind]
+
+    return sorted(
+        seccion_menu_id
+        for seccion_menu_id, mask in get_bit_index()["sections"].items()
+        if bits & mask
+    )
+
+def encode_bits(bits):
+    data = zlib.compress(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), 9)
+
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def decode_bits(text):
+    data = zlib.decompress(base64.urlsafe_b64decode(text + "=" * (-len(text) % 4)))
+
+    return int.from_bytes(data, "little")
+
+def get_permission_digest(user):
+    """
+    The user's granted acciones as a JWT-friendly dict: {"v": cache
+    version, "any": base64url zlib-compressed little-endian bitset}. Bits
+    are positions of the bit index of that version; a digest whose "v"
+    differs from the current version may be stale.
+    """
+    return {
+        "v": permission_bits_cache.version(),
+        "any": encode_bits(get_user_bits(user)["any"]),
+    }
+
+def decode_permission_digest(digest):
+    """
+    {kind: bitset} of a digest from get_permission_digest, split with the
+    current bit index
+    """
+    return expand_bits(decode_bits(digest["any"]))
@@ -0,0 +1,189 @@
+from django.contrib.auth.models import Group
+
+from dashboard.models import Accion, AccionBasica, AccionGrupo, Menu, SeccionMenu
+
+from .accion_grupo_service import permission_cache
+from .permission_bits_service import permission_bits_cache
+from .versioned_cache import VersionedCache
+
+ADMIN_GROUP = "administrador"
+
+# Group name -> id lookups; invalidated by the signals in dashboard/signals.py
+group_cache = VersionedCache("dashboard:groups", timeout=60 * 60 * 24)
+
+ACCION_BASICA_FIELDS = (
+    "descripcion",
+    "call_method",
+    "label",
+    "icon",
+    "on_breadcrumb",
+    "on_navbar",
+    "on_table",
+)
+
+SECCION_MENU_FIELDS = ("descripcion", "navbar_label", "icon", "visible_app", "status")
+
+def get_admin_group_id():
+    """
+    Returns the id of the "administrador" group, which is granted every new
+    Accion; raises Group.DoesNotExist if it is missing
+    """
+    return group_cache.get(
+        ADMIN_GROUP,
+        lambda: Group.objects.values_list("id", flat=True).get(name=ADMIN_GROUP)
+    )
+
+def grant_admin_acciones(accion_ids):
+    """
+    Grants the admin group the given acciones with a single bulk insert;
+    existing grants are left as they are
+    """
+    grupo_id = get_admin_group_id()
+
+    AccionGrupo.objects.bulk_create(
+        [AccionGrupo(accion_id=accion_id, grupo_id=grupo_id) for accion_id in accion_ids],
+        ignore_conflicts=True
+    )
+
+def provision_default_acciones(seccion_menu_ids, acciones_basicas=None):
+    """
+    Creates the active AccionBasica rows as acciones of each section, and
+    grants the new ones to the admin group, in a fixed number of queries
+    regardless of the number of sections. Acciones that already exist are
+    not touched. Returns the number of acciones created.
+
+    bulk_create sends no signals: callers outside the SeccionMenu post_save
+    handler must invalidate permission_cache and permission_bits_cache
+    themselves.
+    """
+    seccion_menu_ids = list(seccion_menu_ids)
+
+    if acciones_basicas is None:
+        acciones_basicas = list(
+            AccionBasica.objects.filter(status=True).values(*ACCION_BASICA_FIELDS)
+        )
+
+    if not seccion_menu_ids or not acciones_basicas:
+        return 0
+
+    descripciones = {accion_basica["descripcion"] for accion_basica in acciones_basicas}
+
+    existing = set(
+        Accion.objects.filter(
+            seccion_menu_id__in=seccion_menu_ids,
+            descripcion__in=descripciones
+        ).values_list("seccion_menu_id", "descripcion")
+    )
+
+    missing = [
+        Accion(seccion_menu_id=seccion_menu_id, **accion_basica)
+        for seccion_menu_id in seccion_menu_ids
+        for accion_basica in acciones_basicas
+        if (seccion_menu_id, accion_basica["descripcion"]) not in existing
+    ]
+
+    if not missing:
+        return 0
+
+    # ignore_conflicts covers rows created concurrently; it leaves the pks
+    # unset, so the new acciones are read back by (seccion_menu, descripcion)
+    Accion.objects.bulk_create(missing, ignore_conflicts=True)
+
+    created = {(accion.seccion_menu_id, accion.descripcion) for accion in missing}
+
+    grant_admin_acciones(
+        accion_id
+        for accion_id, seccion_menu_id, descripcion in Accion.objects.filter(
+            seccion_menu_id__in={seccion_menu_id for seccion_menu_id, _ in created},
+            descripcion__in=descripciones
+        ).values_list("id", "seccion_menu_id", "descripcion")
+        if (seccion_menu_id, descripcion) in created
+    )
+
+    return len(missing)
+
+def provision_secciones(secciones, batch_size=500):
+    """
+    Bulk-creates sections from dicts of SeccionMenu fields ("menu" is a
+    Menu descripcion or id) and provisions their default acciones.
+    Sections whose descripcion already exists (or repeats an earlier one)
+    are skipped: they are neither updated nor provisioned.
+
+    Returns {
+        "secciones": ids of the sections created,
+        "omitidas": descripciones of the sections skipped,
+        "acciones": acciones created,
+    }.
+    """
+    secciones = list(secciones)
+
+    menus = dict(Menu.objects.values_list("descripcion", "id"))
+    menu_ids = set(menus.values())
+
+    existing = set(
+        SeccionMenu.objects.filter(
+            descripcion__in=[seccion["descripcion"] for seccion in secciones]
+        ).values_list("descripcion", flat=True)
+    )
+
+    rows = []
+    skipped = []
+
+    for seccion in secciones:
+        if seccion["descripcion"] in existing:
+            skipped.append(seccion["descripcion"])
+            continue
+
+        existing.add(seccion["descripcion"])
+
+        menu = seccion.get("menu")
+
+        if menu is not None and menu not in menu_ids:
+            if menu not in menus:
+                raise ValueError(f"Unknown menu: {menu}")
+
+            menu = menus[menu]
+
+        rows.append(SeccionMenu(
+            menu_id=menu,
+            **{field: seccion[field] for field in SECCION_MENU_FIELDS if field in seccion}
+        ))
+
+    # ignore_conflicts only covers sections created concurrently; it leaves
+    # the pks unset, so the new sections are read back by descripcion
+    SeccionMenu.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+
+    seccion_menu_ids = list(
+        SeccionMenu.objects.filter(
+            descripcion__in=[seccion.descripcion for seccion in rows]
+        ).order_by("id").values_list("id", flat=True)
+    )
+
+    return {
+        "secciones": seccion_menu_ids,
+        "omitidas": skipped,
+        "acciones": provision_all(seccion_menu_ids, batch_size=batch_size),
+    }
+
+def provision_all(seccion_menu_ids, batch_size=500):
+    """
+    provision_default_acciones over batches of sections, invalidating the
+    permission caches once at the end
+    """
+    acciones_basicas = list(
+        AccionBasica.objects.filter(status=True).values(*ACCION_BASICA_FIELDS)
+    )
+
+    seccion_menu_ids = list(seccion_menu_ids)
+    created = 0
+
+    for start in range(0, len(seccion_menu_ids), batch_size):
+        created += provision_default_acciones(
+            seccion_menu_ids[start:start + batch_size],
+            acciones_basicas
+        )
+
+    permission_cache.invalidate_on_commit()
+    permission_bits_cache.invalidate_on_commit()
+
+    return created
@@ -0,0 +1,113 @@
+from dashboard.models import StyledColumn
+
+from .versioned_cache import VersionedCache
+
+# Compiled StyledColumn lookups per seccion_menu; invalidated by the
+# signals in dashboard/signals.py
+style_cache = VersionedCache("dashboard:styled_columns", timeout=60 * 60 * 24)
+
+# Key added to each styled row: {columna: style_id}
+ROW_STYLES_KEY = "_styles"
+
+def style_key(value):
+    """
+    Normalizes a cell value or StyledColumn.valor for matching: booleans as
+    "true"/"false", everything else as its stripped string
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    if value is None:
+        return ""
+
+    value = str(value).strip()
+
+    return value.lower() if value.lower() in ("true", "false") else value
+
+def compile_styles(seccion_menu_id):
+    """
+    Compiles the active StyledColumn rules of a section into a lookup:
+
+        {
+            "columns": {columna: {valor: style_id}},
+            "styles": {style_id: {"backgroundColor": ..., "color": ..., "border": ...}},
+        }
+
+    Rules with the same colors share a style id.
+    """
+    columns = {}
+    styles = {}
+    style_ids = {}
+
+    rules = StyledColumn.objects.filter(
+        seccion_menu_id=seccion_menu_id,
+        status=True
+    ).exclude(
+        columna=None
+    ).order_by("id").values_list("columna", "valor", "background_color", "color", "border")
+
+    for columna, valor, background_color, color, border in rules:
+        style = (background_color, color, border)
+
+        if style not in style_ids:
+            style_ids[style] = len(style_ids) + 1
+            styles[style_ids[style]] = {
+                "backgroundColor": background_color,
+                "color": color,
+                "border": border,
+            }
+
+        columns.setdefault(columna.strip(), {})[style_key(valor)] = style_ids[style]
+
+    return {
+        "columns": columns,
+        "styles": styles,
+    }
+
+def get_styles(seccion_menu_id):
+    return style_cache.get(
+        str(seccion_menu_id),
+        lambda: compile_styles(seccion_menu_id)
+    )
+
+def _cell_value(row, columna):
+    """
+    Value of columna in a built row; a foreign key object matches on its pk
+    ("plaza") or on one of its columns ("plaza__descripcion")
+    """
+    name, _, related_column = columna.partition("__")
+    value = row.get(name)
+
+    if isinstance(value, dict):
+        if related_column:
+            return value.get(related_column)
+
+        return next(iter(value.values()), None)
+
+    return None if related_column else value
+
+def apply_styles(compiled, rows):
+    """
+    Adds {columna: style_id} under ROW_STYLES_KEY to the rows that match a
+    rule and returns the dictionary of the styles used, to be sent once
+    per response
+    """
+    used = {}
+
+    if not compiled["columns"]:
+        return used
+
+    for row in rows:
+        row_styles = {}
+
+        for columna, lookup in compiled["columns"].items():
+            style_id = lookup.get(style_key(_cell_value(row, columna)))
+
+            if style_id is not None:
+                row_styles[columna] = style_id
+                used[style_id] = compiled["styles"][style_id]
+
+        if row_styles:
+            row[ROW_STYLES_KEY] = row_styles
+
+    return used
@@ -0,0 +1,10 @@
+from .versioned_cache import VersionedCache
+
+# Version counter of the auth User table, bumped by the signals in
+# dashboard/signals.py (User has no updated_at to derive it from)
+user_cache = VersionedCache("dashboard:users")
+
+# User fields the /users payload depends on: the UserSerializer fields and
+# the ordering; saves that change none of them (e.g. last_login on every
+# JWT login) keep the version
+USER_FIELDS = ("username", "email", "date_joined")
@@ -0,0 +1,103 @@
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class VersionedCache:
+    """
+    Two-tier cache for data compiled from the database.
+
+    Values live in a process-local dict backed by the shared Django cache.
+    Both tiers are keyed by a version counter stored in the shared cache, so
+    invalidate() in any process makes every process rebuild on next access.
+
+    Keys read with a scope also carry that scope's own counter, so
+    invalidate_scope() rebuilds them without touching the rest of the
+    namespace.
+    """
+
+    def __init__(self, namespace, timeout=None):
+        self.namespace = namespace
+        self.timeout = timeout
+
+        self._version_key = f"{namespace}:version"
+        self._local = {}
+        self._local_version = None
+        self._lock = threading.Lock()
+
+    def version(self):
+        return cache.get(self._version_key, 0)
+
+    def _scope_version_key(self, scope):
+        return f"{self.namespace}:scope:{scope}:version"
+
+    def get(self, key, build, scope=None):
+        """
+        Returns the cached value for key, calling build() to compute it
+        when neither tier has it for the current version (and scope
+        version, if a scope is given).
+        """
+        if scope is None:
+            version = self.version()
+        else:
+            scope_version_key = self._scope_version_key(scope)
+            versions = cache.get_many([self._version_key, scope_version_key])
+            version = versions.get(self._version_key, 0)
+            key = f"{key}@{versions.get(scope_version_key, 0)}"
+
+        with self._lock:
+            if self._local_version != version:
+                self._local = {}
+                self._local_version = version
+
+            if key in self._local:
+                return self._local[key]
+
+        shared_key = f"{self.namespace}:{version}:{key}"
+
+        value = cache.get(shared_key)
+
+        if value is None:
+            value = build()
+            cache.set(shared_key, value, self.timeout)
+
+        with self._lock:
+            if self._local_version == version:
+                self._local[key] = value
+
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._local = {}
+            self._local_version = None
+
+        try:
+            cache.incr(self._version_key)
+        except ValueError:
+            cache.set(self._version_key, 1, None)
+
+    def invalidate_on_commit(self):
+        """
+        Invalidates now, so the writing transaction reads its own changes,
+        and again when it commits, so values another process compiled from
+        pre-commit data under the new version are discarded too.
+        """
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+    def invalidate_scope(self, scope):
+        scope_version_key = self._scope_version_key(scope)
+
+        try:
+            cache.incr(scope_version_key)
+        except ValueError:
+            cache.set(scope_version_key, 1, None)
+
+    def invalidate_scope_on_commit(self, scope):
+        """
+        invalidate_scope() now and on commit, as in invalidate_on_commit()
+        """
+        self.invalidate_scope(scope)
+        transaction.on_commit(lambda: self.invalidate_scope(scope))
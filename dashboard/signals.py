@@ -1,34 +1,101 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, User
 
-from .models import SeccionMenu, Accion, AccionBasica, AccionGrupo
+from dashboard.services.accion_grupo_service import permission_cache
+from dashboard.services.form_schema_service import form_schema_cache
+from dashboard.services.permission_bits_service import permission_bits_cache
+from dashboard.services.provisioning_service import (
+    get_admin_group_id,
+    group_cache,
+    provision_default_acciones
+)
+from dashboard.services.styled_column_service import style_cache
+from dashboard.services.user_service import USER_FIELDS, user_cache
+
+from .models import SeccionMenu, SeccionMenuInput, Accion, AccionGrupo, Menu, StyledColumn
 
 @receiver(post_save, sender=Accion)
 def create_accion_grupo(sender, instance, created, **kwargs):
     if created:
-        grupo = Group.objects.get(name="administrador")
-
         AccionGrupo.objects.get_or_create(
             accion=instance,
-            grupo=grupo
+            grupo_id=get_admin_group_id()
         )
 
 @receiver(post_save, sender=SeccionMenu)
 def create_default_acciones(sender, instance, created, **kwargs):
     if created:
-        acciones_basicas = AccionBasica.objects.filter(
-            status=True
-        )
+        # Bulk inserts send no signals; the permission cache is invalidated
+        # by invalidate_permission_cache on this same SeccionMenu save
+        provision_default_acciones([instance.id])
+
+@receiver(post_save, sender=Accion)
+@receiver(post_delete, sender=Accion)
+@receiver(post_save, sender=AccionGrupo)
+@receiver(post_delete, sender=AccionGrupo)
+@receiver(post_save, sender=SeccionMenu)
+@receiver(post_delete, sender=SeccionMenu)
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def invalidate_permission_cache(sender, **kwargs):
+    permission_cache.invalidate_on_commit()
+    permission_bits_cache.invalidate_on_commit()
+
+@receiver(pre_save, sender=SeccionMenuInput)
+def remember_input_section(sender, instance, **kwargs):
+    # An input moved to another section invalidates both sections
+    if instance.pk:
+        instance._previous_seccion_menu_id = SeccionMenuInput.objects.filter(
+            pk=instance.pk
+        ).values_list("seccion_menu_id", flat=True).first()
+
+@receiver(post_save, sender=SeccionMenuInput)
+@receiver(post_delete, sender=SeccionMenuInput)
+def invalidate_input_form_schema(sender, instance, **kwargs):
+    seccion_menu_ids = {instance.seccion_menu_id, getattr(instance, "_previous_seccion_menu_id", None)}
+
+    for seccion_menu_id in seccion_menu_ids - {None}:
+        form_schema_cache.invalidate_scope_on_commit(seccion_menu_id)
+
+@receiver(post_save, sender=SeccionMenu)
+@receiver(post_delete, sender=SeccionMenu)
+def invalidate_section_form_schema(sender, instance, **kwargs):
+    form_schema_cache.invalidate_scope_on_commit(instance.id)
+
+@receiver(post_save, sender=StyledColumn)
+@receiver(post_delete, sender=StyledColumn)
+def invalidate_style_cache(sender, **kwargs):
+    style_cache.invalidate_on_commit()
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_cache(sender, **kwargs):
+    group_cache.invalidate_on_commit()
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_user_groups(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        permission_cache.invalidate_on_commit()
+        permission_bits_cache.invalidate_on_commit()
+
+@receiver(pre_save, sender=User)
+def remember_user_fields(sender, instance, update_fields=None, **kwargs):
+    if instance.pk and (update_fields is None or set(update_fields) & set(USER_FIELDS)):
+        instance._previous_user_fields = User.objects.filter(
+            pk=instance.pk
+        ).values_list(*USER_FIELDS).first()
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(USER_FIELDS):
+        return
+
+    previous = getattr(instance, "_previous_user_fields", None)
+
+    if created or previous != tuple(getattr(instance, field) for field in USER_FIELDS):
+        user_cache.invalidate_on_commit()
 
-        for accion_basica in acciones_basicas:
-            Accion.objects.get_or_create(
-                seccion_menu=instance,
-                descripcion=accion_basica.descripcion,
-                call_method=accion_basica.call_method,
-                label=accion_basica.label,
-                icon=accion_basica.icon,
-                on_breadcrumb=accion_basica.on_breadcrumb,
-                on_navbar=accion_basica.on_navbar,
-                on_table=accion_basica.on_table
-            )
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, **kwargs):
+    user_cache.invalidate_on_commit()
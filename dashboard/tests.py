@@ -1,3 +1,755 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User, update_last_login
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camelize
+
+from dashboard.fast_serializers import ValuesSerializer
+from dashboard.renderers import FastCamelCaseJSONRenderer
+
+from dashboard.services.accion_grupo_service import (
+    get_allowed_actions,
+    get_allowed_breadcrumbs_for_group,
+    get_allowed_menus,
+    get_allowed_menus_for_group,
+    get_allowed_navbar_for_group,
+    get_allowed_table_actions_for_group,
+    permission_cache,
+)
+from dashboard.services.form_schema_service import (
+    get_form_schema,
+    parse_select_columnas,
+    parse_select_filters,
+    parse_select_values,
+)
+from dashboard.services.permission_bits_service import (
+    PERMISSION_CLAIM,
+    can_access_section,
+    decode_permission_digest,
+    get_allowed_seccion_menu_ids,
+    get_user_bits,
+    has_accion,
+    permission_bits_cache,
+)
+from dashboard.services.provisioning_service import get_admin_group_id, provision_default_acciones
+from dashboard.services.styled_column_service import (
+    ROW_STYLES_KEY,
+    apply_styles,
+    get_styles,
+    style_cache,
+)
+from dashboard.services.user_service import user_cache
+
+from nomina.models import Empleado
+
+from .models import Accion, AccionBasica, AccionGrupo, Menu, SeccionMenu, SeccionMenuInput, StyledColumn
+
+from .serializers import (
+    AccionBasicaSerializer,
+    AccionGrupoActionsSerializer,
+    AccionGrupoSeccionMenuSerializer,
+    AccionSerializer,
+    MenuSerializer,
+    SeccionMenuSerializer,
+    UserSerializer
+)
+
+def create_catalogs():
+    Group.objects.create(name="administrador")
+
+    for descripcion, on_breadcrumb, on_navbar, on_table in (
+        ("alta", True, True, False),
+        ("lista", True, False, False),
+        ("modifica", False, False, True),
+        ("elimina", False, False, True),
+    ):
+        AccionBasica.objects.create(
+            descripcion=descripcion,
+            call_method=descripcion,
+            label=descripcion.title(),
+            icon="bi-" + descripcion,
+            on_breadcrumb=on_breadcrumb,
+            on_navbar=on_navbar,
+            on_table=on_table
+        )
+
+    for i in range(3):
+        menu = Menu.objects.create(
+            descripcion=f"menu_{2 - i}",
+            label=f"Menú {i}",
+            icon="bi-menu",
+            orden=i
+        )
+
+        for j in range(3):
+            SeccionMenu.objects.create(
+                menu=menu,
+                descripcion=f"seccion_{i}_{j}",
+                navbar_label=f"Sección {2 - j}",
+                icon="bi-seccion",
+                status=(i, j) != (1, 1)
+            )
+
+    # A section without menu and an action without section
+    SeccionMenu.objects.create(descripcion="sin_menu", navbar_label="Sin menú")
+    Accion.objects.create(descripcion="suelta", on_breadcrumb=True)
+
+class ValuesSerializerParityTest(TestCase):
+    """
+    The .values() fast path must render exactly what the DRF serializers
+    plus CamelCaseJSONRenderer render.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+        cls.capturista = Group.objects.create(name="capturista")
+
+        for accion in Accion.objects.order_by("id")[::2]:
+            AccionGrupo.objects.create(accion=accion, grupo=cls.capturista)
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+        cls.user.groups.set([Group.objects.get(name="administrador"), cls.capturista])
+
+    def setUp(self):
+        permission_cache.invalidate()
+
+    def assertParity(self, serializer_class, queryset):
+        expected = camelize(
+            serializer_class(queryset, many=True).data,
+            **api_settings.JSON_UNDERSCOREIZE
+        )
+
+        actual = ValuesSerializer(serializer_class).serialize(queryset)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(
+            FastCamelCaseJSONRenderer().render(actual),
+            CamelCaseJSONRenderer().render(serializer_class(queryset, many=True).data)
+        )
+
+    def test_model_serializers(self):
+        self.assertParity(MenuSerializer, Menu.objects.order_by("id"))
+        self.assertParity(SeccionMenuSerializer, SeccionMenu.objects.order_by("id"))
+        self.assertParity(AccionSerializer, Accion.objects.order_by("id"))
+        self.assertParity(AccionBasicaSerializer, AccionBasica.objects.order_by("id"))
+        self.assertParity(UserSerializer, User.objects.order_by("id"))
+
+    def test_nested_accion_grupo_serializers(self):
+        acciones_grupo = AccionGrupo.objects.order_by("id")
+
+        self.assertParity(AccionGrupoActionsSerializer, acciones_grupo)
+        self.assertParity(AccionGrupoSeccionMenuSerializer, acciones_grupo)
+
+    def test_allowed_endpoints(self):
+        def expected(queryset, serializer_class):
+            return camelize(
+                serializer_class(queryset, many=True).data,
+                **api_settings.JSON_UNDERSCOREIZE
+            )
+
+        ordering = ("accion__seccion_menu__menu__descripcion", "accion__seccion_menu__navbar_label", "id")
+
+        for seccion_menu in SeccionMenu.objects.all():
+            for kind, queryset in (
+                ("breadcrumb", get_allowed_breadcrumbs_for_group(self.user, seccion_menu.id)),
+                ("navbar", get_allowed_navbar_for_group(self.user, seccion_menu.id)),
+                ("table", get_allowed_table_actions_for_group(self.user, seccion_menu.id)),
+            ):
+                self.assertEqual(
+                    get_allowed_actions(self.user, seccion_menu.id, kind),
+                    expected(queryset.order_by(*ordering), AccionGrupoActionsSerializer)
+                )
+
+        self.assertEqual(
+            get_allowed_menus(self.user),
+            expected(get_allowed_menus_for_group(self.user), AccionGrupoSeccionMenuSerializer)
+        )
+
+    def test_list_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get("/api/seccion_menu/", HTTP_ACCEPT="application/json")
+
+        self.assertEqual(
+            response.content,
+            CamelCaseJSONRenderer().render(
+                SeccionMenuSerializer(SeccionMenu.objects.all(), many=True).data
+            )
+        )
+
+class PermissionBitsTest(TestCase):
+    """
+    The user's bitsets must grant exactly what the get_allowed_*_for_group
+    querysets allow.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+        cls.capturista = Group.objects.create(name="capturista")
+
+        for accion in Accion.objects.filter(seccion_menu__menu__isnull=False).order_by("id")[1::3]:
+            AccionGrupo.objects.create(accion=accion, grupo=cls.capturista)
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+        cls.user.groups.set([cls.capturista])
+
+    def setUp(self):
+        permission_bits_cache.invalidate()
+
+    def test_bits_match_querysets(self):
+        for seccion_menu in SeccionMenu.objects.all():
+            allowed = set()
+
+            for kind, queryset in (
+                ("breadcrumb", get_allowed_breadcrumbs_for_group(self.user, seccion_menu.id)),
+                ("navbar", get_allowed_navbar_for_group(self.user, seccion_menu.id)),
+                ("table", get_allowed_table_actions_for_group(self.user, seccion_menu.id)),
+            ):
+                expected = set(queryset.values_list("accion_id", flat=True))
+                allowed |= expected
+
+                for accion in seccion_menu.acciones.all():
+                    self.assertEqual(has_accion(self.user, accion.id, kind), accion.id in expected)
+
+            if allowed:
+                self.assertTrue(can_access_section(self.user, seccion_menu.id))
+
+        self.assertEqual(
+            get_allowed_seccion_menu_ids(self.user),
+            sorted(set(
+                get_allowed_menus_for_group(self.user).values_list("accion__seccion_menu_id", flat=True)
+            ))
+        )
+
+    def test_invalidation_and_digest(self):
+        self.assertFalse(can_access_section(self.user, SeccionMenu.objects.get(descripcion="sin_menu").id))
+
+        self.user.groups.add(Group.objects.get(name="administrador"))
+
+        self.assertTrue(can_access_section(self.user, SeccionMenu.objects.get(descripcion="sin_menu").id))
+
+        response = APIClient().post(
+            "/api/login/",
+            {"username": "usuario", "password": "secreto"},
+            format="json"
+        )
+        token = AccessToken(response.json()["user"]["access"])
+
+        self.assertEqual(decode_permission_digest(token[PERMISSION_CLAIM]), get_user_bits(self.user))
+
+class CacheInvalidationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+    def test_invalidates_again_on_commit(self):
+        version = permission_cache.version()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Accion.objects.filter(descripcion="suelta").get().save()
+
+            self.assertEqual(permission_cache.version(), version + 1)
+
+        self.assertTrue(callbacks)
+        self.assertEqual(permission_cache.version(), version + 2)
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+
+    def test_deletion_changes_etag(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get("/api/accion_basica/")
+        etag = response["ETag"]
+
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(client.get("/api/accion_basica/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        AccionBasica.objects.order_by("id").first().delete()
+
+        self.assertEqual(client.get("/api/accion_basica/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(
+            client.get("/api/accion_basica/", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT").status_code,
+            200
+        )
+
+    def test_login_keeps_users_etag(self):
+        version = user_cache.version()
+
+        update_last_login(None, self.user)
+        self.user.first_name = "Usuario"
+        self.user.save()
+
+        self.assertEqual(user_cache.version(), version)
+
+        self.user.email = "otro@example.com"
+        self.user.save()
+
+        self.assertGreater(user_cache.version(), version)
+
+class SeccionMenuRegistrosTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+        cls.user.groups.set([Group.objects.get(name="administrador")])
+
+    def setUp(self):
+        # Section ids are reused after each test's rollback
+        style_cache.invalidate()
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_seccion(self, descripcion, inputs):
+        seccion_menu = SeccionMenu.objects.create(descripcion=descripcion)
+
+        for orden, (input_name, modelo, lista, filtro) in enumerate(inputs):
+            SeccionMenuInput.objects.create(
+                seccion_menu=seccion_menu,
+                input_name=input_name,
+                modelo=modelo,
+                lista=lista,
+                filtro=filtro,
+                orden=orden
+            )
+
+        return seccion_menu
+
+    def get(self, seccion_menu, **params):
+        return self.client.get(f"/api/seccion_menu/{seccion_menu.id}/registros/", params)
+
+    def test_lista_y_filtra(self):
+        seccion_menu = self.create_seccion("menus", [
+            ("descripcion", "dashboard.Menu", True, True),
+            ("label", "menu", True, False),
+        ])
+
+        response = self.get(seccion_menu, descripcion="menu_1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": Menu.objects.get(descripcion="menu_1").id, "descripcion": "menu_1", "label": "Menú 1"}]
+        )
+
+    def test_estilos(self):
+        seccion_menu = self.create_seccion("menus", [
+            ("descripcion", "dashboard.Menu", True, True),
+            ("status", "dashboard.Menu", True, False),
+        ])
+
+        StyledColumn.objects.create(seccion_menu=seccion_menu, columna="descripcion", valor="menu_1", color="red")
+        Menu.objects.filter(descripcion="menu_2").update(status=False)
+
+        response = self.get(seccion_menu)
+        estilos = {row["descripcion"]: row.get(ROW_STYLES_KEY) for row in response.json()["results"]}
+
+        self.assertEqual(estilos, {"menu_0": None, "menu_1": {"descripcion": 1}, "menu_2": None})
+        self.assertEqual(
+            response.json()["styles"],
+            {"1": {"backgroundColor": None, "color": "red", "border": None}}
+        )
+
+    def test_filtro_no_declarado(self):
+        seccion_menu = self.create_seccion("menus", [
+            ("descripcion", "dashboard.Menu", True, True),
+            ("label", "dashboard.Menu", True, False),
+        ])
+
+        self.assertEqual(self.get(seccion_menu, label="Menú 1").status_code, 400)
+        self.assertEqual(self.get(seccion_menu, icon="bi-menu").status_code, 400)
+
+    def test_decimales_y_fechas(self):
+        empleado = Empleado.objects.create(
+            rfc="XAXX010101000",
+            sd=Decimal("500.50"),
+            fecha_ingreso=date(2015, 3, 1)
+        )
+
+        seccion_menu = self.create_seccion("empleados", [
+            ("rfc", "nomina.Empleado", True, False),
+            ("sd", "nomina.Empleado", True, False),
+            ("fecha_ingreso", "nomina.Empleado", True, False),
+            ("created_at", "nomina.Empleado", True, False),
+        ])
+
+        response = self.get(seccion_menu)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [{
+            "id": empleado.id,
+            "rfc": "XAXX010101000",
+            "sd": "500.50",
+            "fecha_ingreso": "2015-03-01",
+            "created_at": empleado.created_at.isoformat().replace("+00:00", "Z"),
+        }])
+
+    def test_modelo_desconocido(self):
+        seccion_menu = self.create_seccion("desconocido", [
+            ("descripcion", "dashboard.NoExiste", True, False),
+        ])
+
+        self.assertEqual(self.get(seccion_menu).status_code, 400)
+
+    def test_modelo_fuera_de_las_apps(self):
+        seccion_menu = self.create_seccion("usuarios", [
+            ("username", "auth.User", True, False),
+        ])
+
+        self.assertEqual(self.get(seccion_menu).status_code, 400)
+
+    @override_settings(DASHBOARD_LIST_APPS=("auth",))
+    def test_columna_sensible(self):
+        seccion_menu = self.create_seccion("usuarios", [
+            ("username", "auth.User", True, False),
+            ("password", "auth.User", True, False),
+        ])
+
+        self.assertEqual(self.get(seccion_menu).status_code, 400)
+
+    def test_valida_al_guardar(self):
+        seccion_menu = SeccionMenu.objects.create(descripcion="usuarios")
+
+        for modelo, input_name, select_columnas in (
+            ("auth.User", "username", None),
+            ("dashboard.Menu", "no_existe", None),
+            ("dashboard.SeccionMenuInput", "user_created", "password"),
+        ):
+            with self.assertRaises(ValidationError):
+                SeccionMenuInput(
+                    seccion_menu=seccion_menu,
+                    input_name=input_name,
+                    modelo=modelo,
+                    select_columnas=select_columnas,
+                    lista=True
+                ).full_clean()
+
+        SeccionMenuInput(
+            seccion_menu=seccion_menu,
+            input_name="descripcion",
+            modelo="dashboard.Menu",
+            lista=True
+        ).full_clean()
+
+    def test_columna_desconocida(self):
+        seccion_menu = self.create_seccion("columna", [
+            ("no_existe", "dashboard.Menu", True, False),
+        ])
+
+        self.assertEqual(self.get(seccion_menu).status_code, 400)
+
+    def test_sin_permiso(self):
+        seccion_menu = self.create_seccion("menus", [
+            ("descripcion", "dashboard.Menu", True, True),
+        ])
+
+        self.user.groups.clear()
+
+        self.assertEqual(self.get(seccion_menu).status_code, 403)
+
+class FormSchemaTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+        cls.user.groups.set([Group.objects.get(name="administrador")])
+
+        cls.menus = SeccionMenu.objects.create(descripcion="menus")
+        cls.secciones = SeccionMenu.objects.create(descripcion="secciones")
+
+        for seccion_menu in (cls.menus, cls.secciones):
+            SeccionMenuInput.objects.create(
+                seccion_menu=seccion_menu,
+                input_id="descripcion",
+                input_name="descripcion",
+                alta=True
+            )
+
+    def test_parse_select_columnas(self):
+        self.assertEqual(parse_select_columnas(None), [])
+        self.assertEqual(parse_select_columnas("  "), [])
+        self.assertEqual(parse_select_columnas('["id", " descripcion ", ""]'), ["id", "descripcion"])
+        self.assertEqual(
+            parse_select_columnas("id, descripcion;label|icon  orden"),
+            ["id", "descripcion", "label", "icon", "orden"]
+        )
+
+    def test_parse_select_values(self):
+        self.assertEqual(parse_select_values(""), [])
+        self.assertEqual(
+            parse_select_values('[{"id": 1, "descripcion": "Uno", "clave": "U"}]', ["id", "clave", "descripcion"]),
+            [{"id": 1, "descripcion": "Uno", "clave": "U", "value": 1, "label": "U Uno"}]
+        )
+        self.assertEqual(
+            parse_select_values('[[1, "Uno"], "dos", {"value": 3, "label": "Tres"}]'),
+            [{"value": 1, "label": "Uno"}, {"value": "dos", "label": "dos"}, {"value": 3, "label": "Tres"}]
+        )
+        self.assertEqual(parse_select_values('{"a": "A"}'), [{"value": "a", "label": "A"}])
+        self.assertEqual(
+            parse_select_values("1:Uno\n2=Dos; tres, true:Sí, null:Ninguno"),
+            [
+                {"value": 1, "label": "Uno"},
+                {"value": 2, "label": "Dos"},
+                {"value": "tres", "label": "tres"},
+                {"value": True, "label": "Sí"},
+                {"value": None, "label": "Ninguno"},
+            ]
+        )
+
+    def test_parse_select_filters(self):
+        self.assertEqual(parse_select_filters(None), {})
+        self.assertEqual(parse_select_filters('{"status": true}'), {"status": True})
+        self.assertEqual(
+            parse_select_filters("status=true&menu_id=2; descripcion = a b, sin_valor"),
+            {"status": True, "menu_id": 2, "descripcion": "a b"}
+        )
+
+    def test_sin_permiso(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        url = f"/api/seccion_menu/{self.menus.id}/form_schema/"
+
+        self.assertEqual(client.get(url).status_code, 200)
+
+        self.user.groups.clear()
+
+        self.assertEqual(client.get(url).status_code, 403)
+
+    def test_invalida_solo_la_seccion_modificada(self):
+        get_form_schema(self.menus.id)
+        get_form_schema(self.secciones.id)
+
+        SeccionMenuInput.objects.create(
+            seccion_menu=self.menus,
+            input_id="label",
+            input_name="label",
+            alta=True
+        )
+
+        with self.assertNumQueries(0):
+            get_form_schema(self.secciones.id)
+
+        self.assertEqual(len(get_form_schema(self.menus.id)["payload"]["inputs"]), 2)
+
+class ProvisioningTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+    def create_secciones(self, total, prefix):
+        # bulk_create sends no signals: the sections start without acciones
+        SeccionMenu.objects.bulk_create(
+            SeccionMenu(descripcion=f"{prefix}_{i}") for i in range(total)
+        )
+
+        return list(
+            SeccionMenu.objects.filter(descripcion__startswith=f"{prefix}_").values_list("id", flat=True)
+        )
+
+    def test_provision_default_acciones(self):
+        get_admin_group_id()
+        queries = []
+
+        for total, prefix in ((2, "pocas"), (10, "muchas")):
+            seccion_menu_ids = self.create_secciones(total, prefix)
+
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(provision_default_acciones(seccion_menu_ids), total * 4)
+
+            queries.append(len(context))
+
+            self.assertEqual(
+                AccionGrupo.objects.filter(
+                    accion__seccion_menu_id__in=seccion_menu_ids,
+                    grupo__name="administrador"
+                ).count(),
+                total * 4
+            )
+
+            self.assertEqual(provision_default_acciones(seccion_menu_ids), 0)
+
+        self.assertEqual(queries[0], queries[1])
+
+    def provisionar(self, secciones):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8") as archivo:
+            json.dump(secciones, archivo)
+            archivo.flush()
+
+            stdout = io.StringIO()
+            call_command("provisionar_secciones", archivo.name, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_provisionar_secciones(self):
+        secciones = [
+            {"descripcion": "nueva_1", "menu": "menu_1"},
+            {"descripcion": "nueva_2", "navbar_label": "Nueva 2"},
+            {"descripcion": "seccion_0_0"},
+        ]
+
+        salida = self.provisionar(secciones)
+
+        self.assertIn("2 sections provisioned, 8 acciones created", salida)
+        self.assertIn("1 existing sections skipped: seccion_0_0", salida)
+        self.assertEqual(
+            SeccionMenu.objects.get(descripcion="nueva_1").menu,
+            Menu.objects.get(descripcion="menu_1")
+        )
+        self.assertEqual(
+            AccionGrupo.objects.filter(accion__seccion_menu__descripcion__startswith="nueva_").count(),
+            8
+        )
+
+        acciones = Accion.objects.count()
+        salida = self.provisionar(secciones)
+
+        self.assertIn("0 sections provisioned, 0 acciones created", salida)
+        self.assertIn("3 existing sections skipped: nueva_1, nueva_2, seccion_0_0", salida)
+        self.assertEqual(Accion.objects.count(), acciones)
+
+class BootstrapTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_catalogs()
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+        cls.user.groups.set([Group.objects.get(name="administrador")])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, **headers):
+        return self.client.get("/api/accion_grupo/bootstrap/", headers=headers)
+
+    def test_etag_304(self):
+        response = self.get()
+        etag = response["ETag"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertEqual(
+            sorted(response.json()["allowedMenus"]),
+            get_allowed_seccion_menu_ids(self.user)
+        )
+
+        response = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertFalse(response.content)
+
+        self.assertEqual(self.get(if_none_match=f'"otro", {etag}').status_code, 304)
+        self.assertEqual(self.get(if_none_match="*").status_code, 304)
+
+    def test_revocar_cambia_el_etag(self):
+        etag = self.get()["ETag"]
+
+        AccionGrupo.objects.filter(grupo__name="administrador").order_by("id").first().delete()
+
+        response = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+class StyledColumnTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seccion_menu = SeccionMenu.objects.create(descripcion="estilos")
+
+        for columna, valor, background_color, status in (
+            ("status", "True", "green", True),
+            (" status ", "false", "gray", True),
+            ("plaza", "3", "green", True),
+            ("plaza__descripcion", " Base ", "blue", True),
+            ("descripcion", "x", "black", False),
+            (None, "x", "black", True),
+        ):
+            StyledColumn.objects.create(
+                seccion_menu=cls.seccion_menu,
+                columna=columna,
+                valor=valor,
+                background_color=background_color,
+                status=status
+            )
+
+    def setUp(self):
+        style_cache.invalidate()
+
+    def test_get_styles(self):
+        compiled = get_styles(self.seccion_menu.id)
+
+        self.assertEqual(compiled["columns"], {
+            "status": {"true": 1, "false": 2},
+            "plaza": {"3": 1},
+            "plaza__descripcion": {"Base": 3},
+        })
+        self.assertEqual(
+            [style["backgroundColor"] for style in compiled["styles"].values()],
+            ["green", "gray", "blue"]
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_styles(self.seccion_menu.id), compiled)
+
+    def test_apply_styles(self):
+        rows = [
+            {"id": 1, "status": True, "plaza": {"id": 3, "descripcion": "Otra"}},
+            {"id": 2, "status": None, "plaza": {"id": 4, "descripcion": "Base"}},
+            {"id": 3, "status": None, "plaza": None},
+        ]
+
+        used = apply_styles(get_styles(self.seccion_menu.id), rows)
+
+        self.assertEqual(rows[0][ROW_STYLES_KEY], {"status": 1, "plaza": 1})
+        self.assertEqual(rows[1][ROW_STYLES_KEY], {"plaza__descripcion": 3})
+        self.assertNotIn(ROW_STYLES_KEY, rows[2])
+        self.assertEqual(sorted(used), [1, 3])
+
+    def test_guardar_invalida(self):
+        get_styles(self.seccion_menu.id)
+
+        StyledColumn.objects.filter(columna="descripcion").get().save()
+        StyledColumn.objects.filter(columna="descripcion").update(status=True)
+        StyledColumn.objects.filter(columna="descripcion").get().save()
+
+        self.assertEqual(get_styles(self.seccion_menu.id)["columns"]["descripcion"], {"x": 4})
+
+    def test_sin_reglas(self):
+        rows = [{"id": 1}]
+
+        seccion_menu = SeccionMenu.objects.create(descripcion="sin_estilos")
+
+        self.assertEqual(apply_styles(get_styles(seccion_menu.id), rows), {})
+        self.assertEqual(rows, [{"id": 1}])
 
-# Create your tests here.
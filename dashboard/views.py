@@ -1,18 +1,29 @@
 from django.contrib.auth.models import User
+from django.utils.http import parse_etags, quote_etag
 
-from rest_framework import permissions, viewsets
+from django.http import Http404
+
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.exceptions import PermissionDenied
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
+from dashboard.mixins import ConditionalGetMixin, FastListMixin
+from dashboard.pagination import KeysetPagination
+from dashboard.renderers import CamelizedList
 from dashboard.services.accion_grupo_service import (
-    get_allowed_breadcrumbs_for_group,
-    get_allowed_menus_for_group,
-    get_allowed_navbar_for_group,
-    get_allowed_table_actions_for_group,
+    get_allowed_actions,
+    get_allowed_menus,
+    get_bootstrap,
 )
+from dashboard.services.form_schema_service import get_form_schema
+from dashboard.services.model_list_service import build_rows, filter_rows, get_list_plan
+from dashboard.services.permission_bits_service import can_access_section
+from dashboard.services.styled_column_service import apply_styles, get_styles
+from dashboard.services.user_service import user_cache
 
 from .models import AccionBasica, AccionGrupo, Menu, SeccionMenu
 
@@ -20,13 +31,29 @@ from .serializers import (
     LoginSerializer, 
     AccionBasicaSerializer, 
     AccionGrupoSerializer,
-    AccionGrupoActionsSerializer,
-    AccionGrupoSeccionMenuSerializer,
     MenuSerializer, 
     SeccionMenuSerializer, 
     UserSerializer
 )
 
+def compiled_response(request, compiled):
+    """
+    Serves a compiled {"etag", "payload"}; answers 304 when the client's
+    ETag matches
+    """
+    etag = quote_etag(compiled["etag"])
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+
+    if etag in if_none_match or "*" in if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(compiled["payload"])
+
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+
+    return response
+
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -40,21 +67,20 @@ class LoginView(APIView):
             "user": user_data
         })
 
-class AccionBasicaViewSet(viewsets.ModelViewSet):
+class AccionBasicaViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = AccionBasica.objects.all()
     serializer_class = AccionBasicaSerializer
 
-class AccionGrupoViewSet(viewsets.ViewSet):
+class AccionGrupoViewSet(FastListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = AccionGrupo.objects.all()
+    serializer_class = AccionGrupoSerializer
     permission_classes = [IsAuthenticated]
 
-    def list(self, request):
-        accion_grupo = AccionGrupo.objects.all()
-
-        serializer = AccionGrupoSerializer(accion_grupo, many=True)
-        return Response(serializer.data)
-
-    @action(detail=False, methods=["post"], url_path="allowed_breadcrumbs")
-    def allowed_breadcrumbs(self, request):
+    def allowed_actions(self, request, kind):
+        """
+        Serves breadcrumb, navbar or table actions from the compiled
+        permission matrix of the user's groups
+        """
         seccion_menu_id = request.data.get("seccion_menu_id")
 
         if not seccion_menu_id:
@@ -63,70 +89,118 @@ class AccionGrupoViewSet(viewsets.ViewSet):
                 status=400
             )
 
-        acciones = get_allowed_breadcrumbs_for_group(
-            request.user,
-            seccion_menu_id
-        )
-
-        serializer = AccionGrupoActionsSerializer(acciones, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=["post"], url_path="allowed_navbar")
-    def allowed_navbar(self, request):
-        seccion_menu_id = request.data.get("seccion_menu_id")
-
-        if not seccion_menu_id:
+        try:
+            acciones = get_allowed_actions(request.user, seccion_menu_id, kind)
+        except (TypeError, ValueError):
             return Response(
-                {"detail": "seccion_menu_id is required"},
+                {"detail": "seccion_menu_id must be an integer"},
                 status=400
             )
 
-        acciones = get_allowed_navbar_for_group(
-            request.user,
-            seccion_menu_id
-        )
+        return Response(acciones)
 
-        serializer = AccionGrupoActionsSerializer(acciones, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=["post"], url_path="allowed_breadcrumbs")
+    def allowed_breadcrumbs(self, request):
+        return self.allowed_actions(request, "breadcrumb")
+    
+    @action(detail=False, methods=["post"], url_path="allowed_navbar")
+    def allowed_navbar(self, request):
+        return self.allowed_actions(request, "navbar")
 
     @action(detail=False, methods=["get"], url_path="allowed_menus")
     def allowed_menus(self, request):
-        seccion_menus = get_allowed_menus_for_group(request.user)
-
-        serializer = AccionGrupoSeccionMenuSerializer(seccion_menus, many=True)
-        return Response(serializer.data)
+        return Response(get_allowed_menus(request.user))
     
     @action(detail=False, methods=["post"], url_path="allowed_table_actions")
     def allowed_table_actions(self, request):
-        seccion_menu_id = request.data.get("seccion_menu_id")
-
-        if not seccion_menu_id:
-            return Response(
-                {"detail": "seccion_menu_id is required"},
-                status=400
-            )
-
-        acciones = get_allowed_table_actions_for_group(
-            request.user,
-            seccion_menu_id
-        )
+        return self.allowed_actions(request, "table")
 
-        serializer = AccionGrupoActionsSerializer(acciones, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=["get"], url_path="bootstrap")
+    def bootstrap(self, request):
+        """
+        Menus, sections and every allowed action set of the user in one
+        normalized payload; answers 304 when the client's ETag matches
+        """
+        return compiled_response(request, get_bootstrap(request.user))
 
-class MenuViewSet(viewsets.ModelViewSet):
+class MenuViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
 
-class SeccionMenuViewSet(viewsets.ModelViewSet):
+class SeccionMenuViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = SeccionMenu.objects.all()
     serializer_class = SeccionMenuSerializer
+    version_dependencies = [Menu]
+
+    @action(detail=True, methods=["get"], url_path="form_schema")
+    def form_schema(self, request, pk=None):
+        """
+        Compiled alta/modifica/lista/filtro form schema of the section (see
+        compile_form_schema); cached, so a hit runs no queries. Requires an
+        allowed action in the section.
+        """
+        try:
+            seccion_menu_id = int(pk)
+        except ValueError:
+            raise Http404
+
+        if not can_access_section(request.user, seccion_menu_id):
+            raise PermissionDenied
+
+        form_schema = get_form_schema(seccion_menu_id)
+
+        if form_schema is None:
+            raise Http404
+
+        return compiled_response(request, form_schema)
+
+    @action(detail=True, methods=["get"], url_path="registros")
+    def registros(self, request, pk=None):
+        """
+        Rows of the section's modelo: the lista columns, filtered by the
+        filtro columns and keyset-paginated on the pk (see
+        compile_list_plan). Requires an allowed action in the section.
+
+        The section's StyledColumn rules are applied here: rows that match
+        carry {columna: style_id} under "_styles" and the response lists
+        the styles used once, under "styles".
+        """
+        try:
+            seccion_menu_id = int(pk)
+        except ValueError:
+            raise Http404
+
+        if not can_access_section(request.user, seccion_menu_id):
+            raise PermissionDenied
+
+        plan = get_list_plan(seccion_menu_id)
+
+        if plan is None:
+            raise Http404
+
+        paginator = KeysetPagination()
+        paginator.ordering = plan["pk"]
+
+        page = paginator.paginate_queryset(
+            filter_rows(plan, request.query_params),
+            request,
+            view=self
+        )
+
+        rows = build_rows(plan, page)
+        styles = apply_styles(get_styles(seccion_menu_id), rows)
+
+        response = paginator.get_paginated_response(CamelizedList(rows))
+        response.data["styles"] = styles
+
+        return response
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to be viewed or edited.
     """
 
     queryset = User.objects.all().order_by("-date_joined")
     serializer_class = UserSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+    version_cache = user_cache
\ No newline at end of file
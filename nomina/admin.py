@@ -1,22 +1,51 @@
 from django.contrib import admin
 
-from nomina.services.nomina_service import process_nomina_detalle
+from nomina.services.nomina_job_service import encolar_nomina, reintentar_jobs
+from nomina.services.recalculo_sdi import recalcular_sdi
 
 from .models import (
+    PerfilPrestaciones,
     Plaza,
     Departamento,
     Empleado,
     Nomina,
+    NominaJob,
+    NominaRunStats,
     Recibo,
     IsrSemanal,
     IsrQuincenal,
     Uma
 )
 
+@admin.register(PerfilPrestaciones)
+class PerfilPrestacionesAdmin(admin.ModelAdmin):
+    list_display = (
+        "descripcion",
+        "aguinaldo_dias",
+        "prima_vacacional",
+        "vacaciones_adicionales",
+        "status",
+    )
+    actions = ["recalcular_sdi"]
+
+    @admin.action(description="Recalcular SDI de los empleados del perfil")
+    def recalcular_sdi(self, request, queryset):
+        resultado = recalcular_sdi(
+            Empleado.objects.filter(plaza__perfil_prestaciones__in=queryset),
+            user=request.user.id
+        )
+
+        self.message_user(
+            request,
+            f"{resultado['revisados']} empleado(s) revisados, "
+            f"{resultado['actualizados']} con SDI actualizado."
+        )
+
 @admin.register(Plaza)
 class PlazaAdmin(admin.ModelAdmin):
     list_display = (
         "descripcion",
+        "perfil_prestaciones",
         "status",
     )
 
@@ -36,6 +65,7 @@ class EmpleadoAdmin(admin.ModelAdmin):
         "rfc",
         "sd",
         "sdi",
+        "fecha_ingreso",
         "status",
     )
     exclude = ("sdi",)
@@ -49,12 +79,95 @@ class NominaAdmin(admin.ModelAdmin):
         "fecha_pago",
         "status",
     )
+    actions = ["recalcular"]
 
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
 
         if not change:
-            process_nomina_detalle(obj)
+            encolar_nomina(obj, request.user)
+
+            self.message_user(
+                request,
+                "Los recibos se generarán en segundo plano; "
+                "consulta el avance en Procesos de nómina."
+            )
+
+    @admin.action(description="Recalcular recibos con cambios")
+    def recalcular(self, request, queryset):
+        for nomina in queryset:
+            encolar_nomina(nomina, request.user, NominaJob.RECALCULAR)
+
+        self.message_user(
+            request,
+            f"{queryset.count()} nómina(s) encoladas para recálculo."
+        )
+
+@admin.register(NominaJob)
+class NominaJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "nomina",
+        "tipo",
+        "estado",
+        "get_avance",
+        "intentos",
+        "worker",
+        "disponible_en",
+        "updated_at",
+    )
+    list_filter = ("tipo", "estado")
+    readonly_fields = (
+        "tipo",
+        "estado",
+        "intentos",
+        "total",
+        "procesados",
+        "error",
+        "worker",
+        "iniciado_en",
+        "terminado_en",
+    )
+    actions = ["reintentar"]
+
+    def get_avance(self, obj):
+        if not obj.total:
+            return "-"
+
+        return f"{obj.procesados}/{obj.total} ({obj.procesados * 100 // obj.total}%)"
+
+    get_avance.short_description = "Avance"
+
+    @admin.action(description="Reintentar jobs en error")
+    def reintentar(self, request, queryset):
+        reintentados = reintentar_jobs(queryset, request.user)
+
+        self.message_user(request, f"{reintentados} job(s) regresaron a pendiente.")
+
+@admin.register(NominaRunStats)
+class NominaRunStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "nomina",
+        "modo",
+        "iniciado_en",
+        "segundos",
+        "queries",
+        "empleados_leidos",
+        "recibos_escritos",
+    )
+    list_filter = ("modo",)
+    readonly_fields = (
+        "nomina",
+        "modo",
+        "iniciado_en",
+        "segundos",
+        "queries",
+        "empleados_leidos",
+        "recibos_escritos",
+        "etapas",
+        "perfil",
+    )
 
 @admin.register(Recibo)
 class ReciboAdmin(admin.ModelAdmin):
@@ -0,0 +1,207 @@
+import json
+import platform
+import subprocess
+import time
+
+from datetime import date
+
+import django
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from nomina.models import Empleado, Nomina, Recibo
+from nomina.services.ejercicio_fiscal import get_ejercicio_fiscal
+from nomina.services.nomina_lote import calcular_nomina_lote
+from nomina.services.nomina_service import calcular_recibo, process_nomina_detalle
+from nomina.services.plantilla_sintetica import generar_plantilla, generar_tablas_fiscales
+from nomina.services.recibo_cache import cache_resultados
+
+
+class Rollback(Exception):
+    pass
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _medir(funcion, repeticiones):
+    """
+    Ejecuta la función `repeticiones` veces y regresa el mejor tiempo y el
+    resultado de la última ejecución.
+    """
+    mejor = None
+
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - inicio
+
+        mejor = segundos if mejor is None else min(mejor, segundos)
+
+    return mejor, resultado
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark del cálculo de nómina sobre una plantilla sintética: "
+        "funciones de nomina_math (escalar y en lote) y process_nomina_detalle "
+        "de punta a punta con conteo de queries. Los datos se generan dentro "
+        "de una transacción que se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--empleados",
+            type=int,
+            nargs="+",
+            default=[1000, 10000, 100000],
+            help="Tamaños de plantilla a medir."
+        )
+        parser.add_argument(
+            "--semilla",
+            type=int,
+            default=0
+        )
+        parser.add_argument(
+            "--repeticiones",
+            type=int,
+            default=3,
+            help="Repeticiones de los benchmarks de cálculo puro (se reporta el mejor tiempo)."
+        )
+        parser.add_argument(
+            "--salida",
+            default="bench_nomina.json",
+            help="Archivo JSON de resultados."
+        )
+        parser.add_argument(
+            "--conservar",
+            action="store_true",
+            help="Conserva los datos generados en lugar de revertirlos."
+        )
+
+    def handle(self, *args, **options):
+        ejercicio = timezone.now().year
+
+        resultados = []
+
+        try:
+            with transaction.atomic():
+                # Tarifas 2024/2025 y, si falta, copia de 2025 para el ejercicio en curso
+                generar_tablas_fiscales((2024, 2025, ejercicio))
+
+                for empleados in options["empleados"]:
+                    resultados.extend(
+                        self.benchmark(empleados, ejercicio, options)
+                    )
+
+                if not options["conservar"]:
+                    raise Rollback()
+        except Rollback:
+            pass
+
+        reporte = {
+            "meta": {
+                "fecha": timezone.now().isoformat(),
+                "commit": _commit_actual(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "db": connection.vendor,
+                "ejercicio": ejercicio,
+                "semilla": options["semilla"],
+            },
+            "resultados": resultados,
+        }
+
+        with open(options["salida"], "w") as salida:
+            json.dump(reporte, salida, indent=2)
+
+        self.stdout.write(f"Resultados escritos en {options['salida']}")
+
+    def benchmark(self, empleados, ejercicio, options):
+        self.stdout.write(f"== {empleados} empleados ==")
+
+        plazas, departamentos = generar_plantilla(
+            empleados,
+            semilla=options["semilla"],
+            prefijo=f"BENCH{empleados}"
+        )
+
+        filas = list(
+            Empleado.objects.filter(
+                plaza=plazas[0],
+                departamento=departamentos[0]
+            ).values_list("sd", "periodicidad_pago")
+        )
+
+        salarios = [sd for sd, _ in filas]
+        periodicidades = [periodicidad for _, periodicidad in filas]
+
+        ejercicio_fiscal = get_ejercicio_fiscal(ejercicio)
+
+        resultados = []
+
+        def registrar(nombre, segundos, **extra):
+            resultado = {
+                "benchmark": nombre,
+                "empleados": empleados,
+                "segundos": round(segundos, 6),
+                "us_por_empleado": round(segundos * 1e6 / empleados, 3),
+                **extra,
+            }
+            resultados.append(resultado)
+
+            self.stdout.write(
+                f"{nombre:<28} {segundos:>9.3f}s "
+                f"{resultado['us_por_empleado']:>9.2f} us/empleado"
+                + "".join(f"  {k}={v}" for k, v in extra.items())
+            )
+
+        # Funciones escalares de nomina_math (implementación de referencia)
+        segundos, _ = _medir(
+            lambda: [
+                calcular_recibo(sd, periodicidad, ejercicio_fiscal, ejercicio_fiscal.tarifa(periodicidad))
+                for sd, periodicidad in filas
+            ],
+            options["repeticiones"]
+        )
+        registrar("nomina_math_escalar", segundos)
+
+        # Cálculo en lote
+        segundos, _ = _medir(
+            lambda: calcular_nomina_lote(salarios, periodicidades, ejercicio_fiscal),
+            options["repeticiones"]
+        )
+        registrar("nomina_math_lote", segundos)
+
+        # process_nomina_detalle de punta a punta
+        nomina = Nomina.objects.create(
+            plaza=plazas[0],
+            departamento=departamentos[0],
+            fecha=date.today(),
+            fecha_pago=date.today()
+        )
+
+        cache_resultados.limpiar()
+
+        with CaptureQueriesContext(connection) as queries:
+            inicio = time.perf_counter()
+            process_nomina_detalle(nomina)
+            segundos = time.perf_counter() - inicio
+
+        registrar(
+            "process_nomina_detalle",
+            segundos,
+            queries=len(queries),
+            recibos=Recibo.objects.filter(nomina=nomina).count(),
+            cache_hit_rate=round(cache_resultados.estadisticas()["hit_rate"], 4)
+        )
+
+        return resultados
@@ -0,0 +1,86 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.exceptions import ValidationError
+
+from nomina.services.recibo_exportacion import FORMATOS, escribir_csv, escribir_xlsx
+from nomina.services.recibo_reporte import filtrar_recibos, get_recibos_reporte
+
+class Command(BaseCommand):
+    help = (
+        "Exporta recibos a CSV o XLSX recorriéndolos con un cursor del lado "
+        "del servidor, sin cargar el resultado completo en memoria."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "nominas",
+            nargs="*",
+            type=int,
+            help="Ids de las nóminas a exportar (por omisión, todas las que cumplan los filtros)."
+        )
+        parser.add_argument("--plaza", type=int)
+        parser.add_argument("--departamento", type=int)
+        parser.add_argument(
+            "--desde",
+            help="Fecha de nómina inicial (AAAA-MM-DD)."
+        )
+        parser.add_argument(
+            "--hasta",
+            help="Fecha de nómina final (AAAA-MM-DD)."
+        )
+        parser.add_argument(
+            "--salida",
+            required=True,
+            help="Archivo de salida."
+        )
+        parser.add_argument(
+            "--formato",
+            choices=FORMATOS,
+            help="Formato de salida (por omisión, según la extensión de --salida)."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Filas leídas por viaje a la base de datos."
+        )
+
+    def handle(self, *args, **options):
+        formato = options["formato"] or os.path.splitext(options["salida"])[1].lstrip(".").lower()
+
+        if formato not in FORMATOS:
+            raise CommandError(f"Indica --formato ({', '.join(FORMATOS)}).")
+
+        recibos = get_recibos_reporte()
+
+        if options["nominas"]:
+            recibos = recibos.filter(nomina_id__in=options["nominas"])
+
+        try:
+            recibos = filtrar_recibos(recibos, {
+                "plaza": options["plaza"],
+                "departamento": options["departamento"],
+                "desde": options["desde"],
+                "hasta": options["hasta"],
+            })
+        except ValidationError as e:
+            raise CommandError(
+                "; ".join(f"{campo}: {' '.join(errores)}" for campo, errores in e.detail.items())
+            )
+
+        inicio = time.monotonic()
+
+        if formato == "csv":
+            with open(options["salida"], "w", newline="", encoding="utf-8") as salida:
+                total = escribir_csv(recibos, salida, options["chunk_size"])
+        else:
+            total = escribir_xlsx(recibos, options["salida"], options["chunk_size"])
+
+        segundos = time.monotonic() - inicio
+
+        self.stdout.write(
+            f"{total} recibos exportados a {options['salida']} en {segundos:.2f}s"
+        )
@@ -0,0 +1,64 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nomina.services.importacion_empleados import importar_empleados
+
+class Command(BaseCommand):
+    help = (
+        "Importa empleados desde un CSV (rfc, nombre_completo, sd, "
+        "periodicidad_pago, plaza, departamento, fecha_ingreso), insertando o actualizando "
+        "por RFC en bloques. Las filas con error se reportan sin detener la "
+        "importación."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="CSV a importar (UTF-8).")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Filas cargadas por bloque."
+        )
+        parser.add_argument(
+            "--errores",
+            help="Escribe las filas con error en este CSV."
+        )
+
+    def handle(self, *args, **options):
+        def progreso(resultado):
+            self.stdout.write(
+                f"{resultado.filas} filas, {resultado.insertados} insertadas, "
+                f"{resultado.actualizados} actualizadas, {len(resultado.errores)} con error "
+                f"({resultado.filas_por_segundo:.0f} filas/s)"
+            )
+
+        try:
+            with open(options["archivo"], newline="", encoding="utf-8-sig") as archivo:
+                resultado = importar_empleados(
+                    archivo,
+                    batch_size=options["batch_size"],
+                    progreso=progreso
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options["errores"] and resultado.errores:
+            with open(options["errores"], "w", newline="", encoding="utf-8") as salida:
+                writer = csv.writer(salida)
+                writer.writerow(["fila", "rfc", "errores"])
+
+                for error in resultado.errores:
+                    writer.writerow([error["fila"], error["rfc"], "; ".join(error["errores"])])
+
+        for error in resultado.errores[:20]:
+            self.stderr.write(f"Fila {error['fila']} ({error['rfc']}): {'; '.join(error['errores'])}")
+
+        if len(resultado.errores) > 20:
+            self.stderr.write(f"... y {len(resultado.errores) - 20} filas más con error")
+
+        self.stdout.write(
+            f"Total: {resultado.filas} filas en {resultado.segundos:.2f}s "
+            f"({resultado.filas_por_segundo:.0f} filas/s): {resultado.insertados} insertadas, "
+            f"{resultado.actualizados} actualizadas, {len(resultado.errores)} con error"
+        )
@@ -0,0 +1,80 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from nomina.services.recibo_cache import cache_resultados
+from nomina.services.nomina_job_service import (
+    ejecutar_job,
+    liberar_jobs_estancados,
+    tomar_siguiente_job
+)
+
+class Command(BaseCommand):
+    help = "Procesa la cola de jobs de nómina (NominaJob)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Termina cuando la cola queda vacía en lugar de esperar nuevos jobs."
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5,
+            help="Segundos de espera cuando no hay jobs pendientes."
+        )
+        parser.add_argument(
+            "--stale-timeout",
+            type=int,
+            default=600,
+            help="Segundos sin avance tras los cuales un job en proceso se libera."
+        )
+
+    def handle(self, *args, **options):
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.stdout.write(f"Worker {worker} iniciado")
+
+        while True:
+            close_old_connections()
+
+            estancados = liberar_jobs_estancados(options["stale_timeout"])
+
+            if estancados["liberados"]:
+                self.stdout.write(f"{estancados['liberados']} job(s) estancados regresaron a pendiente")
+
+            if estancados["agotados"]:
+                self.stdout.write(f"{estancados['agotados']} job(s) estancados agotaron sus intentos")
+
+            job = tomar_siguiente_job(worker)
+
+            if job is None:
+                if options["once"]:
+                    return
+
+                time.sleep(options["sleep"])
+                continue
+
+            self.stdout.write(f"Job {job.id}: nómina {job.nomina_id} (intento {job.intentos})")
+
+            inicio = time.monotonic()
+
+            try:
+                ejecutar_job(job)
+            except Exception as e:
+                self.stderr.write(f"Job {job.id} falló: {e}")
+                continue
+
+            estadisticas = cache_resultados.estadisticas()
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Job {job.id} terminado en {time.monotonic() - inicio:.1f}s "
+                    f"(cache de resultados: {estadisticas['hits']} hits, "
+                    f"{estadisticas['misses']} misses, {estadisticas['size']} entradas)"
+                )
+            )
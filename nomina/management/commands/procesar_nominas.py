@@ -0,0 +1,177 @@
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+# Los modelos y servicios se importan dentro de las funciones: con los
+# métodos de arranque spawn/forkserver el proceso hijo importa este módulo
+# antes de que _inicializar_worker llame a django.setup().
+
+def _inicializar_worker():
+    # Cada proceso abre su propia conexión; nunca reutiliza la del padre.
+    import django
+    django.setup()
+
+    connections.close_all()
+
+def _procesar_shard(nomina_id, rango, chunk_size, perfilar):
+    inicio = time.monotonic()
+    empleados = 0
+
+    def progreso(procesados):
+        nonlocal empleados
+        empleados += procesados
+
+    from nomina.models import Nomina
+    from nomina.services.nomina_service import process_nomina_detalle_streaming
+
+    try:
+        nomina = Nomina.objects.get(id=nomina_id)
+
+        process_nomina_detalle_streaming(
+            nomina,
+            chunk_size=chunk_size,
+            progreso=progreso,
+            rango=rango,
+            perfilar=perfilar
+        )
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        connections.close_all()
+
+    return {
+        "nomina_id": nomina_id,
+        "rango": rango,
+        "empleados": empleados,
+        "segundos": time.monotonic() - inicio,
+        "error": error,
+    }
+
+class Command(BaseCommand):
+    help = (
+        "Procesa varias nóminas (o shards de una nómina por rango de id de "
+        "empleado) en paralelo con un pool de procesos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "nominas",
+            nargs="*",
+            type=int,
+            help="Ids de las nóminas a procesar."
+        )
+        parser.add_argument(
+            "--fecha",
+            help="Procesa todas las nóminas activas con esta fecha (AAAA-MM-DD)."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Número de procesos (por omisión, uno por núcleo)."
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=1,
+            help="Número de shards por nómina."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Empleados por bloque (por omisión NOMINA_CHUNK_SIZE)."
+        )
+        parser.add_argument(
+            "--perfilar",
+            action="store_true",
+            help="Guarda un volcado de cProfile por shard en NOMINA_PERFIL_DIR."
+        )
+
+    def handle(self, *args, **options):
+        from nomina.models import Nomina
+        from nomina.services.nomina_service import dividir_en_shards
+
+        nominas = Nomina.objects.filter(status=True)
+
+        if options["nominas"]:
+            nominas = nominas.filter(id__in=options["nominas"])
+        elif options["fecha"]:
+            nominas = nominas.filter(fecha=options["fecha"])
+        else:
+            raise CommandError("Indica ids de nómina o --fecha.")
+
+        tareas = []
+
+        for nomina in nominas.order_by("id"):
+            if options["shards"] > 1:
+                for rango in dividir_en_shards(nomina, options["shards"]):
+                    tareas.append((nomina.id, rango))
+            else:
+                tareas.append((nomina.id, None))
+
+        if not tareas:
+            self.stdout.write("No hay nóminas por procesar.")
+            return
+
+        self.stdout.write(
+            f"{len(tareas)} shard(s) en {options['workers']} proceso(s)"
+        )
+
+        # Las conexiones abiertas no deben heredarse a los procesos hijos
+        connections.close_all()
+
+        inicio = time.monotonic()
+        resultados = []
+
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            initializer=_inicializar_worker
+        ) as pool:
+            futuros = [
+                pool.submit(
+                    _procesar_shard,
+                    nomina_id,
+                    rango,
+                    options["chunk_size"],
+                    options["perfilar"]
+                )
+                for nomina_id, rango in tareas
+            ]
+
+            for futuro in as_completed(futuros):
+                resultado = futuro.result()
+                resultados.append(resultado)
+
+                rango = resultado["rango"] or "todos"
+                segundos = resultado["segundos"]
+                empleados_por_segundo = resultado["empleados"] / segundos if segundos else 0
+
+                linea = (
+                    f"Nómina {resultado['nomina_id']} [{rango}]: "
+                    f"{resultado['empleados']} empleados en {segundos:.2f}s "
+                    f"({empleados_por_segundo:.0f}/s)"
+                )
+
+                if resultado["error"]:
+                    self.stderr.write(f"{linea} ERROR {resultado['error']}")
+                else:
+                    self.stdout.write(linea)
+
+        total_segundos = time.monotonic() - inicio
+        total_empleados = sum(r["empleados"] for r in resultados)
+        fallidos = [r for r in resultados if r["error"]]
+
+        self.stdout.write(
+            f"Total: {total_empleados} empleados en {total_segundos:.2f}s "
+            f"({total_empleados / total_segundos:.0f}/s), "
+            f"{len(fallidos)} shard(s) con error"
+        )
+
+        if fallidos:
+            raise CommandError(f"{len(fallidos)} shard(s) fallaron; vuelve a ejecutar para reanudarlos.")
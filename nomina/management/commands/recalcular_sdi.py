@@ -0,0 +1,60 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nomina.models import Empleado
+from nomina.services.recalculo_sdi import recalcular_sdi
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula el SDI de los empleados con el perfil de prestaciones de "
+        "su plaza y su antigüedad, escribiendo sólo los que cambian."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fecha",
+            help="Fecha (AAAA-MM-DD) para calcular la antigüedad; hoy por omisión."
+        )
+        parser.add_argument(
+            "--plaza",
+            type=int,
+            action="append",
+            help="Sólo empleados de esta plaza (puede repetirse)."
+        )
+        parser.add_argument(
+            "--perfil",
+            type=int,
+            help="Sólo empleados de plazas con este perfil de prestaciones."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Empleados leídos y actualizados por bloque."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            fecha = date.fromisoformat(options["fecha"]) if options["fecha"] else None
+        except ValueError:
+            raise CommandError(f"Invalid date: {options['fecha']}")
+
+        empleados = Empleado.objects.all()
+
+        if options["plaza"]:
+            empleados = empleados.filter(plaza_id__in=options["plaza"])
+
+        if options["perfil"]:
+            empleados = empleados.filter(plaza__perfil_prestaciones_id=options["perfil"])
+
+        resultado = recalcular_sdi(
+            empleados,
+            fecha=fecha,
+            batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(
+            f"{resultado['revisados']} empleados revisados, "
+            f"{resultado['actualizados']} con SDI actualizado en {resultado['segundos']}s"
+        )
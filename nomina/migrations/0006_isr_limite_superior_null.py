@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0005_rename_isr_pagar_recibo_isr_retenido'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='isrquincenal',
+            name='limite_superior',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='isrsemanal',
+            name='limite_superior',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+    ]
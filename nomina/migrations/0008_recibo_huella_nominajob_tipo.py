@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0007_nominajob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nominajob',
+            name='tipo',
+            field=models.CharField(choices=[('generar', 'Generar recibos'), ('recalcular', 'Recalcular recibos')], default='generar', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='recibo',
+            name='huella',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+    ]
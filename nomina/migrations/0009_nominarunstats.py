@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 07:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0008_recibo_huella_nominajob_tipo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NominaRunStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modo', models.CharField(max_length=20)),
+                ('iniciado_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('segundos', models.FloatField(default=0)),
+                ('queries', models.IntegerField(default=0)),
+                ('empleados_leidos', models.IntegerField(default=0)),
+                ('recibos_escritos', models.IntegerField(default=0)),
+                ('etapas', models.JSONField(default=dict)),
+                ('perfil', models.CharField(blank=True, max_length=500, null=True)),
+                ('status', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('nomina', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='run_stats', to='nomina.nomina')),
+            ],
+            options={
+                'verbose_name': 'Métrica de corrida de nómina',
+                'verbose_name_plural': 'Métricas de corridas de nómina',
+                'db_table': 'nomina_run_stats',
+            },
+        ),
+    ]
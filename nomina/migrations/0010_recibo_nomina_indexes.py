@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 08:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0009_nominarunstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='nomina',
+            index=models.Index(fields=['plaza', 'departamento', 'fecha'], name='nomina_plaza_i_b59a87_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recibo',
+            index=models.Index(fields=['nomina', 'empleado'], name='recibo_nomina__769896_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 08:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def preparar_rfc(apps, schema_editor):
+    """
+    Antes de la restricción única: los RFC vacíos pasan a NULL (NULL no
+    choca con la restricción) y, si hay RFC repetidos, la migración se
+    detiene listándolos para que se depuren a mano; fusionar empleados
+    movería sus recibos y no se hace automáticamente.
+    """
+    Empleado = apps.get_model("nomina", "Empleado")
+
+    Empleado.objects.filter(rfc__regex=r"^\s*$").update(rfc=None)
+
+    repetidos = list(
+        Empleado.objects.exclude(rfc=None)
+        .values("rfc")
+        .annotate(total=models.Count("id"))
+        .filter(total__gt=1)
+        .order_by("rfc")
+        .values_list("rfc", "total")
+    )
+
+    if repetidos:
+        detalle = ", ".join(f"{rfc} ({total})" for rfc, total in repetidos[:50])
+
+        raise RuntimeError(
+            f"{len(repetidos)} repeated RFCs in empleado, fix them before migrating: "
+            f"{detalle}{', ...' if len(repetidos) > 50 else ''}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0010_recibo_nomina_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(preparar_rfc, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='empleado',
+            constraint=models.UniqueConstraint(fields=('rfc',), name='empleado_rfc_unique'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0 on 2026-10-18 08:10
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0011_empleado_rfc_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='empleado',
+            name='fecha_ingreso',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='PerfilPrestaciones',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('descripcion', models.CharField(max_length=255, unique=True)),
+                ('aguinaldo_dias', models.DecimalField(decimal_places=2, default=Decimal('15'), max_digits=5)),
+                ('prima_vacacional', models.DecimalField(decimal_places=4, default=Decimal('0.25'), max_digits=5)),
+                ('vacaciones_adicionales', models.PositiveIntegerField(default=0)),
+                ('status', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user_created', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='perfiles_prestaciones_created', to=settings.AUTH_USER_MODEL)),
+                ('user_updated', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='perfiles_prestaciones_updated', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Perfil de prestaciones',
+                'verbose_name_plural': 'Perfiles de prestaciones',
+                'db_table': 'perfil_prestaciones',
+            },
+        ),
+        migrations.AddField(
+            model_name='plaza',
+            name='perfil_prestaciones',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='plazas', to='nomina.perfilprestaciones'),
+        ),
+    ]
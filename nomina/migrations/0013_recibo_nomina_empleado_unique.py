@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 08:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def depurar_recibos_repetidos(apps, schema_editor):
+    """
+    Antes de la restricción única: de los recibos repetidos de un empleado
+    en una nómina (corridas concurrentes del mismo shard) se conserva el
+    primero y se borran los demás. Los recibos sin nómina o sin empleado
+    no chocan con la restricción.
+    """
+    Recibo = apps.get_model("nomina", "Recibo")
+
+    repetidos = (
+        Recibo.objects.exclude(nomina=None)
+        .exclude(empleado=None)
+        .values("nomina_id", "empleado_id")
+        .annotate(primero=models.Min("id"), total=models.Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+
+    for grupo in repetidos.iterator():
+        Recibo.objects.filter(
+            nomina_id=grupo["nomina_id"],
+            empleado_id=grupo["empleado_id"]
+        ).exclude(id=grupo["primero"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0012_perfil_prestaciones_fecha_ingreso'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(depurar_recibos_repetidos, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='recibo',
+            name='recibo_nomina__769896_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='recibo',
+            constraint=models.UniqueConstraint(fields=('nomina', 'empleado'), name='recibo_nomina_empleado_unique'),
+        ),
+    ]
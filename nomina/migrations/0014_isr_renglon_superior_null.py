@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-18 08:59
+
+from decimal import Decimal
+
+from django.db import migrations
+
+ISR_MODELS = ("IsrSemanal", "IsrQuincenal")
+
+
+def abrir_renglon_superior(apps, schema_editor):
+    """
+    0006 permitió limite_superior NULL para el renglón superior ("en
+    adelante"), pero las tarifas ya cargadas lo conservaron en 0.00 y
+    TarifaIsr.buscar no encuentra renglón para los importes de ese tramo.
+    En cada ejercicio, el renglón activo de mayor limite_inferior pasa a
+    NULL si su limite_superior es menor que su limite_inferior.
+    """
+    for nombre in ISR_MODELS:
+        model = apps.get_model("nomina", nombre)
+
+        ejercicios = model.objects.filter(
+            status=True
+        ).order_by().values_list("ejercicio", flat=True).distinct()
+
+        for ejercicio in ejercicios:
+            superior = model.objects.filter(
+                ejercicio=ejercicio,
+                status=True
+            ).order_by("-limite_inferior").first()
+
+            if superior.limite_superior is not None and superior.limite_superior < superior.limite_inferior:
+                model.objects.filter(id=superior.id).update(limite_superior=None)
+
+
+def cerrar_renglon_superior(apps, schema_editor):
+    # Regresa al 0.00 anterior para poder revertir 0006
+    for nombre in ISR_MODELS:
+        apps.get_model("nomina", nombre).objects.filter(
+            limite_superior=None
+        ).update(limite_superior=Decimal("0.00"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nomina', '0013_recibo_nomina_empleado_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(abrir_renglon_superior, cerrar_renglon_superior),
+    ]
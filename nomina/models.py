@@ -1,12 +1,68 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
+from nomina.services.factor_integracion import get_tabla_factores
 from nomina.services.nomina_math import (
-    calcular_factor_integracion
+    AGUINALDO_DIAS,
+    PRIMA_VACACIONAL,
+    aplicar_factor_integracion,
+    calcular_subsidio_diario,
+    calcular_tope_sbc,
+    calcular_tres_umas
 )
 
 from decimal import Decimal
 
+class PerfilPrestaciones(models.Model):
+    descripcion = models.CharField(
+        max_length=255,
+        unique=True
+    )
+
+    aguinaldo_dias = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=AGUINALDO_DIAS
+    )
+
+    prima_vacacional = models.DecimalField(
+        max_digits=5,
+        decimal_places=4,
+        default=PRIMA_VACACIONAL
+    )
+
+    # Días de vacaciones adicionales a los de ley (Art. 76 LFT)
+    vacaciones_adicionales = models.PositiveIntegerField(default=0)
+
+    status = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    user_created = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="perfiles_prestaciones_created"
+    )
+    user_updated = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="perfiles_prestaciones_updated"
+    )
+
+    class Meta:
+        db_table = "perfil_prestaciones"
+        verbose_name = "Perfil de prestaciones"
+        verbose_name_plural = "Perfiles de prestaciones"
+
+    def __str__(self):
+        return self.descripcion
+
 class Plaza(models.Model):
     descripcion = models.CharField(
         max_length=255,
@@ -15,6 +71,15 @@ class Plaza(models.Model):
         unique=True
     )
 
+    # Sin perfil se integran las prestaciones mínimas de ley
+    perfil_prestaciones = models.ForeignKey(
+        "perfilprestaciones",
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="plazas"
+    )
+
     status = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -125,6 +190,12 @@ class Empleado(models.Model):
         blank=True
     )
 
+    # Determina los días de vacaciones que integran el SDI
+    fecha_ingreso = models.DateField(
+        null=True,
+        blank=True
+    )
+
     status = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -145,9 +216,20 @@ class Empleado(models.Model):
         related_name="employees_updated"
     )
 
+    def fraccion_integracion(self, fecha=None):
+        """
+        Factor de integración (numerador, denominador) según el perfil de
+        prestaciones de la plaza y el año de servicio a la fecha (hoy si no
+        se indica), tomado de la TablaFactores.
+        """
+        return get_tabla_factores().fraccion_empleado(
+            self.fecha_ingreso,
+            self.plaza.perfil_prestaciones_id if self.plaza_id else None,
+            fecha or timezone.localdate()
+        )
+
     def save(self, *args, **kwargs):
-        factor = calcular_factor_integracion()
-        self.sdi = (self.sd * factor).quantize(Decimal("0.01"))
+        self.sdi = aplicar_factor_integracion(self.sd, self.fraccion_integracion())
         super().save(*args, **kwargs)
 
     class Meta:
@@ -155,6 +237,11 @@ class Empleado(models.Model):
         verbose_name = "Empleado"
         verbose_name_plural = "Empleados"
 
+        # Llave de la importación masiva (upsert por RFC); NULL se permite repetido
+        constraints = [
+            models.UniqueConstraint(fields=["rfc"], name="empleado_rfc_unique"),
+        ]
+
     def __str__(self):
         return self.rfc
     
@@ -204,6 +291,10 @@ class Nomina(models.Model):
         verbose_name = "Nomina"
         verbose_name_plural = "Nominas"
 
+        indexes = [
+            models.Index(fields=["plaza", "departamento", "fecha"]),
+        ]
+
     def __str__(self):
         return str(self.fecha)
 
@@ -283,6 +374,13 @@ class Recibo(models.Model):
         default=Decimal("0.00")
     )
 
+    # Huella de las entradas del cálculo (ver nomina_service.calcular_huella)
+    huella = models.CharField(
+        max_length=40,
+        null=True,
+        blank=True
+    )
+
     status = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
@@ -308,9 +406,157 @@ class Recibo(models.Model):
         verbose_name = "Recibo"
         verbose_name_plural = "Recibos"
 
+        # Un recibo por empleado y nómina; su índice también sirve las
+        # búsquedas por nómina
+        constraints = [
+            models.UniqueConstraint(
+                fields=["nomina", "empleado"],
+                name="recibo_nomina_empleado_unique"
+            ),
+        ]
+
     def __str__(self):
         return f"Recibo {self.id} - {self.empleado}"
 
+class NominaJob(models.Model):
+    GENERAR = "generar"
+    RECALCULAR = "recalcular"
+
+    TIPOS = [
+        (GENERAR, "Generar recibos"),
+        (RECALCULAR, "Recalcular recibos"),
+    ]
+
+    PENDIENTE = "pendiente"
+    EN_PROCESO = "en_proceso"
+    TERMINADO = "terminado"
+    ERROR = "error"
+
+    ESTADOS = [
+        (PENDIENTE, "Pendiente"),
+        (EN_PROCESO, "En proceso"),
+        (TERMINADO, "Terminado"),
+        (ERROR, "Error"),
+    ]
+
+    nomina = models.ForeignKey(
+        "nomina",
+        on_delete=models.CASCADE,
+        related_name="jobs"
+    )
+
+    tipo = models.CharField(
+        max_length=20,
+        choices=TIPOS,
+        default=GENERAR
+    )
+
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADOS,
+        default=PENDIENTE
+    )
+
+    intentos = models.IntegerField(default=0)
+    max_intentos = models.IntegerField(default=3)
+
+    total = models.IntegerField(default=0)
+    procesados = models.IntegerField(default=0)
+
+    error = models.TextField(
+        null=True,
+        blank=True
+    )
+
+    worker = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True
+    )
+
+    disponible_en = models.DateTimeField(default=timezone.now)
+    iniciado_en = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+    terminado_en = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    status = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    user_created = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="nomina_jobs_created"
+    )
+    user_updated = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.RESTRICT,
+        null=True,
+        blank=True,
+        related_name="nomina_jobs_updated"
+    )
+
+    class Meta:
+        db_table = "nomina_job"
+        verbose_name = "Proceso de nómina"
+        verbose_name_plural = "Procesos de nómina"
+
+        indexes = [
+            models.Index(fields=["estado", "disponible_en"]),
+        ]
+
+    def __str__(self):
+        return f"{self.nomina} - {self.get_tipo_display()} - {self.get_estado_display()}"
+
+
+class NominaRunStats(models.Model):
+    nomina = models.ForeignKey(
+        "nomina",
+        on_delete=models.CASCADE,
+        related_name="run_stats"
+    )
+
+    # generar, streaming o recalcular
+    modo = models.CharField(max_length=20)
+
+    iniciado_en = models.DateTimeField(default=timezone.now)
+    segundos = models.FloatField(default=0)
+    queries = models.IntegerField(default=0)
+
+    empleados_leidos = models.IntegerField(default=0)
+    recibos_escritos = models.IntegerField(default=0)
+
+    # etapa -> {"segundos": float, "queries": int}
+    etapas = models.JSONField(default=dict)
+
+    # Ruta del volcado de cProfile, si la corrida se perfiló
+    perfil = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True
+    )
+
+    status = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "nomina_run_stats"
+        verbose_name = "Métrica de corrida de nómina"
+        verbose_name_plural = "Métricas de corridas de nómina"
+
+    def __str__(self):
+        return f"{self.nomina} - {self.modo} - {self.segundos:.2f}s"
+
     
 class IsrQuincenal(models.Model):
     ejercicio = models.IntegerField(
@@ -324,10 +570,12 @@ class IsrQuincenal(models.Model):
         default=Decimal("0.00")
     )
 
+    # NULL = renglón superior de la tarifa ("en adelante")
     limite_superior = models.DecimalField(
         max_digits=10, 
         decimal_places=2,
-        default=Decimal("0.00")
+        null=True,
+        blank=True
     )
 
     cuota_fija = models.DecimalField(
@@ -382,10 +630,12 @@ class IsrSemanal(models.Model):
         default=Decimal("0.00")
     )
 
+    # NULL = renglón superior de la tarifa ("en adelante")
     limite_superior = models.DecimalField(
         max_digits=10, 
         decimal_places=2,
-        default=Decimal("0.00")
+        null=True,
+        blank=True
     )
 
     cuota_fija = models.DecimalField(
@@ -484,4 +734,16 @@ class Uma(models.Model):
         verbose_name_plural = "UMA"
 
     def __str__(self):
-        return str(self.valor)
\ No newline at end of file
+        return str(self.valor)
+
+    @property
+    def tres_umas(self):
+        return calcular_tres_umas(self)
+
+    @property
+    def tope_sbc(self):
+        return calcular_tope_sbc(self)
+
+    @property
+    def subsidio_diario(self):
+        return calcular_subsidio_diario(self)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from .models import Recibo
+
+class ReciboSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Recibo
+        fields = [
+            "id", "nomina_id", "empleado_id",
+            "periodicidad_pago", "sd", "sdi",
+            "sueldos_salarios", "isr_determinado", "isr_retenido",
+            "subsidio_empleo_causado", "subsidio_empleo_entregado",
+            "imss", "neto",
+            "status", "created_at", "updated_at"
+        ]
+        read_only_fields = fields
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.core.cache import cache
+
+from nomina.models import Uma
+
+from .factor_integracion import (
+    PERFILES_GENERACION_KEY,
+    TablaFactores,
+    get_tabla_factores
+)
+from .isr_tarifa import ISR_MODELS, TARIFAS_GENERACION_KEY, get_tarifa_isr
+
+from .nomina_math import (
+    calcular_subsidio_diario,
+    calcular_subsidio_empleo_causado,
+    calcular_tope_sbc,
+    calcular_tres_umas
+)
+
+# Contador compartido (cache de Django) que invalida los ejercicios cargados
+# en todos los procesos cuando se modifica una UMA.
+UMA_GENERACION_KEY = "nomina:uma:generacion"
+
+# ejercicio -> (generaciones, EjercicioFiscal)
+_ejercicios = {}
+
+
+@dataclass(frozen=True)
+class EjercicioFiscal:
+    """
+    Fotografía inmutable de la UMA y las tarifas ISR de un ejercicio.
+
+    Expone los mismos atributos que el modelo Uma (valor, limite_max,
+    porcentaje_uma, factor_mensual) más las constantes derivadas ya
+    calculadas, por lo que puede pasarse como `uma` a las funciones de
+    nomina_math sin repetir la aritmética Decimal por empleado.
+
+    factores es la TablaFactores vigente al cargar el ejercicio.
+    """
+
+    ejercicio: int
+    uma_id: int
+
+    valor: Decimal
+    limite_max: Decimal
+    porcentaje_uma: Decimal
+    factor_mensual: Decimal
+
+    # Constantes derivadas de la UMA
+    tres_umas: Decimal
+    tope_sbc: Decimal
+    uma_mensual: Decimal
+    subsidio_diario: Decimal
+
+    # periodicidad_pago -> subsidio causado, TarifaIsr y contexto de huella
+    subsidios: MappingProxyType
+    tarifas: MappingProxyType
+    contextos: MappingProxyType
+
+    # (año de servicio, perfil de prestaciones) -> factor de integración
+    factores: TablaFactores
+
+    @classmethod
+    def cargar(cls, ejercicio):
+        uma = Uma.objects.filter(
+            ejercicio=ejercicio,
+            status=True
+        ).first()
+
+        if not uma:
+            raise ValueError(f"UMA not found for ejercicio {ejercicio}")
+
+        tarifas = {
+            periodicidad_pago: get_tarifa_isr(ejercicio, periodicidad_pago)
+            for periodicidad_pago in ISR_MODELS
+        }
+
+        return cls(
+            ejercicio=ejercicio,
+            uma_id=uma.id,
+            valor=uma.valor,
+            limite_max=uma.limite_max,
+            porcentaje_uma=uma.porcentaje_uma,
+            factor_mensual=uma.factor_mensual,
+            tres_umas=calcular_tres_umas(uma),
+            tope_sbc=calcular_tope_sbc(uma),
+            uma_mensual=uma.valor * uma.factor_mensual,
+            subsidio_diario=calcular_subsidio_diario(uma),
+            subsidios=MappingProxyType({
+                periodicidad_pago: calcular_subsidio_empleo_causado(uma, periodicidad_pago)
+                for periodicidad_pago in ISR_MODELS
+            }),
+            tarifas=MappingProxyType(tarifas),
+            contextos=MappingProxyType({
+                periodicidad_pago: (
+                    f"{uma.id}|{uma.valor}|{uma.limite_max}|{uma.porcentaje_uma}|"
+                    f"{uma.factor_mensual}|{tarifa.ejercicio}|{tarifa.version}"
+                )
+                for periodicidad_pago, tarifa in tarifas.items()
+            }),
+            factores=get_tabla_factores(),
+        )
+
+    def tarifa(self, periodicidad_pago):
+        tarifa = self.tarifas.get(periodicidad_pago)
+
+        if tarifa is None:
+            raise ValueError(f"ISR model not found for periodicidad_pago {periodicidad_pago}")
+
+        return tarifa
+
+    def contexto(self, periodicidad_pago):
+        """
+        Identifica la UMA y la versión de la tarifa ISR con que se calcula un
+        recibo de esta periodicidad (ver nomina_service.calcular_huella).
+        """
+        self.tarifa(periodicidad_pago)
+
+        return self.contextos[periodicidad_pago]
+
+    def subsidio_empleo_causado(self, periodicidad_pago):
+        subsidio = self.subsidios.get(periodicidad_pago)
+
+        if subsidio is None:
+            subsidio = calcular_subsidio_empleo_causado(self, periodicidad_pago)
+
+        return subsidio
+
+
+def get_ejercicio_fiscal(ejercicio):
+    """
+    Regresa el EjercicioFiscal del ejercicio, cargándolo una sola vez por
+    proceso hasta que se modifique una UMA, una tarifa ISR o un perfil de
+    prestaciones.
+    """
+    generaciones = cache.get_many([
+        UMA_GENERACION_KEY,
+        TARIFAS_GENERACION_KEY,
+        PERFILES_GENERACION_KEY,
+    ])
+    generaciones = (
+        generaciones.get(UMA_GENERACION_KEY, 0),
+        generaciones.get(TARIFAS_GENERACION_KEY, 0),
+        generaciones.get(PERFILES_GENERACION_KEY, 0),
+    )
+
+    entrada = _ejercicios.get(ejercicio)
+
+    if entrada is None or entrada[0] != generaciones:
+        entrada = (generaciones, EjercicioFiscal.cargar(ejercicio))
+        _ejercicios[ejercicio] = entrada
+
+    return entrada[1]
+
+def invalidar_ejercicios_fiscales():
+    """
+    Descarta los ejercicios cargados en este proceso y en los demás procesos
+    que comparten la cache de Django.
+    """
+    _ejercicios.clear()
+
+    try:
+        cache.incr(UMA_GENERACION_KEY)
+    except ValueError:
+        cache.set(UMA_GENERACION_KEY, 1, None)
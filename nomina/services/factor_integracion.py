@@ -0,0 +1,146 @@
+from django.apps import apps
+from django.core.cache import cache
+
+from .nomina_lote import fraccion_integracion
+
+from .nomina_math import (
+    AGUINALDO_DIAS,
+    PRIMA_VACACIONAL,
+    aplicar_factor_integracion,
+    calcular_anio_servicio,
+    calcular_dias_vacaciones
+)
+
+# Contador compartido (cache de Django) que invalida la tabla cargada en
+# todos los procesos cuando se modifica un perfil de prestaciones.
+PERFILES_GENERACION_KEY = "nomina:perfiles_prestaciones:generacion"
+
+# Años de servicio que se precalculan; los siguientes se calculan (y se
+# guardan) la primera vez que se consultan.
+ANIOS_TABLA = 50
+
+# (generacion, TablaFactores)
+_tabla = None
+
+
+def fraccion_integracion_antiguedad(
+    anio_servicio,
+    aguinaldo_dias=AGUINALDO_DIAS,
+    prima_vacacional=PRIMA_VACACIONAL,
+    vacaciones_adicionales=0,
+):
+    """
+    Factor de integración como fracción exacta (numerador, denominador) con
+    los días de vacaciones del año de servicio más los días adicionales que
+    otorgue la empresa.
+    """
+    return fraccion_integracion(
+        aguinaldo_dias=aguinaldo_dias,
+        vacaciones_dias=calcular_dias_vacaciones(anio_servicio) + vacaciones_adicionales,
+        prima_vacacional=prima_vacacional,
+    )
+
+
+class TablaFactores:
+    """
+    Factores de integración precalculados por (año de servicio, perfil de
+    prestaciones), como fracción exacta (numerador, denominador).
+
+    El perfil None son las prestaciones mínimas de ley. Consultar un factor
+    es una búsqueda en un dict; la fracción se aplica con
+    aplicar_factor_integracion (SDI) o calcular_salario_base_cotizacion.
+    """
+
+    def __init__(self, perfiles):
+        # perfil_id -> (aguinaldo_dias, prima_vacacional, vacaciones_adicionales)
+        self.perfiles = perfiles
+
+        self._factores = {
+            (anio_servicio, perfil_id): self._calcular(anio_servicio, perfil_id)
+            for perfil_id in [None, *perfiles]
+            for anio_servicio in range(1, ANIOS_TABLA + 1)
+        }
+
+    @classmethod
+    def cargar(cls):
+        PerfilPrestaciones = apps.get_model("nomina", "PerfilPrestaciones")
+
+        return cls({
+            perfil_id: (aguinaldo_dias, prima_vacacional, vacaciones_adicionales)
+            for perfil_id, aguinaldo_dias, prima_vacacional, vacaciones_adicionales
+            in PerfilPrestaciones.objects.values_list(
+                "id", "aguinaldo_dias", "prima_vacacional", "vacaciones_adicionales"
+            )
+        })
+
+    def _calcular(self, anio_servicio, perfil_id):
+        if perfil_id is None:
+            return fraccion_integracion_antiguedad(anio_servicio)
+
+        if perfil_id not in self.perfiles:
+            raise ValueError(f"PerfilPrestaciones not found: {perfil_id}")
+
+        aguinaldo_dias, prima_vacacional, vacaciones_adicionales = self.perfiles[perfil_id]
+
+        return fraccion_integracion_antiguedad(
+            anio_servicio,
+            aguinaldo_dias=aguinaldo_dias,
+            prima_vacacional=prima_vacacional,
+            vacaciones_adicionales=vacaciones_adicionales,
+        )
+
+    def fraccion(self, anio_servicio, perfil_id=None):
+        clave = (anio_servicio, perfil_id)
+        factor = self._factores.get(clave)
+
+        if factor is None:
+            factor = self._factores[clave] = self._calcular(anio_servicio, perfil_id)
+
+        return factor
+
+    def fraccion_empleado(self, fecha_ingreso, perfil_id, fecha):
+        """
+        Factor del empleado a la fecha según su fecha de ingreso y el perfil
+        de prestaciones de su plaza.
+        """
+        return self.fraccion(calcular_anio_servicio(fecha_ingreso, fecha), perfil_id)
+
+    def sdi(self, salario_diario, fecha_ingreso, perfil_id, fecha):
+        return aplicar_factor_integracion(
+            salario_diario,
+            self.fraccion_empleado(fecha_ingreso, perfil_id, fecha)
+        )
+
+
+def get_generacion_perfiles():
+    return cache.get(PERFILES_GENERACION_KEY, 0)
+
+def get_tabla_factores():
+    """
+    Regresa la TablaFactores, cargándola una sola vez por proceso hasta que
+    se modifique un perfil de prestaciones.
+    """
+    global _tabla
+
+    generacion = get_generacion_perfiles()
+    entrada = _tabla
+
+    if entrada is None or entrada[0] != generacion:
+        entrada = (generacion, TablaFactores.cargar())
+        _tabla = entrada
+
+    return entrada[1]
+
+def invalidar_tablas_factores():
+    """
+    Descarta la tabla cargada en este proceso y en los demás procesos que
+    comparten la cache de Django.
+    """
+    global _tabla
+
+    _tabla = None
+
+    try:
+        cache.incr(PERFILES_GENERACION_KEY)
+    except ValueError:
+        cache.set(PERFILES_GENERACION_KEY, 1, None)
@@ -0,0 +1,415 @@
+import csv
+import io
+import re
+import time
+
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from nomina.models import Departamento, Empleado, Plaza
+
+from .isr_tarifa import ISR_MODELS
+from .factor_integracion import get_tabla_factores
+
+# RFC de persona física: 4 letras, fecha AAMMDD y homoclave
+RFC_REGEX = re.compile(r"^[A-ZÑ&]{4}\d{6}[A-Z0-9]{3}$")
+
+COLUMNAS_REQUERIDAS = ["rfc", "nombre_completo", "sd", "periodicidad_pago"]
+
+# Columnas que se escriben (y se actualizan cuando el RFC ya existe)
+CAMPOS_CARGA = [
+    "rfc",
+    "nombre_completo",
+    "sd",
+    "sdi",
+    "periodicidad_pago",
+    "plaza_id",
+    "departamento_id",
+    "fecha_ingreso",
+]
+
+# Campos opcionales -> columna del CSV; si la columna no viene en el archivo
+# el campo no se escribe y los empleados existentes conservan su valor
+CAMPOS_OPCIONALES = {
+    "plaza_id": "plaza",
+    "departamento_id": "departamento",
+    "fecha_ingreso": "fecha_ingreso",
+}
+
+SD_MAXIMO = Decimal("99999999.99")
+CENTAVOS = Decimal("0.01")
+
+
+class ResultadoImportacion:
+    def __init__(self):
+        self.filas = 0
+        self.insertados = 0
+        self.actualizados = 0
+        self.errores = []
+        self.segundos = 0.0
+
+    def agregar_error(self, fila, rfc, errores):
+        self.errores.append({
+            "fila": fila,
+            "rfc": rfc,
+            "errores": errores,
+        })
+
+    @property
+    def filas_por_segundo(self):
+        return self.filas / self.segundos if self.segundos else 0.0
+
+    def resumen(self):
+        return {
+            "filas": self.filas,
+            "insertados": self.insertados,
+            "actualizados": self.actualizados,
+            "con_error": len(self.errores),
+            "segundos": round(self.segundos, 3),
+            "filas_por_segundo": round(self.filas_por_segundo, 1),
+            "errores": self.errores,
+        }
+
+
+def _catalogo(model):
+    """
+    (ids, descripcion en minúsculas -> id) de un catálogo pequeño (Plaza,
+    Departamento), para resolver la columna sin una consulta por fila.
+
+    Ids y descripciones van por separado: una descripción numérica ("12")
+    no debe ocultar al registro con ese id ni al revés.
+    """
+    ids = set()
+    descripciones = {}
+
+    for pk, descripcion in model.objects.filter(status=True).values_list("id", "descripcion"):
+        ids.add(pk)
+
+        if descripcion:
+            descripciones[descripcion.strip().lower()] = pk
+
+    return ids, descripciones
+
+def _buscar_en_catalogo(catalogo, valor):
+    """
+    Un valor entero se busca primero como id; si no es entero o no hay
+    registro con ese id, se busca como descripción.
+    """
+    ids, descripciones = catalogo
+
+    try:
+        pk = int(valor)
+    except ValueError:
+        pk = None
+
+    if pk in ids:
+        return pk
+
+    return descripciones.get(valor.lower())
+
+def validar_fila(fila, plazas, departamentos):
+    """
+    Valida y normaliza una fila del CSV. Regresa (datos, errores).
+    """
+    errores = []
+
+    rfc = (fila.get("rfc") or "").strip().upper()
+
+    if not RFC_REGEX.match(rfc):
+        errores.append("RFC inválido")
+
+    nombre_completo = (fila.get("nombre_completo") or "").strip()
+
+    if not nombre_completo:
+        errores.append("nombre_completo requerido")
+
+    try:
+        sd = Decimal((fila.get("sd") or "").strip().replace(",", ""))
+    except InvalidOperation:
+        sd = None
+
+    if sd is None or not sd.is_finite() or sd <= 0 or sd > SD_MAXIMO:
+        errores.append("sd debe ser un importe mayor a cero")
+    elif sd != sd.quantize(CENTAVOS):
+        errores.append("sd admite máximo dos decimales")
+
+    try:
+        periodicidad_pago = int((fila.get("periodicidad_pago") or "").strip())
+    except ValueError:
+        periodicidad_pago = None
+
+    if periodicidad_pago not in ISR_MODELS:
+        errores.append(
+            "periodicidad_pago debe ser "
+            + " o ".join(str(periodicidad) for periodicidad in ISR_MODELS)
+        )
+
+    fecha_ingreso = (fila.get("fecha_ingreso") or "").strip() or None
+
+    if fecha_ingreso:
+        try:
+            fecha_ingreso = date.fromisoformat(fecha_ingreso)
+        except ValueError:
+            errores.append("fecha_ingreso debe tener formato AAAA-MM-DD")
+
+    ids = {}
+
+    for columna, catalogo in (("plaza", plazas), ("departamento", departamentos)):
+        valor = (fila.get(columna) or "").strip()
+
+        if not valor:
+            ids[columna] = None
+            continue
+
+        ids[columna] = _buscar_en_catalogo(catalogo, valor)
+
+        if ids[columna] is None:
+            errores.append(f"{columna} no encontrado: {valor}")
+
+    if errores:
+        return None, errores
+
+    return {
+        "rfc": rfc,
+        "nombre_completo": nombre_completo,
+        "sd": sd,
+        "periodicidad_pago": periodicidad_pago,
+        "plaza_id": ids["plaza"],
+        "departamento_id": ids["departamento"],
+        "fecha_ingreso": fecha_ingreso,
+    }, []
+
+def campos_archivo(columnas):
+    """
+    Campos de CAMPOS_CARGA que se escriben para un CSV con estas columnas.
+    """
+    return [
+        campo for campo in CAMPOS_CARGA
+        if campo not in CAMPOS_OPCIONALES or CAMPOS_OPCIONALES[campo] in columnas
+    ]
+
+def _cargar_copy(filas, ahora, user, campos):
+    """
+    Carga el bloque con COPY a una tabla temporal y un solo
+    INSERT ... ON CONFLICT (rfc) DO UPDATE. Regresa (insertados, actualizados).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for fila in filas:
+        writer.writerow([
+            "" if fila[campo] is None else fila[campo]
+            for campo in campos
+        ])
+
+    buffer.seek(0)
+
+    columnas = ", ".join(campos)
+    actualizar = ", ".join(
+        f"{campo} = EXCLUDED.{campo}" for campo in campos if campo != "rfc"
+    )
+
+    with connection.cursor() as cursor:
+        # IF NOT EXISTS + TRUNCATE: varios bloques pueden caer en la misma
+        # transacción externa (p. ej. ATOMIC_REQUESTS)
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS empleado_importacion ("
+            "rfc varchar(255), nombre_completo varchar(255), "
+            "sd numeric(10, 2), sdi numeric(10, 2), periodicidad_pago integer, "
+            "plaza_id bigint, departamento_id bigint, fecha_ingreso date"
+            ") ON COMMIT DROP"
+        )
+        cursor.execute("TRUNCATE empleado_importacion")
+
+        copy_sql = f"COPY empleado_importacion ({columnas}) FROM STDIN WITH (FORMAT csv)"
+        raw = cursor.cursor
+
+        if hasattr(raw, "copy_expert"):
+            # psycopg2
+            raw.copy_expert(copy_sql, buffer)
+        else:
+            # psycopg 3
+            with raw.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+
+        cursor.execute(
+            f"INSERT INTO {Empleado._meta.db_table} "
+            f"({columnas}, status, created_at, updated_at, user_created_id, user_updated_id) "
+            f"SELECT {columnas}, TRUE, %s, %s, %s, %s FROM empleado_importacion "
+            f"ON CONFLICT (rfc) DO UPDATE SET {actualizar}, "
+            f"updated_at = EXCLUDED.updated_at, user_updated_id = EXCLUDED.user_updated_id "
+            f"RETURNING (xmax = 0)",
+            [ahora, ahora, user, user]
+        )
+
+        insertados = sum(1 for (insertado,) in cursor.fetchall() if insertado)
+
+    return insertados, len(filas) - insertados
+
+def _cargar_bulk_create(filas, ahora, user, campos):
+    """
+    Carga el bloque con bulk_create(update_conflicts=True), para bases de
+    datos sin COPY (SQLite). Regresa (insertados, actualizados).
+    """
+    existentes = set(
+        Empleado.objects.filter(
+            rfc__in=[fila["rfc"] for fila in filas]
+        ).values_list("rfc", flat=True)
+    )
+
+    Empleado.objects.bulk_create(
+        [
+            Empleado(
+                created_at=ahora,
+                updated_at=ahora,
+                user_created_id=user,
+                user_updated_id=user,
+                **{campo: fila[campo] for campo in campos}
+            )
+            for fila in filas
+        ],
+        update_conflicts=True,
+        unique_fields=["rfc"],
+        update_fields=[campo for campo in campos if campo != "rfc"] + [
+            "updated_at",
+            "user_updated_id",
+        ]
+    )
+
+    return len(filas) - len(existentes), len(existentes)
+
+def cargar_bloque(filas, user=None, campos=CAMPOS_CARGA):
+    """
+    Inserta o actualiza (por RFC) un bloque de filas ya validadas. Sólo se
+    escriben los campos indicados.
+    """
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            return _cargar_copy(filas, ahora, user, campos)
+
+        return _cargar_bulk_create(filas, ahora, user, campos)
+
+def calcular_sdi_bloque(filas, campos, factores, perfiles_plaza, fecha):
+    """
+    Calcula el SDI de cada fila. Si el archivo no trae plaza o
+    fecha_ingreso, los empleados existentes se calculan con los valores que
+    tienen guardados.
+    """
+    guardados = {}
+
+    if "plaza_id" not in campos or "fecha_ingreso" not in campos:
+        guardados = {
+            rfc: {"plaza_id": plaza_id, "fecha_ingreso": fecha_ingreso}
+            for rfc, plaza_id, fecha_ingreso in Empleado.objects.filter(
+                rfc__in=[fila["rfc"] for fila in filas]
+            ).values_list("rfc", "plaza_id", "fecha_ingreso")
+        }
+
+    for fila in filas:
+        valores = {
+            campo: fila[campo] if campo in campos else guardados.get(fila["rfc"], {}).get(campo)
+            for campo in ("plaza_id", "fecha_ingreso")
+        }
+
+        fila["sdi"] = factores.sdi(
+            fila["sd"],
+            valores["fecha_ingreso"],
+            perfiles_plaza.get(valores["plaza_id"]),
+            fecha
+        )
+
+def importar_empleados(archivo, user=None, batch_size=5000, progreso=None):
+    """
+    Importa empleados desde un CSV (archivo de texto) con columnas rfc,
+    nombre_completo, sd, periodicidad_pago y, opcionalmente, plaza,
+    departamento (id o descripción) y fecha_ingreso (AAAA-MM-DD). Las
+    columnas opcionales que no vengan en el archivo no se modifican en los
+    empleados existentes.
+
+    El archivo se lee en streaming y se carga por bloques de batch_size
+    filas; el SDI se calcula con el perfil de prestaciones de la plaza y la
+    antigüedad, igual que Empleado.save(). Las
+    filas inválidas, los RFC repetidos en el archivo y los bloques que
+    fallen en la base de datos se reportan en el resultado sin detener la
+    importación.
+
+    user es el id del usuario que registra la importación. progreso, si se
+    indica, se llama con el ResultadoImportacion después de cada bloque.
+    """
+    resultado = ResultadoImportacion()
+    inicio = time.monotonic()
+
+    lector = csv.DictReader(archivo)
+    lector.fieldnames = [
+        (columna or "").strip().lower() for columna in (lector.fieldnames or [])
+    ]
+
+    faltantes = [columna for columna in COLUMNAS_REQUERIDAS if columna not in lector.fieldnames]
+
+    if faltantes:
+        raise ValueError(f"Missing CSV columns: {', '.join(faltantes)}")
+
+    campos = campos_archivo(lector.fieldnames)
+
+    plazas = _catalogo(Plaza)
+    departamentos = _catalogo(Departamento)
+
+    perfiles_plaza = dict(Plaza.objects.values_list("id", "perfil_prestaciones_id"))
+    factores = get_tabla_factores()
+    hoy = timezone.localdate()
+
+    vistos = set()
+    bloque = []
+    numeros = []
+
+    def cargar():
+        try:
+            calcular_sdi_bloque(bloque, campos, factores, perfiles_plaza, hoy)
+            insertados, actualizados = cargar_bloque(bloque, user, campos)
+        except Exception as e:
+            for numero, fila in zip(numeros, bloque):
+                resultado.agregar_error(numero, fila["rfc"], [f"{type(e).__name__}: {e}"])
+        else:
+            resultado.insertados += insertados
+            resultado.actualizados += actualizados
+
+        bloque.clear()
+        numeros.clear()
+
+        resultado.segundos = time.monotonic() - inicio
+
+        if progreso:
+            progreso(resultado)
+
+    # La fila 1 es el encabezado
+    for numero, fila in enumerate(lector, 2):
+        resultado.filas += 1
+
+        datos, errores = validar_fila(fila, plazas, departamentos)
+
+        if datos and datos["rfc"] in vistos:
+            errores = ["RFC repetido en el archivo"]
+
+        if errores:
+            resultado.agregar_error(numero, (fila.get("rfc") or "").strip().upper(), errores)
+            continue
+
+        vistos.add(datos["rfc"])
+
+        bloque.append(datos)
+        numeros.append(numero)
+
+        if len(bloque) >= batch_size:
+            cargar()
+
+    if bloque:
+        cargar()
+
+    resultado.segundos = time.monotonic() - inicio
+
+    return resultado
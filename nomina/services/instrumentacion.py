@@ -0,0 +1,158 @@
+import cProfile
+import json
+import logging
+import os
+import tempfile
+import time
+
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from nomina.models import NominaRunStats
+
+logger = logging.getLogger("nomina.instrumentacion")
+
+
+class MedicionNomina:
+    """
+    Mide una corrida de nómina: tiempo y queries por etapa, empleados
+    leídos y recibos escritos.
+
+    Se usa como context manager alrededor de la corrida. Al terminar sin
+    error guarda un NominaRunStats y, en todos los casos, registra el
+    resumen en el logger "nomina.instrumentacion". Con perfilar=True
+    además guarda un volcado de cProfile de la corrida.
+
+    rango es el shard (id_desde, id_hasta) de la corrida, si lo hay; junto
+    con el pid distingue los volcados de shards que corren en paralelo.
+    """
+
+    def __init__(self, nomina, modo, perfilar=False, rango=None):
+        self.nomina = nomina
+        self.modo = modo
+        self.rango = rango
+        self.perfilar = perfilar or getattr(settings, "NOMINA_PERFILAR", False)
+
+        self.etapas = {}
+        self.queries = 0
+        self.empleados_leidos = 0
+        self.recibos_escritos = 0
+
+        self.perfil = None
+        self._profiler = None
+        self._pila = None
+
+    def _contar_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def etapa(self, nombre):
+        inicio = time.perf_counter()
+        queries = self.queries
+
+        try:
+            yield
+        finally:
+            etapa = self.etapas.setdefault(nombre, {"segundos": 0.0, "queries": 0})
+            etapa["segundos"] += time.perf_counter() - inicio
+            etapa["queries"] += self.queries - queries
+
+    def iterar(self, nombre, iterable):
+        """
+        Recorre el iterable midiendo en la etapa `nombre` el tiempo de
+        obtener cada elemento (p. ej. leer un bloque de empleados).
+        """
+        iterador = iter(iterable)
+
+        while True:
+            with self.etapa(nombre):
+                try:
+                    elemento = next(iterador)
+                except StopIteration:
+                    return
+
+            yield elemento
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        self._pila.enter_context(connection.execute_wrapper(self._contar_query))
+
+        if self.perfilar:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+        self.iniciado_en = timezone.now()
+        self._inicio = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.segundos = time.perf_counter() - self._inicio
+
+        if self._profiler:
+            self._profiler.disable()
+            self.perfil = self._guardar_perfil()
+
+        self._pila.close()
+
+        resumen = self.resumen()
+        resumen["error"] = None if exc is None else f"{exc_type.__name__}: {exc}"
+
+        logger.info(
+            "nomina_run %s",
+            json.dumps(resumen, default=str),
+            extra={"nomina_run": resumen}
+        )
+
+        if exc is None:
+            NominaRunStats.objects.create(
+                nomina=self.nomina,
+                modo=self.modo,
+                iniciado_en=self.iniciado_en,
+                segundos=self.segundos,
+                queries=self.queries,
+                empleados_leidos=self.empleados_leidos,
+                recibos_escritos=self.recibos_escritos,
+                etapas=self.etapas,
+                perfil=self.perfil
+            )
+
+        return False
+
+    def _guardar_perfil(self):
+        directorio = getattr(settings, "NOMINA_PERFIL_DIR", None) or tempfile.gettempdir()
+        os.makedirs(directorio, exist_ok=True)
+
+        shard = f"_{self.rango[0]}-{self.rango[1]}" if self.rango else ""
+
+        ruta = os.path.join(
+            directorio,
+            f"nomina_{self.nomina.id}_{self.modo}{shard}_"
+            f"{self.iniciado_en:%Y%m%d%H%M%S}_{os.getpid()}.prof"
+        )
+
+        self._profiler.dump_stats(ruta)
+
+        return ruta
+
+    def resumen(self):
+        return {
+            "nomina_id": self.nomina.id,
+            "modo": self.modo,
+            "segundos": round(self.segundos, 6),
+            "queries": self.queries,
+            "empleados_leidos": self.empleados_leidos,
+            "recibos_escritos": self.recibos_escritos,
+            "etapas": {
+                nombre: {
+                    "segundos": round(etapa["segundos"], 6),
+                    "queries": etapa["queries"],
+                }
+                for nombre, etapa in self.etapas.items()
+            },
+            "perfil": self.perfil,
+        }
@@ -0,0 +1,114 @@
+import hashlib
+
+from bisect import bisect_right
+
+from django.core.cache import cache
+
+from nomina.models import IsrSemanal, IsrQuincenal
+
+ISR_MODELS = {
+    7: IsrSemanal,
+    15: IsrQuincenal
+}
+
+# Contador compartido (cache de Django) que invalida las tarifas cargadas
+# en todos los procesos cuando se modifica un renglón de ISR.
+TARIFAS_GENERACION_KEY = "nomina:tarifas_isr:generacion"
+
+# (ejercicio, periodicidad_pago) -> (generacion, TarifaIsr)
+_tarifas = {}
+
+
+class TarifaIsr:
+    """
+    Tarifa ISR (Art. 96 LISR) de un ejercicio y periodicidad cargada en memoria.
+
+    Los renglones se ordenan por limite_inferior y el renglón aplicable se
+    resuelve por búsqueda binaria, sin consultar la base de datos.
+
+    El renglón con limite_superior NULL es el renglón superior ("en adelante").
+    """
+
+    def __init__(self, ejercicio, periodicidad_pago, renglones):
+        self.ejercicio = ejercicio
+        self.periodicidad_pago = periodicidad_pago
+        self.renglones = sorted(renglones, key=lambda r: r.limite_inferior)
+        self.limites_inferiores = [r.limite_inferior for r in self.renglones]
+        self.version = self._calcular_version()
+
+    @classmethod
+    def cargar(cls, ejercicio, periodicidad_pago):
+        model = ISR_MODELS.get(periodicidad_pago)
+
+        if not model:
+            raise ValueError(f"ISR model not found for periodicidad_pago {periodicidad_pago}")
+
+        renglones = model.objects.filter(
+            ejercicio=ejercicio,
+            status=True
+        ).order_by("limite_inferior")
+
+        return cls(ejercicio, periodicidad_pago, list(renglones))
+
+    def _calcular_version(self):
+        """
+        Huella de los renglones cargados; cambia si cualquier renglón cambia.
+        """
+        digest = hashlib.sha1()
+
+        for r in self.renglones:
+            digest.update(
+                f"{r.id}|{r.limite_inferior}|{r.limite_superior}|"
+                f"{r.cuota_fija}|{r.porcentaje_excedente};".encode()
+            )
+
+        return digest.hexdigest()[:12]
+
+    def buscar(self, importe_gravado):
+        """
+        Regresa el renglón cuyo rango contiene el importe gravado.
+        """
+        i = bisect_right(self.limites_inferiores, importe_gravado) - 1
+
+        if i >= 0:
+            renglon = self.renglones[i]
+
+            if (
+                renglon.limite_superior is None
+                or renglon.limite_superior >= importe_gravado
+            ):
+                return renglon
+
+        raise ValueError(f"ISR record not found")
+
+    def __len__(self):
+        return len(self.renglones)
+
+
+def get_tarifa_isr(ejercicio, periodicidad_pago):
+    """
+    Regresa la TarifaIsr del ejercicio/periodicidad, cargándola una sola vez
+    por proceso hasta que se invalide.
+    """
+    generacion = cache.get(TARIFAS_GENERACION_KEY, 0)
+    clave = (ejercicio, periodicidad_pago)
+
+    entrada = _tarifas.get(clave)
+
+    if entrada is None or entrada[0] != generacion:
+        entrada = (generacion, TarifaIsr.cargar(ejercicio, periodicidad_pago))
+        _tarifas[clave] = entrada
+
+    return entrada[1]
+
+def invalidar_tarifas_isr():
+    """
+    Descarta las tarifas cargadas en este proceso y en los demás procesos
+    que comparten la cache de Django.
+    """
+    _tarifas.clear()
+
+    try:
+        cache.incr(TARIFAS_GENERACION_KEY)
+    except ValueError:
+        cache.set(TARIFAS_GENERACION_KEY, 1, None)
@@ -0,0 +1,197 @@
+import traceback
+
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from nomina.models import NominaJob, Recibo
+
+from .nomina_service import (
+    get_empleados_nomina,
+    process_nomina_detalle_streaming,
+    recalcular_nomina
+)
+
+# Segundos de espera antes del primer reintento; se duplica en cada intento
+REINTENTO_BASE_SEGUNDOS = 30
+
+# Error de los jobs estancados que ya agotaron sus intentos
+ERROR_ESTANCADO = "El worker dejó de reportar avance en el último intento."
+
+def espera_reintento(intentos):
+    return timedelta(seconds=REINTENTO_BASE_SEGUNDOS * 2 ** (intentos - 1))
+
+def encolar_nomina(nomina, user=None, tipo=NominaJob.GENERAR):
+    """
+    Registra un job pendiente para generar (o recalcular) los recibos de la
+    nómina.
+    """
+    return NominaJob.objects.create(
+        nomina=nomina,
+        tipo=tipo,
+        user_created=user,
+        user_updated=user
+    )
+
+def tomar_siguiente_job(worker):
+    """
+    Toma el siguiente job pendiente y lo marca en proceso.
+
+    La toma es un UPDATE condicionado al estado, por lo que dos workers
+    nunca procesan el mismo job aunque lo lean al mismo tiempo.
+    """
+    ahora = timezone.now()
+
+    candidatos = list(
+        NominaJob.objects.filter(
+            estado=NominaJob.PENDIENTE,
+            disponible_en__lte=ahora
+        ).order_by(
+            "disponible_en", "id"
+        ).values_list("id", flat=True)[:10]
+    )
+
+    for job_id in candidatos:
+        tomado = NominaJob.objects.filter(
+            id=job_id,
+            estado=NominaJob.PENDIENTE
+        ).update(
+            estado=NominaJob.EN_PROCESO,
+            worker=worker,
+            intentos=F("intentos") + 1,
+            iniciado_en=ahora,
+            updated_at=ahora
+        )
+
+        if tomado:
+            return NominaJob.objects.select_related("nomina").get(id=job_id)
+
+    return None
+
+def ejecutar_job(job):
+    """
+    Genera o recalcula los recibos de la nómina del job actualizando su
+    avance.
+
+    Si falla, el job regresa a pendiente con espera exponencial hasta
+    agotar max_intentos; después queda en error.
+    """
+    nomina = job.nomina
+
+    if job.tipo == NominaJob.RECALCULAR:
+        total = Recibo.objects.filter(nomina=nomina).count()
+        procesados = 0
+    else:
+        total = get_empleados_nomina(nomina).count()
+        procesados = Recibo.objects.filter(nomina=nomina).count()
+
+    NominaJob.objects.filter(id=job.id).update(
+        total=total,
+        procesados=procesados,
+        error=None,
+        updated_at=timezone.now()
+    )
+
+    def progreso(procesados):
+        NominaJob.objects.filter(id=job.id).update(
+            procesados=F("procesados") + procesados,
+            updated_at=timezone.now()
+        )
+
+    try:
+        if job.tipo == NominaJob.RECALCULAR:
+            recalcular_nomina(nomina, progreso=progreso)
+        else:
+            process_nomina_detalle_streaming(nomina, progreso=progreso)
+    except Exception:
+        job.refresh_from_db()
+
+        ahora = timezone.now()
+
+        if job.intentos >= job.max_intentos:
+            estado = NominaJob.ERROR
+            disponible_en = job.disponible_en
+        else:
+            estado = NominaJob.PENDIENTE
+            disponible_en = ahora + espera_reintento(job.intentos)
+
+        NominaJob.objects.filter(id=job.id).update(
+            estado=estado,
+            disponible_en=disponible_en,
+            error=traceback.format_exc(),
+            terminado_en=ahora if estado == NominaJob.ERROR else None,
+            updated_at=ahora
+        )
+
+        raise
+
+    ahora = timezone.now()
+
+    NominaJob.objects.filter(id=job.id).update(
+        estado=NominaJob.TERMINADO,
+        procesados=F("total"),
+        terminado_en=ahora,
+        updated_at=ahora
+    )
+
+def liberar_jobs_estancados(segundos):
+    """
+    Libera los jobs en proceso sin avance en los últimos segundos indicados
+    (p. ej. porque su worker terminó abruptamente).
+
+    El intento interrumpido cuenta como fallido (se sumó al tomar el job):
+    si el job ya agotó max_intentos queda en error; si no, regresa a
+    pendiente con la misma espera exponencial que un intento con excepción.
+
+    Regresa un dict con el número de jobs liberados y en error.
+    """
+    ahora = timezone.now()
+
+    estancados = NominaJob.objects.filter(
+        estado=NominaJob.EN_PROCESO,
+        updated_at__lt=ahora - timedelta(seconds=segundos)
+    )
+
+    agotados = estancados.filter(
+        intentos__gte=F("max_intentos")
+    ).update(
+        estado=NominaJob.ERROR,
+        worker=None,
+        error=ERROR_ESTANCADO,
+        terminado_en=ahora,
+        updated_at=ahora
+    )
+
+    liberados = 0
+
+    # Un UPDATE por número de intentos, para calcular la espera de cada uno
+    for intentos in set(estancados.values_list("intentos", flat=True)):
+        liberados += estancados.filter(
+            intentos=intentos
+        ).update(
+            estado=NominaJob.PENDIENTE,
+            worker=None,
+            disponible_en=ahora + espera_reintento(intentos),
+            updated_at=ahora
+        )
+
+    return {
+        "liberados": liberados,
+        "agotados": agotados
+    }
+
+def reintentar_jobs(jobs, user=None):
+    """
+    Regresa a pendiente los jobs en error, reiniciando sus intentos.
+    """
+    return jobs.filter(
+        estado=NominaJob.ERROR
+    ).update(
+        estado=NominaJob.PENDIENTE,
+        intentos=0,
+        disponible_en=timezone.now(),
+        terminado_en=None,
+        user_updated=user,
+        updated_at=timezone.now()
+    )
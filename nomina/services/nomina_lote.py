@@ -0,0 +1,275 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+
+from .nomina_math import (
+    AGUINALDO_DIAS,
+    VACACIONES_DIAS,
+    PRIMA_VACACIONAL,
+    DIAS_ANIO
+)
+
+# === Cuotas obreras IMSS en cienmilésimas (ver calcular_imss) ===
+CUOTA_EXCEDENTE_3UMA = 400                       # 0.40%
+CUOTA_SBC = 375 + 250 + 625 + 1125               # 0.375% + 0.25% + 0.625% + 1.125%
+CUOTA_DENOMINADOR = 100000
+
+# Límite superior usado para el renglón "en adelante" de la tarifa ISR
+SIN_LIMITE = np.iinfo(np.int64).max
+
+
+def a_centavos(valor):
+    """
+    Convierte un importe (Decimal, str o int) a centavos enteros sin pérdida.
+    """
+    centavos = Decimal(valor).scaleb(2)
+
+    if centavos != centavos.to_integral_value():
+        raise ValueError(f"Importe con más de 2 decimales: {valor}")
+
+    return int(centavos)
+
+def centavos_a_decimal(centavos):
+    """
+    Convierte centavos enteros al mismo Decimal (2 decimales) que produce
+    quantize(Decimal("0.01")) en las funciones escalares.
+    """
+    return Decimal(int(centavos)).scaleb(-2)
+
+def dividir_redondeo_bancario(numerador, denominador):
+    """
+    División entera con redondeo al par más cercano (ROUND_HALF_EVEN),
+    el mismo redondeo que usa Decimal.quantize por omisión.
+    """
+    cociente, residuo = np.divmod(numerador, denominador)
+    doble = residuo * 2
+
+    sube = (doble > denominador) | ((doble == denominador) & (cociente % 2 == 1))
+
+    return cociente + sube
+
+def fraccion_integracion(
+    aguinaldo_dias=AGUINALDO_DIAS,
+    vacaciones_dias=VACACIONES_DIAS,
+    prima_vacacional=PRIMA_VACACIONAL,
+):
+    """
+    Factor de integración del SBC como fracción exacta (numerador, denominador).
+
+        SBC = SD × (365 + Aguinaldo + Vacaciones × Prima) / 365
+    """
+    factor = (
+        Fraction(DIAS_ANIO + aguinaldo_dias + vacaciones_dias * prima_vacacional)
+        / Fraction(DIAS_ANIO)
+    )
+
+    return factor.numerator, factor.denominator
+
+
+class ResultadoLote:
+    """
+    Columnas de resultados de una nómina calculada en lote.
+
+    Todos los importes son arreglos int64 en centavos. Las filas con
+    valido=False (salario diario o periodicidad en cero) no se calcularon.
+    """
+
+    CAMPOS = (
+        "sueldos_salarios",
+        "isr_determinado",
+        "isr_retenido",
+        "subsidio_empleo_causado",
+        "subsidio_empleo_entregado",
+        "imss",
+        "neto",
+    )
+
+    def __init__(self, valido, **columnas):
+        self.valido = valido
+
+        for campo in self.CAMPOS:
+            setattr(self, campo, columnas[campo])
+
+    def __len__(self):
+        return len(self.valido)
+
+    def fila(self, i):
+        """
+        Regresa los importes de la fila i como Decimal, con los nombres de
+        campo de Recibo.
+        """
+        return {
+            campo: centavos_a_decimal(getattr(self, campo)[i])
+            for campo in self.CAMPOS
+        }
+
+
+def _calcular_isr_determinado(sueldos, periodicidad, calcular, ejercicio_fiscal):
+    isr_determinado = np.zeros(len(sueldos), dtype=np.int64)
+
+    for periodicidad_pago in np.unique(periodicidad[calcular]):
+        tarifa = ejercicio_fiscal.tarifa(int(periodicidad_pago))
+
+        renglones = tarifa.renglones
+
+        limite_inferior = np.array(
+            [a_centavos(r.limite_inferior) for r in renglones],
+            dtype=np.int64
+        )
+        limite_superior = np.array(
+            [
+                SIN_LIMITE if r.limite_superior is None else a_centavos(r.limite_superior)
+                for r in renglones
+            ],
+            dtype=np.int64
+        )
+        cuota_fija = np.array(
+            [a_centavos(r.cuota_fija) for r in renglones],
+            dtype=np.int64
+        )
+        # Porcentaje en centésimas de punto (ej. 10.88% -> 1088)
+        porcentaje = np.array(
+            [a_centavos(r.porcentaje_excedente) for r in renglones],
+            dtype=np.int64
+        )
+
+        filas = np.flatnonzero(calcular & (periodicidad == periodicidad_pago))
+        importe = sueldos[filas]
+
+        renglon = np.searchsorted(limite_inferior, importe, side="right") - 1
+
+        if (renglon < 0).any() or (importe > limite_superior[np.maximum(renglon, 0)]).any():
+            raise ValueError(f"ISR record not found")
+
+        # ISR = (Base - Límite inferior) × Porcentaje / 100 + Cuota fija
+        excedente = importe - limite_inferior[renglon]
+
+        isr_determinado[filas] = dividir_redondeo_bancario(
+            excedente * porcentaje[renglon] + cuota_fija[renglon] * 10000,
+            10000
+        )
+
+    return isr_determinado
+
+def calcular_nomina_lote(salarios_diarios, periodicidades_pago, ejercicio_fiscal, factores_integracion=None):
+    """
+    Calcula en lote los importes de nómina de muchos empleados.
+
+    Parámetros:
+        salarios_diarios: Secuencia de salarios diarios (Decimal, 2 decimales).
+        periodicidades_pago: Secuencia de días pagados por empleado (7, 15, ...).
+        ejercicio_fiscal (EjercicioFiscal): UMA y tarifas ISR del ejercicio.
+        factores_integracion: Secuencia de fracciones (numerador, denominador)
+            del SBC por empleado (ver TablaFactores); sin ella se usa el
+            factor de ley del primer año para todos.
+
+    Retorna:
+        ResultadoLote: columnas en centavos enteros.
+
+    Es la versión vectorizada de calcular_sueldos_salarios, calcular_imss,
+    calcular_subsidio_empleo_causado, calcular_isr_determinado,
+    calcular_isr_retenido y calcular_neto. Toda la aritmética se hace en
+    enteros (centavos) con redondeo bancario, por lo que los resultados son
+    idénticos a los de las funciones escalares, que siguen siendo la
+    implementación de referencia.
+    """
+
+    sd = np.fromiter(
+        (a_centavos(valor) for valor in salarios_diarios),
+        dtype=np.int64
+    )
+    periodicidad = np.fromiter(
+        (valor or 0 for valor in periodicidades_pago),
+        dtype=np.int64,
+        count=len(sd)
+    )
+
+    valido = (sd != 0) & (periodicidad != 0)
+
+    # Sueldos y salarios: SD × días pagados
+    sueldos_salarios = np.where(valido, sd * periodicidad, 0)
+
+    # --------------------------------------------------------
+    # Subsidio al empleo causado (uno por periodicidad)
+    # --------------------------------------------------------
+
+    subsidio_empleo_causado = np.zeros(len(sd), dtype=np.int64)
+
+    con_subsidio = valido & (sueldos_salarios <= a_centavos(ejercicio_fiscal.limite_max))
+
+    for periodicidad_pago in np.unique(periodicidad[con_subsidio]):
+        subsidio = ejercicio_fiscal.subsidio_empleo_causado(int(periodicidad_pago))
+
+        subsidio_empleo_causado[
+            con_subsidio & (periodicidad == periodicidad_pago)
+        ] = a_centavos(subsidio)
+
+    # --------------------------------------------------------
+    # ISR determinado (Art. 96 LISR)
+    # --------------------------------------------------------
+
+    isr_determinado = _calcular_isr_determinado(
+        sueldos_salarios, periodicidad, valido, ejercicio_fiscal
+    )
+
+    resultado = isr_determinado - subsidio_empleo_causado
+
+    isr_retenido = np.where(valido, np.maximum(resultado, 0), 0)
+    subsidio_empleo_entregado = np.where(valido, np.maximum(-resultado, 0), 0)
+
+    # --------------------------------------------------------
+    # Cuotas obrero IMSS
+    # --------------------------------------------------------
+
+    if factores_integracion is None:
+        numerador, denominador = fraccion_integracion()
+    else:
+        fracciones = np.array(factores_integracion, dtype=np.int64).reshape(-1, 2)
+
+        numerador = fracciones[:, 0]
+        denominador = fracciones[:, 1]
+
+    tope_sbc = a_centavos(ejercicio_fiscal.tope_sbc)
+
+    sbc = np.where(
+        sd * numerador > tope_sbc * denominador,
+        tope_sbc,
+        dividir_redondeo_bancario(sd * numerador, denominador)
+    )
+
+    diferencia_3uma_sbc = np.maximum(sbc - a_centavos(ejercicio_fiscal.tres_umas), 0)
+
+    imss = np.where(
+        valido,
+        dividir_redondeo_bancario(
+            (
+                CUOTA_EXCEDENTE_3UMA * diferencia_3uma_sbc
+                + CUOTA_SBC * sbc
+            ) * periodicidad,
+            CUOTA_DENOMINADOR
+        ),
+        0
+    )
+
+    # --------------------------------------------------------
+    # Neto
+    # --------------------------------------------------------
+
+    neto = (
+        sueldos_salarios
+        + subsidio_empleo_entregado
+        - isr_retenido
+        - imss
+    )
+
+    return ResultadoLote(
+        valido,
+        sueldos_salarios=sueldos_salarios,
+        isr_determinado=np.where(valido, isr_determinado, 0),
+        isr_retenido=isr_retenido,
+        subsidio_empleo_causado=subsidio_empleo_causado,
+        subsidio_empleo_entregado=subsidio_empleo_entregado,
+        imss=imss,
+        neto=neto,
+    )
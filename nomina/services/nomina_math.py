@@ -49,21 +49,63 @@ def calcular_factor_integracion(
 
     return factor_integracion
 
-def calcular_imss(salario_diario, periodicidad_pago, uma):
+def calcular_anio_servicio(fecha_ingreso, fecha):
+    """
+    Año de servicio que cursa el trabajador a la fecha indicada
+    (1 = primer año). Sin fecha de ingreso se considera el primer año.
+    """
+    if fecha_ingreso is None or fecha <= fecha_ingreso:
+        return 1
+
+    anios = fecha.year - fecha_ingreso.year
+
+    # Aún no cumple el aniversario de este año
+    if (fecha.month, fecha.day) < (fecha_ingreso.month, fecha_ingreso.day):
+        anios -= 1
+
+    return anios + 1
+
+def calcular_dias_vacaciones(anio_servicio):
+    """
+    Días de vacaciones por año de servicio (Art. 76 LFT, reforma 2023):
+
+        - Años 1 a 5: 12, 14, 16, 18 y 20 días
+        - Del año 6 en adelante: 2 días más por cada 5 años (22, 24, ...)
+    """
+    if anio_servicio <= 5:
+        return Decimal(10 + 2 * max(anio_servicio, 1))
+
+    return Decimal(22 + 2 * ((anio_servicio - 6) // 5))
+
+def aplicar_factor_integracion(salario_diario, factor_integracion):
+    """
+    SDI = SD × Factor, con el factor como fracción exacta (numerador,
+    denominador) (ver TablaFactores). Redondeado a 2 decimales.
+    """
+    numerador, denominador = factor_integracion
+
+    return (Decimal(salario_diario) * numerador / denominador).quantize(Decimal("0.01"))
+
+def calcular_imss(salario_diario, periodicidad_pago, uma, factor_integracion=None):
     """
     Calcula las cuotas obrero IMSS (trabajador) conforme a la LSS.
 
     Parámetros:
         salario_diario (Decimal): Salario diario del trabajador.
         periodicidad_pago (int): Días pagados en el periodo (ej. 15, 14, 7, 30).
-        uma: Objeto que contiene el valor vigente de la UMA.
+        uma: Objeto UMA vigente (modelo Uma o EjercicioFiscal).
+        factor_integracion: Ver calcular_salario_base_cotizacion.
 
     Retorna:
         Decimal: Total de cuotas obreras IMSS del periodo.
     """
 
     # Calcular Salario Base de Cotización (Art. 27 LSS)
-    sbc = calcular_salario_base_cotizacion(salario_diario, uma)
+    sbc = calcular_salario_base_cotizacion(
+        salario_diario,
+        uma,
+        factor_integracion=factor_integracion
+    )
 
     imss = Decimal("0.00")
 
@@ -74,7 +116,7 @@ def calcular_imss(salario_diario, periodicidad_pago, uma):
     # Prestaciones en especie
     # El trabajador paga 0.40% únicamente sobre el excedente
     # del SBC que supere 3 UMA (Art. 106 LSS)
-    diferencia_3uma_sbc = sbc - (uma.valor * 3)
+    diferencia_3uma_sbc = sbc - uma.tres_umas
 
     if diferencia_3uma_sbc > 0:
         imss += (Decimal("0.40") / 100) * diferencia_3uma_sbc * periodicidad_pago
@@ -219,6 +261,7 @@ def calcular_salario_base_cotizacion(
     aguinaldo_dias=AGUINALDO_DIAS,
     vacaciones_dias=VACACIONES_DIAS,
     prima_vacacional=PRIMA_VACACIONAL,
+    factor_integracion=None,
 ):
     """
     Calcula el Salario Base de Cotización (SBC) conforme al Art. 27 de la Ley del Seguro Social.
@@ -233,11 +276,25 @@ def calcular_salario_base_cotizacion(
         aguinaldo_dias (int): Días de aguinaldo otorgados al año.
         vacaciones_dias (int): Días de vacaciones otorgados al año.
         prima_vacacional (Decimal): Porcentaje de prima vacacional (ej. 0.25 para 25%).
+        factor_integracion: Fracción (numerador, denominador) de la
+            TablaFactores del empleado (antigüedad y perfil de prestaciones).
+            Si se indica, sustituye a aguinaldo_dias, vacaciones_dias y
+            prima_vacacional.
 
     Retorna:
         Decimal: Salario Base de Cotización redondeado a 2 decimales.
     """
 
+    if factor_integracion is not None:
+        numerador, denominador = factor_integracion
+
+        sbc = Decimal(salario_diario) * numerador / denominador
+
+        if sbc > uma.tope_sbc:
+            sbc = uma.tope_sbc
+
+        return sbc.quantize(Decimal("0.01"))
+
     # Parte proporcional diaria de aguinaldo
     # Fórmula:
     # (Días de aguinaldo × Salario diario) / 365
@@ -262,7 +319,7 @@ def calcular_salario_base_cotizacion(
         + proporcional_prima_vacacional
     )
 
-    tope_sbc = uma.valor * 25
+    tope_sbc = uma.tope_sbc
     if sbc > tope_sbc:
         sbc = tope_sbc
 
@@ -273,11 +330,25 @@ def calcular_subsidio_empleo_causado(uma, periodicidad_pago):
     Calcula el subsidio al empleo causado para un periodo específico
     según la nueva mecánica basada en porcentaje de UMA.
 
-    :param uma: objeto UMA del ejercicio (contiene valor, factor_mensual y porcentaje_uma)
+    :param uma: objeto UMA del ejercicio (modelo Uma o EjercicioFiscal)
     :param periodicidad_pago: número de días del periodo (7=semanal, 15=quincenal, etc.)
     :return: subsidio al empleo causado para el periodo
     """
 
+    # Calcular subsidio causado para el periodo
+    # (subsidio diario * número de días del periodo de pago)
+    subsidio_empleo_causado = uma.subsidio_diario * periodicidad_pago
+
+    return subsidio_empleo_causado.quantize(Decimal("0.01"))
+
+def calcular_subsidio_diario(uma):
+    """
+    Calcula el subsidio al empleo diario a partir de la UMA del ejercicio.
+
+    :param uma: objeto UMA del ejercicio (contiene valor, factor_mensual y porcentaje_uma)
+    :return: subsidio al empleo diario (sin redondear)
+    """
+
     # Convertir la UMA diaria a UMA mensual
     # (Ejemplo: UMA diaria * 30.4)
     uma_mensual = uma.valor * uma.factor_mensual
@@ -287,13 +358,20 @@ def calcular_subsidio_empleo_causado(uma, periodicidad_pago):
     subsidio_mensual = uma_mensual * (uma.porcentaje_uma / 100)
 
     # Obtener subsidio diario dividiendo entre el factor mensual (30.4)
-    subsidio_diario = subsidio_mensual / uma.factor_mensual
+    return subsidio_mensual / uma.factor_mensual
 
-    # Calcular subsidio causado para el periodo
-    # (subsidio diario * número de días del periodo de pago)
-    subsidio_empleo_causado = subsidio_diario * periodicidad_pago
+def calcular_tres_umas(uma):
+    """
+    Umbral de 3 UMA para la cuota de excedente de Enfermedades y
+    Maternidad (Art. 106 LSS).
+    """
+    return uma.valor * 3
 
-    return subsidio_empleo_causado.quantize(Decimal("0.01"))
+def calcular_tope_sbc(uma):
+    """
+    Tope del Salario Base de Cotización: 25 UMA (Art. 28 LSS).
+    """
+    return uma.valor * 25
 
 def calcular_sueldos_salarios(salario_diario, n_dias_pagados):
     """
@@ -1,15 +1,24 @@
+import hashlib
+
+from decimal import Decimal
+
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Exists, F, Max, OuterRef, Q
 from django.utils import timezone
 
 from nomina.models import (
     Empleado,
+    PerfilPrestaciones,
+    Plaza,
     Recibo,
-    IsrSemanal,
-    IsrQuincenal,
     Uma
 )
 
+from .ejercicio_fiscal import get_ejercicio_fiscal
+from .instrumentacion import MedicionNomina
+from .isr_tarifa import ISR_MODELS, get_tarifa_isr
+
 from .nomina_math import (
     calcular_isr_determinado,
     calcular_isr_retenido,
@@ -19,28 +28,27 @@ from .nomina_math import (
     calcular_subsidio_empleo_causado
 )
 
-def get_isr(ejercicio, sueldos_salarios, periodicidad_pago):
-    model = {
-        7: IsrSemanal,
-        15: IsrQuincenal
-    }.get(periodicidad_pago)
+from .nomina_lote import ResultadoLote, calcular_nomina_lote
+from .recibo_cache import cache_resultados
 
-    if not model:
-        raise ValueError(f"ISR model not found for periodicidad_pago {periodicidad_pago}")
+# Campos de Recibo que se reescriben al recalcular
+RECIBO_CAMPOS_CALCULADOS = [
+    "periodicidad_pago",
+    "sd",
+    "sdi",
+    *ResultadoLote.CAMPOS,
+    "huella",
+    "updated_at",
+]
 
-    isr = model.objects.filter(
-        ejercicio=ejercicio,
-        status=True,
-        limite_inferior__lte=sueldos_salarios
-    ).filter(
-        Q(limite_superior__gte=sueldos_salarios) |
-        Q(limite_superior__isnull=True)
-    ).order_by('limite_inferior').first()
-
-    if not isr:
-        raise ValueError(f"ISR record not found")
-    
-    return isr
+# Importes de un recibo cuyo empleado ya no tiene sd o periodicidad_pago
+RECIBO_EN_CEROS = dict.fromkeys(ResultadoLote.CAMPOS, Decimal("0.00"))
+
+# Contexto de la huella de esos recibos, que no dependen de UMA ni tarifa
+CONTEXTO_SIN_CALCULO = "sin calculo"
+
+def get_isr(ejercicio, sueldos_salarios, periodicidad_pago):
+    return get_tarifa_isr(ejercicio, periodicidad_pago).buscar(sueldos_salarios)
 
 def get_uma(ejercicio):
     uma = Uma.objects.filter(
@@ -53,65 +61,517 @@ def get_uma(ejercicio):
     
     return uma
 
-@transaction.atomic
-def process_nomina_detalle(nomina):
-    empleados = Empleado.objects.filter(
+def calcular_recibo(salario_diario, periodicidad_pago, uma, tarifa, factor_integracion=None):
+    """
+    Calcula los importes del recibo de un empleado con las funciones
+    escalares de nomina_math. Es la referencia de calcular_nomina_lote.
+
+    factor_integracion es la fracción del empleado en la TablaFactores
+    (ver calcular_salario_base_cotizacion).
+    """
+    sueldos_salarios = calcular_sueldos_salarios(salario_diario, periodicidad_pago)
+
+    percepciones_exentas = 0
+
+    subsidio_empleo_causado = 0
+
+    if sueldos_salarios <= uma.limite_max:
+        subsidio_empleo_causado = calcular_subsidio_empleo_causado(uma, periodicidad_pago)
+
+    isr = tarifa.buscar(sueldos_salarios)
+
+    isr_determinado = calcular_isr_determinado(isr, sueldos_salarios)
+
+    tmp = calcular_isr_retenido(isr_determinado, subsidio_empleo_causado)
+
+    isr_retenido = tmp.get("isr_retenido")
+
+    subsidio_empleo_entregado = tmp.get("subsidio_entregado")
+
+    imss = calcular_imss(salario_diario, periodicidad_pago, uma, factor_integracion)
+
+    neto = calcular_neto(sueldos_salarios, percepciones_exentas, subsidio_empleo_entregado, isr_retenido, imss)
+
+    return {
+        "sueldos_salarios": sueldos_salarios,
+        "isr_determinado": isr_determinado,
+        "isr_retenido": isr_retenido,
+        "subsidio_empleo_causado": subsidio_empleo_causado,
+        "subsidio_empleo_entregado": subsidio_empleo_entregado,
+        "imss": imss,
+        "neto": neto
+    }
+
+def get_chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, "NOMINA_CHUNK_SIZE", 2000)
+
+def get_empleados_nomina(nomina):
+    return Empleado.objects.filter(
         plaza=nomina.plaza,
         departamento=nomina.departamento,
         status=True
     )
 
-    ejercicio = timezone.now().year
+def iter_bloques_empleados(empleados, chunk_size, despues_de=None):
+    """
+    Recorre los empleados en bloques de chunk_size filas paginando por id
+    (keyset), de modo que sólo un bloque vive en memoria a la vez.
+
+    Cada fila es (id, sd, sdi, periodicidad_pago, fecha_ingreso,
+    perfil_prestaciones_id de la plaza).
+    """
+    empleados = empleados.order_by("id").values_list(
+        "id",
+        "sd",
+        "sdi",
+        "periodicidad_pago",
+        "fecha_ingreso",
+        "plaza__perfil_prestaciones_id"
+    )
+
+    while True:
+        if despues_de is not None:
+            bloque = list(empleados.filter(id__gt=despues_de)[:chunk_size])
+        else:
+            bloque = list(empleados[:chunk_size])
+
+        if not bloque:
+            return
+
+        yield bloque
+
+        despues_de = bloque[-1][0]
+
+def calcular_huella(salario_diario, sdi, periodicidad_pago, factor_integracion, contexto):
+    """
+    Huella de las entradas de un recibo; si no cambia, el recibo no necesita
+    recalcularse.
 
-    uma = get_uma(ejercicio)
+    factor_integracion es la fracción (numerador, denominador) del SBC y
+    contexto identifica la UMA y la tarifa ISR (EjercicioFiscal.contexto).
+    """
+    numerador, denominador = factor_integracion
 
-    recibos = []
+    return hashlib.sha1(
+        f"{salario_diario}|{sdi}|{periodicidad_pago}|{numerador}/{denominador}|{contexto}".encode()
+    ).hexdigest()
 
-    for empleado in empleados:
-        salario_diario = empleado.sd
-        periodicidad_pago = empleado.periodicidad_pago
+def calcular_bloque(bloque, ejercicio_fiscal, fecha):
+    """
+    Calcula en lote un bloque de filas (id, sd, sdi, periodicidad_pago,
+    fecha_ingreso, perfil_prestaciones_id).
 
-        if salario_diario == 0 or periodicidad_pago == 0:
+    El factor de integración del SBC de cada fila se toma de la
+    TablaFactores del ejercicio con la antigüedad a la fecha de la nómina.
+
+    Regresa (fila, importes) sólo para las filas calculables; importes
+    incluye la huella de entradas del recibo.
+
+    Los importes se buscan primero en cache_resultados por (sd,
+    periodicidad_pago, factor, contexto); sólo los faltantes se calculan.
+    """
+    calculados = []
+
+    # clave -> índices en calculados que esperan el mismo cálculo
+    faltantes = {}
+
+    for fila in bloque:
+        _, salario_diario, sdi, periodicidad_pago, fecha_ingreso, perfil_id = fila
+
+        if not salario_diario or not periodicidad_pago:
             continue
 
-        sueldos_salarios = calcular_sueldos_salarios(salario_diario, periodicidad_pago)
+        factor = ejercicio_fiscal.factores.fraccion_empleado(fecha_ingreso, perfil_id, fecha)
+        contexto = ejercicio_fiscal.contexto(periodicidad_pago)
+        clave = (salario_diario, periodicidad_pago, factor, contexto)
+
+        if clave in faltantes:
+            importes = None
+            faltantes[clave].append(len(calculados))
+            cache_resultados.registrar_hit()
+        else:
+            importes = cache_resultados.get(clave)
+
+            if importes is None:
+                faltantes[clave] = [len(calculados)]
+
+        calculados.append([fila, importes, clave])
+
+    if faltantes:
+        claves = list(faltantes)
+
+        resultado = calcular_nomina_lote(
+            [clave[0] for clave in claves],
+            [clave[1] for clave in claves],
+            ejercicio_fiscal,
+            [clave[2] for clave in claves]
+        )
+
+        for j, clave in enumerate(claves):
+            importes = resultado.fila(j)
+
+            cache_resultados.set(clave, importes)
+
+            for i in faltantes[clave]:
+                calculados[i][1] = dict(importes)
+
+    for calculado in calculados:
+        fila, importes, (_, _, factor, contexto) = calculado
+
+        importes["huella"] = calcular_huella(fila[1], fila[2], fila[3], factor, contexto)
+
+    return [(fila, importes) for fila, importes, _ in calculados]
+
+def generar_recibos(nomina, bloque, ejercicio_fiscal):
+    """
+    Calcula en lote los recibos de un bloque de empleados.
+    """
+    return [
+        Recibo(
+            nomina=nomina,
+            empleado_id=empleado_id,
+            periodicidad_pago=periodicidad_pago,
+            sd=salario_diario,
+            sdi=sdi,
+            **importes
+        )
+        for (empleado_id, salario_diario, sdi, periodicidad_pago, *_), importes
+        in calcular_bloque(bloque, ejercicio_fiscal, nomina.fecha)
+    ]
+
+@transaction.atomic
+def process_nomina_detalle(nomina, chunk_size=None, perfilar=False):
+    """
+    Genera los recibos de la nómina en una sola transacción.
+
+    Los empleados se leen y los recibos se escriben por bloques, por lo que
+    la memoria no crece con la plantilla.
+
+    La corrida queda medida en un NominaRunStats (ver MedicionNomina); con
+    perfilar=True además se guarda un volcado de cProfile.
+    """
+    chunk_size = get_chunk_size(chunk_size)
+
+    ejercicio = nomina.fecha.year
+
+    with MedicionNomina(nomina, "generar", perfilar) as medicion:
+        with medicion.etapa("tablas"):
+            ejercicio_fiscal = get_ejercicio_fiscal(ejercicio)
+
+        bloques = medicion.iterar(
+            "empleados",
+            iter_bloques_empleados(get_empleados_nomina(nomina), chunk_size)
+        )
+
+        for bloque in bloques:
+            medicion.empleados_leidos += len(bloque)
+
+            with medicion.etapa("calculo"):
+                recibos = generar_recibos(nomina, bloque, ejercicio_fiscal)
+
+            with medicion.etapa("escritura"):
+                Recibo.objects.bulk_create(recibos, batch_size=chunk_size, ignore_conflicts=True)
 
-        percepciones_exentas = 0
+            medicion.recibos_escritos += len(recibos)
 
-        subsidio_empleo_causado = 0
+def process_nomina_detalle_streaming(nomina, chunk_size=None, progreso=None, rango=None, perfilar=False):
+    """
+    Genera los recibos de la nómina confirmando una transacción por bloque.
 
-        if sueldos_salarios <= uma.limite_max:
-            subsidio_empleo_causado = calcular_subsidio_empleo_causado(uma, periodicidad_pago)
+    Si una corrida anterior se interrumpió, continúa después del último
+    empleado con recibo en la nómina.
 
-        isr = get_isr(ejercicio, sueldos_salarios, periodicidad_pago)
+    progreso, si se indica, se llama con el número de empleados de cada
+    bloque ya confirmado.
 
-        isr_determinado = calcular_isr_determinado(isr, sueldos_salarios)
+    rango, si se indica, es una tupla (id_desde, id_hasta) que limita la
+    corrida a un shard de empleados; los shards de una misma nómina pueden
+    procesarse en paralelo.
 
-        tmp = calcular_isr_retenido(isr_determinado, subsidio_empleo_causado)
+    perfilar se comporta igual que en process_nomina_detalle.
+    """
+    chunk_size = get_chunk_size(chunk_size)
 
-        isr_retenido = tmp.get("isr_retenido")
+    ejercicio = nomina.fecha.year
 
-        subsidio_empleo_entregado = tmp.get("subsidio_entregado")
+    with MedicionNomina(nomina, "streaming", perfilar, rango) as medicion:
+        with medicion.etapa("tablas"):
+            ejercicio_fiscal = get_ejercicio_fiscal(ejercicio)
 
-        imss = calcular_imss(salario_diario, periodicidad_pago, uma)
+        _generar_streaming(nomina, chunk_size, progreso, rango, ejercicio_fiscal, medicion)
 
-        neto = calcular_neto(sueldos_salarios, percepciones_exentas, subsidio_empleo_entregado, isr_retenido, imss)
+def _generar_streaming(nomina, chunk_size, progreso, rango, ejercicio_fiscal, medicion):
+    empleados = get_empleados_nomina(nomina)
+    recibos_previos = Recibo.objects.filter(nomina=nomina)
 
-        recibos.append(
-            Recibo(
-                nomina=nomina,
-                empleado=empleado,
-                periodicidad_pago=periodicidad_pago,
-                sd=salario_diario,
-                sdi=empleado.sdi,
-                sueldos_salarios=sueldos_salarios,
-                isr_determinado=isr_determinado,
-                isr_retenido=isr_retenido,
-                subsidio_empleo_causado=subsidio_empleo_causado,
-                subsidio_empleo_entregado=subsidio_empleo_entregado,
-                imss=imss,
-                neto=neto
-            )
+    if rango:
+        empleados = empleados.filter(id__range=rango)
+        recibos_previos = recibos_previos.filter(
+            empleado_id__gte=rango[0],
+            empleado_id__lte=rango[1]
         )
 
-    Recibo.objects.bulk_create(recibos)
+    with medicion.etapa("reanudacion"):
+        ultimo_empleado_id = recibos_previos.aggregate(
+            ultimo=Max("empleado_id")
+        )["ultimo"]
+
+    bloques = medicion.iterar(
+        "empleados",
+        iter_bloques_empleados(
+            empleados,
+            chunk_size,
+            despues_de=ultimo_empleado_id
+        )
+    )
+
+    for bloque in bloques:
+        medicion.empleados_leidos += len(bloque)
+
+        with medicion.etapa("calculo"):
+            recibos = generar_recibos(nomina, bloque, ejercicio_fiscal)
+
+        # Si otra corrida del mismo rango ya escribió el recibo de un
+        # empleado, la restricción única lo conserva y éste se descarta
+        with medicion.etapa("escritura"), transaction.atomic():
+            Recibo.objects.bulk_create(recibos, batch_size=chunk_size, ignore_conflicts=True)
+
+        medicion.recibos_escritos += len(recibos)
+
+        if progreso:
+            progreso(len(bloque))
+
+def recalcular_nomina(nomina, chunk_size=None, progreso=None, perfilar=False):
+    """
+    Recalcula sólo los recibos de la nómina cuyas entradas cambiaron y
+    ajusta la nómina a su plantilla actual.
+
+    Los candidatos se eligen en SQL (ver recibos_por_revisar); de ellos,
+    sólo los que tienen una huella distinta a la de los datos actuales del
+    empleado (sd, sdi, periodicidad_pago, factor de integración), la UMA y
+    la tarifa ISR se calculan y se actualizan con bulk_update. Los recibos
+    de empleados que ya no tienen sd o periodicidad_pago quedan con
+    importes en cero.
+
+    Los empleados que entraron a la plaza y departamento de la nómina
+    después de generarla reciben su recibo, y se borran los recibos de los
+    que salieron o se dieron de baja.
+
+    Regresa un dict con el número de recibos revisados, recalculados,
+    creados y eliminados.
+    """
+    chunk_size = get_chunk_size(chunk_size)
+
+    ejercicio = nomina.fecha.year
+
+    with MedicionNomina(nomina, "recalcular", perfilar) as medicion:
+        with medicion.etapa("tablas"):
+            ejercicio_fiscal = get_ejercicio_fiscal(ejercicio)
+
+        eliminados, creados = _ajustar_plantilla(nomina, chunk_size, ejercicio_fiscal, medicion)
+
+        return {
+            **_recalcular(nomina, chunk_size, progreso, ejercicio_fiscal, medicion),
+            "creados": creados,
+            "eliminados": eliminados,
+        }
+
+def _ajustar_plantilla(nomina, chunk_size, ejercicio_fiscal, medicion):
+    empleados = get_empleados_nomina(nomina)
+
+    with medicion.etapa("escritura"):
+        eliminados, _ = Recibo.objects.filter(
+            nomina=nomina
+        ).exclude(
+            empleado_id__in=empleados.values("id")
+        ).delete()
+
+    nuevos = empleados.filter(
+        ~Exists(Recibo.objects.filter(nomina=nomina, empleado=OuterRef("pk")))
+    )
+
+    creados = 0
+
+    for bloque in medicion.iterar("empleados", iter_bloques_empleados(nuevos, chunk_size)):
+        medicion.empleados_leidos += len(bloque)
+
+        with medicion.etapa("calculo"):
+            recibos = generar_recibos(nomina, bloque, ejercicio_fiscal)
+
+        with medicion.etapa("escritura"), transaction.atomic():
+            Recibo.objects.bulk_create(recibos, batch_size=chunk_size, ignore_conflicts=True)
+
+        creados += len(recibos)
+        medicion.recibos_escritos += len(recibos)
+
+    return eliminados, creados
+
+def get_ultima_modificacion_tablas(nomina):
+    """
+    Última modificación de lo que entra a la huella sin estar en el
+    empleado: la UMA y las tarifas ISR del ejercicio, los perfiles de
+    prestaciones y la plaza de la nómina.
+    """
+    ejercicio = nomina.fecha.year
+
+    fechas = [
+        queryset.aggregate(ultima=Max("updated_at"))["ultima"]
+        for queryset in [
+            Uma.objects.filter(ejercicio=ejercicio),
+            *(model.objects.filter(ejercicio=ejercicio) for model in ISR_MODELS.values()),
+            PerfilPrestaciones.objects.all(),
+            Plaza.objects.filter(id=nomina.plaza_id),
+        ]
+    ]
+
+    return max((fecha for fecha in fechas if fecha), default=None)
+
+def recibos_por_revisar(nomina):
+    """
+    Recibos de la nómina cuya huella puede haber cambiado: su empleado se
+    modificó después del recibo, sus sd, sdi o periodicidad_pago ya no son
+    los del empleado (cubre UPDATE directos que no tocan updated_at), o las
+    tablas del ejercicio cambiaron después del recibo.
+    """
+    por_revisar = (
+        Q(empleado__updated_at__gt=F("updated_at"))
+        | ~Q(sd=F("empleado__sd"))
+        | ~Q(sdi=F("empleado__sdi"))
+        | ~Q(periodicidad_pago=F("empleado__periodicidad_pago"))
+        | Q(periodicidad_pago__isnull=True, empleado__periodicidad_pago__isnull=False)
+        | Q(periodicidad_pago__isnull=False, empleado__periodicidad_pago__isnull=True)
+    )
+
+    tablas = get_ultima_modificacion_tablas(nomina)
+
+    if tablas:
+        por_revisar |= Q(updated_at__lt=tablas)
+
+    return Recibo.objects.filter(nomina=nomina).filter(por_revisar)
+
+def _recalcular(nomina, chunk_size, progreso, ejercicio_fiscal, medicion):
+    recibos = recibos_por_revisar(nomina).order_by("id").values_list(
+        "id",
+        "huella",
+        "empleado__sd",
+        "empleado__sdi",
+        "empleado__periodicidad_pago",
+        "empleado__fecha_ingreso",
+        "empleado__plaza__perfil_prestaciones_id"
+    )
+
+    revisados = 0
+    recalculados = 0
+    despues_de = 0
+
+    while True:
+        # Antes de leer: un empleado modificado mientras se calcula el
+        # bloque queda con updated_at posterior al del recibo
+        ahora = timezone.now()
+
+        with medicion.etapa("recibos"):
+            bloque = list(recibos.filter(id__gt=despues_de)[:chunk_size])
+
+        if not bloque:
+            break
+
+        despues_de = bloque[-1][0]
+        revisados += len(bloque)
+        medicion.empleados_leidos += len(bloque)
+
+        with medicion.etapa("calculo"):
+            cambiados = []
+            actualizados = []
+            vigentes = []
+
+            for recibo_id, huella, *fila in bloque:
+                salario_diario, sdi, periodicidad_pago, fecha_ingreso, perfil_id = fila
+
+                if not salario_diario or not periodicidad_pago:
+                    # calcular_bloque omite estas filas: el recibo se deja en ceros
+                    huella_actual = calcular_huella(
+                        salario_diario, sdi, periodicidad_pago, (0, 1), CONTEXTO_SIN_CALCULO
+                    )
+
+                    if huella == huella_actual:
+                        vigentes.append(recibo_id)
+                    else:
+                        actualizados.append(Recibo(
+                            id=recibo_id,
+                            periodicidad_pago=periodicidad_pago,
+                            sd=salario_diario or Decimal("0.00"),
+                            sdi=sdi or Decimal("0.00"),
+                            updated_at=ahora,
+                            huella=huella_actual,
+                            **RECIBO_EN_CEROS
+                        ))
+
+                    continue
+
+                factor = ejercicio_fiscal.factores.fraccion_empleado(
+                    fecha_ingreso,
+                    perfil_id,
+                    nomina.fecha
+                )
+                contexto = ejercicio_fiscal.contexto(periodicidad_pago)
+
+                if huella == calcular_huella(salario_diario, sdi, periodicidad_pago, factor, contexto):
+                    vigentes.append(recibo_id)
+                    continue
+
+                cambiados.append((recibo_id, *fila))
+
+            actualizados += [
+                Recibo(
+                    id=recibo_id,
+                    periodicidad_pago=periodicidad_pago,
+                    sd=salario_diario,
+                    sdi=sdi,
+                    updated_at=ahora,
+                    **importes
+                )
+                for (recibo_id, salario_diario, sdi, periodicidad_pago, *_), importes
+                in calcular_bloque(cambiados, ejercicio_fiscal, nomina.fecha)
+            ]
+
+        if actualizados or vigentes:
+            with medicion.etapa("escritura"), transaction.atomic():
+                Recibo.objects.bulk_update(
+                    actualizados,
+                    RECIBO_CAMPOS_CALCULADOS,
+                    batch_size=chunk_size
+                )
+
+                # Los que no cambiaron dejan de ser candidatos
+                Recibo.objects.filter(id__in=vigentes).update(updated_at=ahora)
+
+        recalculados += len(actualizados)
+        medicion.recibos_escritos += len(actualizados)
+
+        if progreso:
+            progreso(len(bloque))
+
+    return {
+        "revisados": revisados,
+        "recalculados": recalculados
+    }
+
+def dividir_en_shards(nomina, shards):
+    """
+    Divide los empleados de la nómina en hasta `shards` rangos de id
+    (id_desde, id_hasta) con aproximadamente el mismo número de empleados.
+    """
+    ids = list(
+        get_empleados_nomina(nomina).order_by("id").values_list("id", flat=True)
+    )
+
+    if not ids:
+        return []
+
+    shards = max(1, min(shards, len(ids)))
+    tamano = -(-len(ids) // shards)
+
+    return [
+        (ids[i], ids[min(i + tamano, len(ids)) - 1])
+        for i in range(0, len(ids), tamano)
+    ]
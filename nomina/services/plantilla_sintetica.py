@@ -0,0 +1,179 @@
+import random
+import string
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from nomina.models import (
+    Departamento,
+    Empleado,
+    IsrQuincenal,
+    IsrSemanal,
+    Plaza,
+    Uma
+)
+
+from .nomina_math import calcular_factor_integracion
+
+# === Tarifas Art. 96 LISR (Anexo 8 RMF), vigentes en 2024 y 2025 ===
+# (limite_inferior, limite_superior, cuota_fija, porcentaje_excedente)
+TARIFA_SEMANAL = [
+    ("0.01", "171.78", "0.00", "1.92"),
+    ("171.79", "1458.03", "3.29", "6.40"),
+    ("1458.04", "2562.35", "85.61", "10.88"),
+    ("2562.36", "2978.64", "205.80", "16.00"),
+    ("2978.65", "3566.22", "272.37", "17.92"),
+    ("3566.23", "7192.64", "377.65", "21.36"),
+    ("7192.65", "11336.57", "1152.27", "23.52"),
+    ("11336.58", "21643.30", "2126.95", "30.00"),
+    ("21643.31", "28857.78", "5218.92", "32.00"),
+    ("28857.79", "86573.34", "7527.59", "34.00"),
+    ("86573.35", None, "27150.83", "35.00"),
+]
+
+TARIFA_QUINCENAL = [
+    ("0.01", "368.10", "0.00", "1.92"),
+    ("368.11", "3124.35", "7.05", "6.40"),
+    ("3124.36", "5490.75", "183.45", "10.88"),
+    ("5490.76", "6382.80", "441.00", "16.00"),
+    ("6382.81", "7641.90", "583.65", "17.92"),
+    ("7641.91", "15412.80", "809.25", "21.36"),
+    ("15412.81", "24292.65", "2469.15", "23.52"),
+    ("24292.66", "46378.50", "4557.75", "30.00"),
+    ("46378.51", "61838.10", "11183.40", "32.00"),
+    ("61838.11", "185514.30", "16130.55", "34.00"),
+    ("185514.31", None, "58180.35", "35.00"),
+]
+
+# === UMA y subsidio al empleo por ejercicio ===
+# (valor diario, límite de ingresos mensual, porcentaje de UMA mensual)
+UMAS = {
+    2024: ("108.57", "9081.00", "11.82"),
+    2025: ("113.14", "10171.00", "13.80"),
+}
+
+FACTOR_MENSUAL = Decimal("30.40")
+
+SALARIO_MINIMO = Decimal("278.80")
+SALARIO_MAXIMO = Decimal("5000.00")
+
+
+def generar_tablas_fiscales(ejercicios=(2024, 2025), tablas_de=None):
+    """
+    Crea las tarifas ISR semanal/quincenal y la UMA de cada ejercicio que
+    aún no las tenga.
+
+    Para ejercicios sin valores conocidos se usan los de `tablas_de`
+    (por omisión, el último ejercicio conocido).
+    """
+    tablas_de = tablas_de or max(UMAS)
+
+    for ejercicio in ejercicios:
+        for model, tarifa in ((IsrSemanal, TARIFA_SEMANAL), (IsrQuincenal, TARIFA_QUINCENAL)):
+            if model.objects.filter(ejercicio=ejercicio, status=True).exists():
+                continue
+
+            model.objects.bulk_create([
+                model(
+                    ejercicio=ejercicio,
+                    limite_inferior=Decimal(inferior),
+                    limite_superior=Decimal(superior) if superior else None,
+                    cuota_fija=Decimal(cuota),
+                    porcentaje_excedente=Decimal(porcentaje)
+                )
+                for inferior, superior, cuota, porcentaje in tarifa
+            ])
+
+        if not Uma.objects.filter(ejercicio=ejercicio, status=True).exists():
+            valor, limite_max, porcentaje = UMAS.get(ejercicio, UMAS[tablas_de])
+
+            Uma.objects.create(
+                ejercicio=ejercicio,
+                valor=Decimal(valor),
+                limite_max=Decimal(limite_max),
+                porcentaje_uma=Decimal(porcentaje),
+                factor_mensual=FACTOR_MENSUAL
+            )
+
+def _generar_rfc(rnd, usados):
+    while True:
+        nacimiento = date(1960, 1, 1) + timedelta(days=rnd.randrange(16000))
+
+        rfc = (
+            "".join(rnd.choices(string.ascii_uppercase, k=4))
+            + nacimiento.strftime("%y%m%d")
+            + "".join(rnd.choices(string.ascii_uppercase + string.digits, k=3))
+        )
+
+        if rfc not in usados:
+            usados.add(rfc)
+            return rfc
+
+def _generar_salario(rnd, tabulador):
+    # 60% salario tabulado de la plaza, 40% salario individual (log-normal)
+    if rnd.random() < 0.6:
+        return rnd.choice(tabulador)
+
+    salario = Decimal(str(round(rnd.lognormvariate(5.9, 0.55), 2)))
+
+    return min(max(salario, SALARIO_MINIMO), SALARIO_MAXIMO)
+
+def generar_plantilla(empleados, plazas=1, departamentos=1, semilla=0, prefijo="SINT", batch_size=5000):
+    """
+    Crea una plantilla sintética de `empleados` repartidos entre `plazas` x
+    `departamentos`, con salarios realistas (tabulados y log-normales) y
+    periodicidad 70% quincenal / 30% semanal.
+
+    La generación es reproducible para la misma semilla. Regresa las listas
+    (plazas, departamentos) creadas.
+    """
+    rnd = random.Random(semilla)
+
+    plazas = [
+        Plaza.objects.create(descripcion=f"{prefijo}-{semilla}-PLAZA-{i + 1}")
+        for i in range(plazas)
+    ]
+    departamentos = [
+        Departamento.objects.create(descripcion=f"{prefijo}-{semilla}-DEPTO-{i + 1}")
+        for i in range(departamentos)
+    ]
+
+    tabuladores = {
+        plaza.id: [
+            Decimal(str(round(rnd.uniform(float(SALARIO_MINIMO), 900), 2)))
+            for _ in range(8)
+        ]
+        for plaza in plazas
+    }
+
+    factor = calcular_factor_integracion()
+
+    # El RFC es único: evita los que ya existen (p. ej. otra plantilla con la misma semilla)
+    usados = set(Empleado.objects.exclude(rfc=None).values_list("rfc", flat=True))
+    lote = []
+
+    for i in range(empleados):
+        plaza = plazas[i % len(plazas)]
+        departamento = departamentos[(i // len(plazas)) % len(departamentos)]
+
+        sd = _generar_salario(rnd, tabuladores[plaza.id])
+
+        lote.append(
+            Empleado(
+                plaza=plaza,
+                departamento=departamento,
+                rfc=_generar_rfc(rnd, usados),
+                nombre_completo=f"Empleado sintético {i + 1}",
+                sd=sd,
+                sdi=(sd * factor).quantize(Decimal("0.01")),
+                periodicidad_pago=15 if rnd.random() < 0.7 else 7
+            )
+        )
+
+        if len(lote) >= batch_size:
+            Empleado.objects.bulk_create(lote)
+            lote = []
+
+    Empleado.objects.bulk_create(lote)
+
+    return plazas, departamentos
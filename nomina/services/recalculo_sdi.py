@@ -0,0 +1,108 @@
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from nomina.models import Empleado
+
+from .factor_integracion import get_tabla_factores
+
+def _actualizar_values(bloque, ahora, user):
+    """
+    Un solo UPDATE ... FROM (VALUES ...) por bloque. Las columnas de VALUES
+    se llaman column1, column2 tanto en PostgreSQL como en SQLite.
+    """
+    asignaciones = "sdi = v.column2, updated_at = %s"
+    params = [ahora]
+
+    if user:
+        asignaciones += ", user_updated_id = %s"
+        params.append(user)
+
+    valores = ", ".join(["(%s, %s)"] * len(bloque))
+
+    for empleado_id, sdi in bloque:
+        params += [empleado_id, sdi]
+
+    tabla = Empleado._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {tabla} SET {asignaciones} "
+            f"FROM (VALUES {valores}) AS v "
+            f"WHERE {tabla}.id = v.column1",
+            params
+        )
+
+def _actualizar(bloque, ahora, user):
+    with transaction.atomic():
+        if connection.vendor in ("postgresql", "sqlite"):
+            return _actualizar_values(bloque, ahora, user)
+
+        # bulk_update arma un CASE WHEN por fila; sólo como respaldo
+        Empleado.objects.bulk_update(
+            [
+                Empleado(
+                    id=empleado_id,
+                    sdi=sdi,
+                    updated_at=ahora,
+                    user_updated_id=user
+                )
+                for empleado_id, sdi in bloque
+            ],
+            ["sdi", "updated_at"] + (["user_updated_id"] if user else []),
+            batch_size=len(bloque)
+        )
+
+def recalcular_sdi(empleados=None, fecha=None, batch_size=2000, user=None):
+    """
+    Recalcula el SDI de los empleados (todos si no se indica un queryset)
+    con el perfil de prestaciones de su plaza y su antigüedad a la fecha.
+
+    Se usa cuando cambia un perfil de prestaciones o al pasar aniversarios.
+    Los empleados se leen por bloques con values_list() y sólo se escriben
+    los que cambian de SDI, con un UPDATE por bloque.
+
+    Regresa {"revisados", "actualizados", "segundos"}.
+    """
+    inicio = time.monotonic()
+
+    if empleados is None:
+        empleados = Empleado.objects.all()
+
+    fecha = fecha or timezone.localdate()
+    factores = get_tabla_factores()
+    ahora = timezone.now()
+
+    revisados = 0
+    actualizados = 0
+    bloque = []
+
+    filas = empleados.order_by("id").values_list(
+        "id", "sd", "sdi", "fecha_ingreso", "plaza__perfil_prestaciones_id"
+    ).iterator(chunk_size=batch_size)
+
+    for empleado_id, sd, sdi, fecha_ingreso, perfil_id in filas:
+        revisados += 1
+
+        nuevo_sdi = factores.sdi(sd, fecha_ingreso, perfil_id, fecha)
+
+        if nuevo_sdi == sdi:
+            continue
+
+        bloque.append((empleado_id, nuevo_sdi))
+
+        if len(bloque) >= batch_size:
+            _actualizar(bloque, ahora, user)
+            actualizados += len(bloque)
+            bloque = []
+
+    if bloque:
+        _actualizar(bloque, ahora, user)
+        actualizados += len(bloque)
+
+    return {
+        "revisados": revisados,
+        "actualizados": actualizados,
+        "segundos": round(time.monotonic() - inicio, 3),
+    }
@@ -0,0 +1,80 @@
+import threading
+
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class CacheResultados:
+    """
+    Cache LRU de importes de recibo calculados.
+
+    La clave identifica todas las entradas del cálculo (salario diario,
+    periodicidad, UMA, ejercicio y versión de la tarifa ISR), por lo que los
+    empleados con el mismo salario tabulado comparten un solo cálculo.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            valor = self._datos.get(clave)
+
+            if valor is None:
+                self.misses += 1
+                return None
+
+            self._datos.move_to_end(clave)
+            self.hits += 1
+
+        return dict(valor)
+
+    def registrar_hit(self):
+        """
+        Cuenta como hit un resultado reutilizado sin pasar por get (p. ej.
+        claves repetidas dentro del mismo bloque).
+        """
+        with self._lock:
+            self.hits += 1
+
+    def set(self, clave, valor):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._datos[clave] = dict(valor)
+            self._datos.move_to_end(clave)
+
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def estadisticas(self):
+        total = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._datos),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._datos)
+
+
+cache_resultados = CacheResultados(
+    getattr(settings, "NOMINA_CACHE_RESULTADOS", 10000)
+)
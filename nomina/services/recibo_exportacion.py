@@ -0,0 +1,127 @@
+import csv
+import io
+
+from openpyxl import Workbook
+
+# (encabezado, columna) de cada columna exportada; los datos del empleado,
+# la plaza y el departamento se obtienen con JOIN en la misma consulta.
+COLUMNAS = [
+    ("Recibo", "id"),
+    ("Nómina", "nomina_id"),
+    ("Fecha", "nomina__fecha"),
+    ("Fecha de pago", "nomina__fecha_pago"),
+    ("Plaza", "nomina__plaza__descripcion"),
+    ("Departamento", "nomina__departamento__descripcion"),
+    ("RFC", "empleado__rfc"),
+    ("Nombre", "empleado__nombre_completo"),
+    ("Periodicidad", "periodicidad_pago"),
+    ("SD", "sd"),
+    ("SDI", "sdi"),
+    ("Sueldos y salarios", "sueldos_salarios"),
+    ("ISR determinado", "isr_determinado"),
+    ("ISR retenido", "isr_retenido"),
+    ("Subsidio causado", "subsidio_empleo_causado"),
+    ("Subsidio entregado", "subsidio_empleo_entregado"),
+    ("IMSS", "imss"),
+    ("Neto", "neto"),
+]
+
+FORMATOS = ("csv", "xlsx")
+
+# Marca UTF-8 para que Excel abra el CSV con acentos correctos
+BOM = "\ufeff"
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Inicios con los que Excel y LibreOffice toman un texto como fórmula
+PREFIJOS_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escapar_formula(valor):
+    """
+    Antepone ' a los textos que una hoja de cálculo evaluaría como fórmula
+    (p. ej. un nombre "=HYPERLINK(...)"); los números no se tocan.
+    """
+    if isinstance(valor, str) and valor.startswith(PREFIJOS_FORMULA):
+        return "'" + valor
+
+    return valor
+
+def iter_filas(recibos, chunk_size=2000):
+    """
+    Recorre los recibos como tuplas en el orden de COLUMNAS, con los textos
+    escapados con escapar_formula.
+
+    iterator() usa un cursor del lado del servidor (PostgreSQL), por lo que
+    sólo chunk_size filas viven en memoria a la vez.
+    """
+    filas = recibos.order_by("id").values_list(
+        *(columna for _, columna in COLUMNAS)
+    ).iterator(chunk_size=chunk_size)
+
+    for fila in filas:
+        yield tuple(escapar_formula(valor) for valor in fila)
+
+def iter_csv(recibos, chunk_size=2000):
+    """
+    Genera el CSV de los recibos por bloques de chunk_size filas, para un
+    StreamingHttpResponse o para escribirse a un archivo.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write(BOM)
+    writer.writerow([encabezado for encabezado, _ in COLUMNAS])
+
+    for i, fila in enumerate(iter_filas(recibos, chunk_size), 1):
+        writer.writerow(fila)
+
+        if i % chunk_size == 0:
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+def escribir_csv(recibos, destino, chunk_size=2000):
+    """
+    Escribe el CSV en el archivo de texto destino. Regresa el número de
+    recibos exportados.
+    """
+    writer = csv.writer(destino)
+
+    destino.write(BOM)
+    writer.writerow([encabezado for encabezado, _ in COLUMNAS])
+
+    total = 0
+
+    for fila in iter_filas(recibos, chunk_size):
+        writer.writerow(fila)
+        total += 1
+
+    return total
+
+def escribir_xlsx(recibos, destino, chunk_size=2000):
+    """
+    Escribe el XLSX en destino (ruta o archivo binario) con un workbook
+    write-only de openpyxl, que vuelca las filas a disco conforme se
+    agregan. Regresa el número de recibos exportados.
+    """
+    workbook = Workbook(write_only=True)
+    hoja = workbook.create_sheet("Recibos")
+
+    hoja.append([encabezado for encabezado, _ in COLUMNAS])
+
+    total = 0
+
+    for fila in iter_filas(recibos, chunk_size):
+        hoja.append(fila)
+        total += 1
+
+    workbook.save(destino)
+
+    return total
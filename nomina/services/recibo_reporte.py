@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+
+from rest_framework.exceptions import ValidationError
+
+from nomina.models import Recibo
+
+# Importes que se suman en los totales
+CAMPOS_TOTALES = [
+    "sueldos_salarios",
+    "isr_retenido",
+    "imss",
+    "neto",
+]
+
+# agrupar_por -> columna
+AGRUPACIONES = {
+    "nomina": "nomina_id",
+    "plaza": "nomina__plaza_id",
+    "departamento": "nomina__departamento_id",
+    "fecha": "nomina__fecha",
+}
+
+CENTAVOS = Decimal("0.01")
+
+
+def _entero(params, nombre):
+    valor = params.get(nombre)
+
+    if valor in (None, ""):
+        return None
+
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValidationError({nombre: ["A valid integer is required."]})
+
+def _fecha(params, nombre):
+    valor = params.get(nombre)
+
+    if valor in (None, ""):
+        return None
+
+    try:
+        fecha = parse_date(valor)
+    except ValueError:
+        fecha = None
+
+    if fecha is None:
+        raise ValidationError({nombre: ["Invalid date, use YYYY-MM-DD."]})
+
+    return fecha
+
+def filtrar_recibos(recibos, params):
+    """
+    Filtra los recibos por los parámetros nomina, plaza, departamento,
+    empleado y rango de fecha de la nómina (desde / hasta, AAAA-MM-DD).
+    """
+    filtros = {
+        "nomina_id": _entero(params, "nomina"),
+        "nomina__plaza_id": _entero(params, "plaza"),
+        "nomina__departamento_id": _entero(params, "departamento"),
+        "empleado_id": _entero(params, "empleado"),
+        "nomina__fecha__gte": _fecha(params, "desde"),
+        "nomina__fecha__lte": _fecha(params, "hasta"),
+    }
+
+    return recibos.filter(**{
+        campo: valor for campo, valor in filtros.items() if valor is not None
+    })
+
+def _agregados():
+    agregados = {
+        campo: Coalesce(
+            Sum(campo),
+            Value(Decimal("0.00")),
+            output_field=DecimalField(max_digits=18, decimal_places=2)
+        )
+        for campo in CAMPOS_TOTALES
+    }
+
+    agregados["recibos"] = Count("id")
+    agregados["empleados"] = Count("empleado_id", distinct=True)
+
+    return agregados
+
+def _formatear(fila):
+    # Importes como texto con dos decimales, igual que los DecimalField del serializer
+    return {
+        campo: str(valor.quantize(CENTAVOS)) if isinstance(valor, Decimal) else valor
+        for campo, valor in fila.items()
+    }
+
+def calcular_totales(recibos, agrupar_por=None):
+    """
+    Totales de los recibos calculados en SQL: suma de CAMPOS_TOTALES,
+    número de recibos y de empleados distintos.
+
+    Con agrupar_por (lista de claves de AGRUPACIONES) regresa una fila por
+    grupo; sin él, un solo dict con los totales generales.
+    """
+    recibos = recibos.order_by()
+
+    if not agrupar_por:
+        return _formatear(recibos.aggregate(**_agregados()))
+
+    invalidas = [clave for clave in agrupar_por if clave not in AGRUPACIONES]
+
+    if invalidas:
+        raise ValidationError({
+            "agrupar_por": [f"Invalid grouping: {clave}" for clave in invalidas]
+        })
+
+    columnas = [AGRUPACIONES[clave] for clave in agrupar_por]
+
+    filas = recibos.values(*columnas).annotate(**_agregados()).order_by(*columnas)
+
+    return [
+        {
+            **{clave: fila.pop(columna) for clave, columna in zip(agrupar_por, columnas)},
+            **_formatear(fila),
+        }
+        for fila in filas
+    ]
+
+def get_recibos_reporte():
+    return Recibo.objects.filter(status=True)
@@ -1,3 +1,24 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from .models import IsrSemanal, IsrQuincenal, PerfilPrestaciones, Uma
+from .services.ejercicio_fiscal import invalidar_ejercicios_fiscales
+from .services.factor_integracion import invalidar_tablas_factores
+from .services.isr_tarifa import invalidar_tarifas_isr
+
+@receiver(post_save, sender=IsrSemanal)
+@receiver(post_save, sender=IsrQuincenal)
+@receiver(post_delete, sender=IsrSemanal)
+@receiver(post_delete, sender=IsrQuincenal)
+def invalidate_tarifas_isr(sender, **kwargs):
+    invalidar_tarifas_isr()
+
+@receiver(post_save, sender=Uma)
+@receiver(post_delete, sender=Uma)
+def invalidate_ejercicios_fiscales(sender, **kwargs):
+    invalidar_ejercicios_fiscales()
+
+@receiver(post_save, sender=PerfilPrestaciones)
+@receiver(post_delete, sender=PerfilPrestaciones)
+def invalidate_tablas_factores(sender, **kwargs):
+    invalidar_tablas_factores()
@@ -1,3 +1,605 @@
+import csv
+import importlib
+import io
+
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from openpyxl import load_workbook
+
+from rest_framework.test import APIClient
+
+from .models import Empleado, IsrQuincenal, Nomina, NominaJob, PerfilPrestaciones, Plaza, Recibo, Uma
+from .services.ejercicio_fiscal import get_ejercicio_fiscal
+from .services.factor_integracion import get_tabla_factores
+from .services.importacion_empleados import importar_empleados
+from .services.isr_tarifa import ISR_MODELS, TarifaIsr, get_tarifa_isr, invalidar_tarifas_isr
+from .services.nomina_job_service import (
+    ERROR_ESTANCADO,
+    REINTENTO_BASE_SEGUNDOS,
+    ejecutar_job,
+    encolar_nomina,
+    liberar_jobs_estancados,
+    tomar_siguiente_job
+)
+from .services.nomina_lote import calcular_nomina_lote
+from .services.nomina_service import calcular_recibo, process_nomina_detalle, recalcular_nomina
+from .services.plantilla_sintetica import generar_plantilla, generar_tablas_fiscales
+from .services.recalculo_sdi import recalcular_sdi
+
+CENTAVO = Decimal("0.01")
+
+class NominaLoteParityTest(TestCase):
+    """
+    calcular_nomina_lote debe dar exactamente los importes de
+    calcular_recibo, la implementación escalar de referencia.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        generar_tablas_fiscales((2025,))
+
+    def casos(self):
+        uma = Uma.objects.get(ejercicio=2025, status=True)
+        ejercicio_fiscal = get_ejercicio_fiscal(2025)
+
+        salarios = {Decimal(valor) for valor in ("0.01", "0.05", "1.00", "123.45", "278.80", "333.33", "999.99", "4567.89")}
+
+        for periodicidad_pago in ISR_MODELS:
+            # Orillas de cada renglón de la tarifa
+            for renglon in get_tarifa_isr(2025, periodicidad_pago).renglones:
+                for limite in (renglon.limite_inferior, renglon.limite_superior):
+                    if limite is not None:
+                        salario = (limite / periodicidad_pago).quantize(CENTAVO)
+                        salarios |= {salario - CENTAVO, salario, salario + CENTAVO}
+
+            # Límite del subsidio al empleo
+            salario = (uma.limite_max / periodicidad_pago).quantize(CENTAVO)
+            salarios |= {salario - CENTAVO, salario, salario + CENTAVO}
+
+        # Tope del SBC (25 UMA) y tres UMA del IMSS
+        for limite in (ejercicio_fiscal.tope_sbc, ejercicio_fiscal.tres_umas):
+            salario = limite.quantize(CENTAVO)
+            salarios |= {salario - CENTAVO, salario, salario + CENTAVO}
+
+        factores = [None, (Decimal(1), Decimal(1))] + [
+            ejercicio_fiscal.factores.fraccion(anio_servicio) for anio_servicio in (1, 6, 25)
+        ]
+
+        return uma, ejercicio_fiscal, [
+            (salario, periodicidad_pago, factor)
+            for salario in sorted(salarios)
+            if salario > 0
+            for periodicidad_pago in ISR_MODELS
+            for factor in factores
+        ]
+
+    def test_lote_igual_a_escalar(self):
+        uma, ejercicio_fiscal, casos = self.casos()
+
+        con_factor = [caso for caso in casos if caso[2] is not None]
+        sin_factor = [caso for caso in casos if caso[2] is None]
+
+        for grupo, factores in ((con_factor, [caso[2] for caso in con_factor]), (sin_factor, None)):
+            resultado = calcular_nomina_lote(
+                [caso[0] for caso in grupo],
+                [caso[1] for caso in grupo],
+                ejercicio_fiscal,
+                factores
+            )
+
+            for i, (salario, periodicidad_pago, factor) in enumerate(grupo):
+                esperado = calcular_recibo(
+                    salario,
+                    periodicidad_pago,
+                    uma,
+                    get_tarifa_isr(2025, periodicidad_pago),
+                    factor
+                )
+
+                with self.subTest(salario=salario, periodicidad_pago=periodicidad_pago, factor=factor):
+                    self.assertEqual(
+                        {
+                            # Los importes que no aplican son el entero 0
+                            campo: str(valor if isinstance(valor, Decimal) else Decimal(valor).quantize(CENTAVO))
+                            for campo, valor in esperado.items()
+                        },
+                        {campo: str(valor) for campo, valor in resultado.fila(i).items()}
+                    )
+
+    def test_filas_sin_salario_o_periodicidad(self):
+        resultado = calcular_nomina_lote(
+            [Decimal("0.00"), Decimal("300.00"), Decimal("300.00")],
+            [15, None, 15],
+            get_ejercicio_fiscal(2025)
+        )
+
+        self.assertEqual(list(resultado.valido), [False, False, True])
+        self.assertEqual(set(resultado.fila(0).values()), {Decimal("0.00")})
+
+class EmpleadoTest(TestCase):
+    def test_sd_entero(self):
+        empleado = Empleado.objects.create(
+            rfc="ROLM850505EF3",
+            nombre_completo="María Rodríguez",
+            sd=500,
+            periodicidad_pago=15
+        )
+
+        self.assertEqual(empleado.sdi, Decimal("524.66"))
+
+class ImportacionEmpleadosTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.perfil = PerfilPrestaciones.objects.create(
+            descripcion="Superiores",
+            aguinaldo_dias=Decimal("30"),
+            prima_vacacional=Decimal("0.50"),
+            vacaciones_adicionales=4
+        )
+        cls.plaza = Plaza.objects.create(descripcion="Base", perfil_prestaciones=cls.perfil)
+
+    def test_reimportar_rfc_existente_conserva_columnas_ausentes(self):
+        empleado = Empleado.objects.create(
+            rfc="GOMA800101AB1",
+            nombre_completo="Ana Gómez",
+            sd=Decimal("500.00"),
+            periodicidad_pago=15,
+            plaza=self.plaza,
+            fecha_ingreso=date(2015, 3, 1)
+        )
+
+        resultado = importar_empleados(io.StringIO(
+            "rfc,nombre_completo,sd,periodicidad_pago\n"
+            "GOMA800101AB1,Ana Gómez López,600.00,15\n"
+        ))
+
+        self.assertEqual((resultado.insertados, resultado.actualizados), (0, 1))
+
+        empleado.refresh_from_db()
+
+        self.assertEqual(empleado.nombre_completo, "Ana Gómez López")
+        self.assertEqual(empleado.sd, Decimal("600.00"))
+        self.assertEqual(empleado.plaza_id, self.plaza.id)
+        self.assertEqual(empleado.fecha_ingreso, date(2015, 3, 1))
+        self.assertEqual(
+            empleado.sdi,
+            get_tabla_factores().sdi(Decimal("600.00"), date(2015, 3, 1), self.perfil.id, timezone.localdate())
+        )
+
+    def test_reimportar_con_columnas_opcionales_las_actualiza(self):
+        Empleado.objects.create(
+            rfc="PELJ900202CD2",
+            nombre_completo="Juan Pérez",
+            sd=Decimal("400.00"),
+            periodicidad_pago=15,
+            plaza=self.plaza,
+            fecha_ingreso=date(2020, 1, 1)
+        )
+
+        importar_empleados(io.StringIO(
+            "rfc,nombre_completo,sd,periodicidad_pago,plaza,fecha_ingreso\n"
+            "PELJ900202CD2,Juan Pérez,400.00,15,,\n"
+        ))
+
+        empleado = Empleado.objects.get(rfc="PELJ900202CD2")
+
+        self.assertIsNone(empleado.plaza_id)
+        self.assertIsNone(empleado.fecha_ingreso)
+
+    def test_catalogo_por_id_o_descripcion(self):
+        # Una plaza cuya descripción es el id de otra
+        numerica = Plaza.objects.create(descripcion=str(self.plaza.id))
+
+        resultado = importar_empleados(io.StringIO(
+            "rfc,nombre_completo,sd,periodicidad_pago,plaza\n"
+            f"GOMA800101AB1,Ana Gómez,500.00,15,{self.plaza.id}\n"
+            "PELJ900202CD2,Juan Pérez,400.00,15,base\n"
+            f"LOPM850303EF3,María López,450.00,15,{numerica.id}\n"
+            "RUIC750404GH4,Carlos Ruiz,300.00,15,9999\n"
+        ))
+
+        self.assertEqual((resultado.insertados, len(resultado.errores)), (3, 1))
+        self.assertEqual(
+            dict(Empleado.objects.values_list("rfc", "plaza_id")),
+            {
+                "GOMA800101AB1": self.plaza.id,
+                "PELJ900202CD2": self.plaza.id,
+                "LOPM850303EF3": numerica.id,
+            }
+        )
+
+class RecalculoNominaTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sólo hay tablas del ejercicio de la nómina, no del año en curso
+        generar_tablas_fiscales((2024,))
+
+        plazas, departamentos = generar_plantilla(20)
+
+        cls.nomina = Nomina.objects.create(
+            plaza=plazas[0],
+            departamento=departamentos[0],
+            fecha=date(2024, 12, 31),
+            fecha_pago=date(2024, 12, 31)
+        )
+
+    def test_generar_dos_veces_no_repite_recibos(self):
+        process_nomina_detalle(self.nomina)
+        process_nomina_detalle(self.nomina)
+
+        self.assertEqual(Recibo.objects.filter(nomina=self.nomina).count(), 20)
+
+    def assertRecalculo(self, revisados=0, recalculados=0, creados=0, eliminados=0):
+        self.assertEqual(recalcular_nomina(self.nomina), {
+            "revisados": revisados,
+            "recalculados": recalculados,
+            "creados": creados,
+            "eliminados": eliminados,
+        })
+
+    def test_recalcular_usa_el_ejercicio_de_la_nomina(self):
+        process_nomina_detalle(self.nomina)
+
+        self.assertEqual(Recibo.objects.filter(nomina=self.nomina).count(), 20)
+        self.assertRecalculo()
+
+    def test_recalcular_deja_en_ceros_empleados_sin_salario(self):
+        process_nomina_detalle(self.nomina)
+
+        empleado = Recibo.objects.filter(nomina=self.nomina).order_by("id").first().empleado
+        Empleado.objects.filter(id=empleado.id).update(sd=Decimal("0.00"))
+
+        self.assertRecalculo(revisados=1, recalculados=1)
+
+        recibo = Recibo.objects.get(nomina=self.nomina, empleado=empleado)
+
+        self.assertEqual((recibo.sd, recibo.sueldos_salarios, recibo.neto), (0, 0, 0))
+        self.assertRecalculo()
+
+    def test_recalcular_sin_cambios_en_las_entradas(self):
+        process_nomina_detalle(self.nomina)
+
+        # Guardar sin cambios lo hace candidato, pero su huella es la misma
+        Recibo.objects.filter(nomina=self.nomina).order_by("id").first().empleado.save()
+
+        self.assertRecalculo(revisados=1)
+        self.assertRecalculo()
+
+    def test_recalcular_revisa_todo_si_cambian_las_tablas(self):
+        process_nomina_detalle(self.nomina)
+
+        uma = Uma.objects.get(ejercicio=2024)
+        uma.valor += Decimal("1.00")
+        uma.save()
+
+        resultado = recalcular_nomina(self.nomina)
+
+        self.assertEqual(resultado["revisados"], 20)
+        self.assertGreater(resultado["recalculados"], 0)
+        self.assertRecalculo()
+
+    def test_recalcular_agrega_empleados_nuevos(self):
+        process_nomina_detalle(self.nomina)
+
+        empleado = Empleado.objects.create(
+            plaza=self.nomina.plaza,
+            departamento=self.nomina.departamento,
+            rfc="XAXX010101000",
+            sd=Decimal("500.00"),
+            sdi=Decimal("524.66"),
+            periodicidad_pago=15
+        )
+
+        self.assertRecalculo(creados=1)
+        self.assertTrue(Recibo.objects.filter(nomina=self.nomina, empleado=empleado).exists())
+        self.assertRecalculo()
+
+    def test_recalcular_elimina_empleados_dados_de_baja(self):
+        process_nomina_detalle(self.nomina)
+
+        empleado = Recibo.objects.filter(nomina=self.nomina).order_by("id").first().empleado
+        empleado.status = False
+        empleado.save()
+
+        self.assertRecalculo(eliminados=1)
+        self.assertEqual(Recibo.objects.filter(nomina=self.nomina).count(), 19)
+        self.assertFalse(Recibo.objects.filter(nomina=self.nomina, empleado=empleado).exists())
+
+class NominaJobTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        plazas, departamentos = generar_plantilla(5)
+
+        # Sin UMA para el ejercicio: generar los recibos falla
+        cls.nomina = Nomina.objects.create(
+            plaza=plazas[0],
+            departamento=departamentos[0],
+            fecha=date(2030, 1, 15),
+            fecha_pago=date(2030, 1, 15)
+        )
+
+    def test_tomar_job_una_sola_vez(self):
+        job = encolar_nomina(self.nomina)
+
+        tomado = tomar_siguiente_job("worker-1")
+
+        self.assertEqual(tomado.id, job.id)
+        self.assertEqual((tomado.estado, tomado.worker, tomado.intentos), (NominaJob.EN_PROCESO, "worker-1", 1))
+        self.assertIsNone(tomar_siguiente_job("worker-2"))
+
+    def test_reintentos_con_espera_exponencial(self):
+        job = encolar_nomina(self.nomina)
+
+        for intento in range(1, job.max_intentos + 1):
+            NominaJob.objects.filter(id=job.id).update(disponible_en=timezone.now())
+
+            antes = timezone.now()
+
+            with self.assertRaises(ValueError):
+                ejecutar_job(tomar_siguiente_job("worker-1"))
+
+            job.refresh_from_db()
+
+            self.assertEqual(job.intentos, intento)
+            self.assertIn("UMA not found", job.error)
+
+            if intento < job.max_intentos:
+                self.assertEqual(job.estado, NominaJob.PENDIENTE)
+                self.assertGreaterEqual(
+                    job.disponible_en,
+                    antes + timedelta(seconds=REINTENTO_BASE_SEGUNDOS * 2 ** (intento - 1))
+                )
+                self.assertIsNone(tomar_siguiente_job("worker-1"))
+
+        self.assertEqual(job.estado, NominaJob.ERROR)
+        self.assertIsNotNone(job.terminado_en)
+
+    def test_liberar_jobs_estancados(self):
+        pendiente = encolar_nomina(self.nomina)
+        agotado = encolar_nomina(self.nomina)
+
+        tomar_siguiente_job("worker-1")
+        tomar_siguiente_job("worker-2")
+
+        NominaJob.objects.filter(id=agotado.id).update(intentos=F("max_intentos"))
+        NominaJob.objects.update(updated_at=timezone.now() - timedelta(minutes=10))
+
+        antes = timezone.now()
+
+        self.assertEqual(liberar_jobs_estancados(60), {"liberados": 1, "agotados": 1})
+
+        pendiente.refresh_from_db()
+        agotado.refresh_from_db()
+
+        self.assertEqual((pendiente.estado, pendiente.worker), (NominaJob.PENDIENTE, None))
+        self.assertGreaterEqual(pendiente.disponible_en, antes + timedelta(seconds=REINTENTO_BASE_SEGUNDOS))
+        self.assertEqual((agotado.estado, agotado.error), (NominaJob.ERROR, ERROR_ESTANCADO))
+
+        # Los jobs con avance reciente no se tocan
+        self.assertEqual(liberar_jobs_estancados(60), {"liberados": 0, "agotados": 0})
+
+class ReciboExportacionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generar_tablas_fiscales((2024,))
+
+        plazas, departamentos = generar_plantilla(5)
+
+        cls.nomina = Nomina.objects.create(
+            plaza=plazas[0],
+            departamento=departamentos[0],
+            fecha=date(2024, 12, 31),
+            fecha_pago=date(2024, 12, 31)
+        )
+
+        process_nomina_detalle(cls.nomina)
+
+        cls.empleado = Recibo.objects.filter(nomina=cls.nomina).order_by("id").first().empleado
+        cls.empleado.nombre_completo = '=HYPERLINK("http://example.com","x")'
+        cls.empleado.save()
+
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def exportar(self, formato):
+        response = self.client.get("/api/recibo/exportar/", {"nomina": self.nomina.id, "formato": formato})
+
+        self.assertEqual(response.status_code, 200)
+
+        return b"".join(response.streaming_content)
+
+    def test_exportar_csv_escapa_formulas(self):
+        filas = list(csv.reader(io.StringIO(self.exportar("csv").decode("utf-8-sig"))))
+
+        self.assertEqual(filas[0][:2], ["Recibo", "Nómina"])
+        self.assertEqual(len(filas), 6)
+        self.assertIn("\'=HYPERLINK(\"http://example.com\",\"x\")", [fila[7] for fila in filas])
+
+    def test_exportar_xlsx_escapa_formulas(self):
+        hoja = load_workbook(io.BytesIO(self.exportar("xlsx")))["Recibos"]
+        nombres = [fila[7] for fila in hoja.iter_rows(min_row=2, values_only=True)]
+
+        self.assertEqual(len(nombres), 5)
+        self.assertIn("\'=HYPERLINK(\"http://example.com\",\"x\")", nombres)
+
+    def test_exportar_formato_invalido(self):
+        response = self.client.get("/api/recibo/exportar/", {"formato": "pdf"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_totales(self):
+        recibos = Recibo.objects.filter(nomina=self.nomina)
+
+        response = self.client.get("/api/recibo/totales/", {"nomina": self.nomina.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["recibos"], 5)
+        self.assertEqual(response.json()["empleados"], 5)
+        self.assertEqual(response.json()["neto"], str(sum(recibos.values_list("neto", flat=True))))
+
+    def test_totales_agrupados(self):
+        response = self.client.get("/api/recibo/totales/", {"agrupar_por": "plaza,fecha"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(fila["plaza"], fila["fecha"], fila["recibos"]) for fila in response.json()],
+            [(self.nomina.plaza_id, "2024-12-31", 5)]
+        )
+        self.assertEqual(
+            self.client.get("/api/recibo/totales/", {"agrupar_por": "empleado"}).status_code,
+            400
+        )
+
+class TarifaIsrTest(TestCase):
+    def renglones(self, superior=None):
+        return [
+            IsrQuincenal(ejercicio=2024, limite_inferior=Decimal("0.01"), limite_superior=Decimal("100.00")),
+            IsrQuincenal(ejercicio=2024, limite_inferior=Decimal("100.01"), limite_superior=Decimal("200.00")),
+            IsrQuincenal(ejercicio=2024, limite_inferior=Decimal("200.01"), limite_superior=superior),
+        ]
+
+    def test_buscar_en_los_limites(self):
+        renglones = self.renglones()
+
+        # Desordenados a propósito: la tarifa los ordena por limite_inferior
+        tarifa = TarifaIsr(2024, 15, renglones[::-1])
+
+        for importe, renglon in (
+            ("0.01", 0),
+            ("100.00", 0),
+            ("100.01", 1),
+            ("200.00", 1),
+            ("200.01", 2),
+            ("999999.99", 2),
+        ):
+            with self.subTest(importe=importe):
+                self.assertIs(tarifa.buscar(Decimal(importe)), renglones[renglon])
+
+        for importe in ("0.00", "100.005"):
+            with self.subTest(importe=importe), self.assertRaises(ValueError):
+                tarifa.buscar(Decimal(importe))
+
+    def test_renglon_superior_con_cero(self):
+        tarifa = TarifaIsr(2024, 15, self.renglones(Decimal("0.00")))
+
+        with self.assertRaises(ValueError):
+            tarifa.buscar(Decimal("300.00"))
+
+    def test_migracion_abre_el_renglon_superior(self):
+        IsrQuincenal.objects.bulk_create(self.renglones(Decimal("0.00")))
+
+        migracion = importlib.import_module("nomina.migrations.0014_isr_renglon_superior_null")
+        migracion.abrir_renglon_superior(apps, None)
+
+        # La migración escribe con UPDATE, que no manda señales
+        invalidar_tarifas_isr()
+
+        self.assertEqual(
+            list(IsrQuincenal.objects.order_by("limite_inferior").values_list("limite_superior", flat=True)),
+            [Decimal("100.00"), Decimal("200.00"), None]
+        )
+        self.assertEqual(get_tarifa_isr(2024, 15).buscar(Decimal("300.00")).limite_inferior, Decimal("200.01"))
+
+    def test_guardar_un_renglon_invalida_la_tarifa(self):
+        generar_tablas_fiscales((2024,))
+
+        tarifa = get_tarifa_isr(2024, 15)
+
+        self.assertIs(get_tarifa_isr(2024, 15), tarifa)
+
+        renglon = IsrQuincenal.objects.filter(ejercicio=2024).order_by("limite_inferior").first()
+        renglon.cuota_fija += Decimal("1.00")
+        renglon.save()
+
+        nueva = get_tarifa_isr(2024, 15)
+
+        self.assertIsNot(nueva, tarifa)
+        self.assertNotEqual(nueva.version, tarifa.version)
+        self.assertEqual(nueva.renglones[0].cuota_fija, renglon.cuota_fija)
+
+class RecalculoSdiTest(TestCase):
+    FECHA = date(2024, 6, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("usuario", "usuario@example.com", "secreto")
+
+        perfil = PerfilPrestaciones.objects.create(
+            descripcion="Superiores",
+            aguinaldo_dias=Decimal("30"),
+            prima_vacacional=Decimal("0.50"),
+            vacaciones_adicionales=4
+        )
+        plaza = Plaza.objects.create(descripcion="Base", perfil_prestaciones=perfil)
+
+        for i, (sd, fecha_ingreso, con_plaza) in enumerate((
+            ("500.00", date(2015, 3, 1), True),
+            ("750.50", date(2023, 1, 1), True),
+            ("333.33", None, False),
+            ("1200.00", date(2010, 7, 15), False),
+            ("480.00", date(2020, 2, 29), True),
+        )):
+            Empleado.objects.create(
+                rfc=f"XAXX0101010{i:02d}",
+                sd=Decimal(sd),
+                sdi=Decimal("0.00"),
+                fecha_ingreso=fecha_ingreso,
+                plaza=plaza if con_plaza else None
+            )
+
+        # Uno ya tiene el SDI correcto y no se reescribe
+        empleado = Empleado.objects.order_by("id").first()
+        empleado.sdi = get_tabla_factores().sdi(
+            empleado.sd, empleado.fecha_ingreso, empleado.plaza.perfil_prestaciones_id, cls.FECHA
+        )
+        empleado.save()
+
+    def recalcular(self, marca):
+        antes = timezone.now()
+
+        with CaptureQueriesContext(connection) as context:
+            resultado = recalcular_sdi(fecha=self.FECHA, batch_size=2, user=self.user.id)
+
+        self.assertEqual((resultado["revisados"], resultado["actualizados"]), (5, 4))
+        self.assertTrue(any(marca in query["sql"] for query in context.captured_queries))
+
+        factores = get_tabla_factores()
+
+        for empleado in Empleado.objects.select_related("plaza"):
+            with self.subTest(rfc=empleado.rfc):
+                self.assertEqual(
+                    empleado.sdi,
+                    factores.sdi(
+                        empleado.sd,
+                        empleado.fecha_ingreso,
+                        empleado.plaza.perfil_prestaciones_id if empleado.plaza else None,
+                        self.FECHA
+                    )
+                )
+
+        actualizados = Empleado.objects.filter(updated_at__gte=antes)
+
+        self.assertEqual(actualizados.count(), 4)
+        self.assertEqual(set(actualizados.values_list("user_updated_id", flat=True)), {self.user.id})
+        self.assertEqual(recalcular_sdi(fecha=self.FECHA)["actualizados"], 0)
+
+    def test_update_from_values(self):
+        self.recalcular("FROM (VALUES")
+
+    def test_respaldo_bulk_update(self):
+        with mock.patch.object(connection, "vendor", "mysql"):
+            self.recalcular("CASE WHEN")
 
-# Create your tests here.
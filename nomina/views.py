@@ -1,3 +1,151 @@
-from django.shortcuts import render
+import io
+import tempfile
 
-# Create your views here.
+from django.http import FileResponse, StreamingHttpResponse
+
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from dashboard.fast_serializers import get_values_serializer
+from dashboard.mixins import ConditionalGetMixin, FastListMixin
+
+from nomina.services.importacion_empleados import importar_empleados
+from nomina.services.recibo_exportacion import (
+    CONTENT_TYPES,
+    FORMATOS,
+    escribir_xlsx,
+    iter_csv
+)
+from nomina.services.recibo_reporte import (
+    calcular_totales,
+    filtrar_recibos,
+    get_recibos_reporte
+)
+
+from .serializers import ReciboSerializer
+
+class ReciboViewSet(ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Recibos de nómina de solo lectura.
+
+    Filtros: nomina, plaza, departamento, empleado, desde, hasta (fecha de
+    la nómina). Admite ?fields= y paginación por cursor (?page_size=).
+    """
+
+    queryset = get_recibos_reporte()
+    serializer_class = ReciboSerializer
+
+    def filter_queryset(self, queryset):
+        return filtrar_recibos(
+            super().filter_queryset(queryset),
+            self.request.query_params
+        )
+
+    @action(detail=False, methods=["get"], url_path="totales")
+    def totales(self, request):
+        """
+        Totales calculados en SQL; ?agrupar_por=plaza,fecha regresa una fila
+        por grupo (nomina, plaza, departamento, fecha).
+        """
+        agrupar_por = [
+            clave for clave in request.query_params.get("agrupar_por", "").split(",")
+            if clave
+        ]
+
+        return Response(
+            calcular_totales(
+                self.filter_queryset(self.get_queryset()),
+                agrupar_por
+            )
+        )
+
+    @action(detail=False, methods=["get"], url_path="detalle")
+    def detalle(self, request):
+        """
+        Todos los recibos filtrados como un arreglo JSON transmitido por
+        bloques, sin paginar ni cargar la consulta completa en memoria.
+        """
+        values_serializer = get_values_serializer(
+            self.get_serializer_class(),
+            self.get_field_selection()
+        )
+
+        rows = values_serializer.values(
+            self.filter_queryset(self.get_queryset()).order_by("id")
+        )
+
+        return StreamingHttpResponse(
+            values_serializer.stream(rows),
+            content_type="application/json"
+        )
+
+    @action(detail=False, methods=["get"], url_path="exportar")
+    def exportar(self, request):
+        """
+        Descarga los recibos filtrados como ?formato=csv (transmitido por
+        bloques) o ?formato=xlsx (generado en un archivo temporal).
+        """
+        formato = request.query_params.get("formato", "csv")
+
+        if formato not in FORMATOS:
+            return Response(
+                {"detail": f"formato must be one of: {', '.join(FORMATOS)}"},
+                status=400
+            )
+
+        recibos = self.filter_queryset(self.get_queryset())
+        nombre = f"recibos.{formato}"
+
+        if formato == "csv":
+            response = StreamingHttpResponse(
+                iter_csv(recibos),
+                content_type=CONTENT_TYPES[formato]
+            )
+            response["Content-Disposition"] = f'attachment; filename="{nombre}"'
+
+            return response
+
+        archivo = tempfile.TemporaryFile()
+
+        escribir_xlsx(recibos, archivo)
+        archivo.seek(0)
+
+        return FileResponse(
+            archivo,
+            as_attachment=True,
+            filename=nombre,
+            content_type=CONTENT_TYPES[formato]
+        )
+
+class EmpleadoImportacionView(APIView):
+    """
+    Importación masiva de empleados desde un CSV (campo "archivo");
+    responde el resumen con las filas con error.
+    """
+
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        archivo = request.FILES.get("archivo")
+
+        if not archivo:
+            return Response(
+                {"detail": "archivo is required"},
+                status=400
+            )
+
+        try:
+            resultado = importar_empleados(
+                io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline=""),
+                user=request.user.id
+            )
+        except (UnicodeDecodeError, ValueError) as e:
+            return Response(
+                {"detail": str(e)},
+                status=400
+            )
+
+        return Response(resultado.resumen())